@@ -0,0 +1,127 @@
+"""
+Overload and outage behaviour of agent calls with and without `guard.Guard`.
+
+Many client threads call an `IntelligenceAgent` over a `FakeAgentImpl`
+whose latency grows once more than `--capacity` calls are in flight, and
+which fails every call during an outage in the middle of the run.
+Compares plain calls, naive immediate retries and a `Guard` (AIMD limit,
+circuit breaker, jittered backoff, fallback cache).
+
+    python benchmarks/bench_guard.py --clients 32 --seconds 3 --latency-ms 10
+"""
+
+import argparse
+import logging
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from control_plane.agents import IntelligenceAgent  # noqa: E402
+from control_plane.cache import TTLCache  # noqa: E402
+from control_plane.guard import AdaptiveLimit, CircuitBreaker, Guard  # noqa: E402
+from fakes import FakeAgentImpl  # noqa: E402
+
+
+def naive_retry(agent: IntelligenceAgent, retries: int = 2):
+    def call(query: str):
+        for attempt in range(retries + 1):
+            try:
+                return agent.run(query)
+            except RuntimeError:
+                if attempt == retries:
+                    raise
+    return call
+
+
+def drive(call, impl: FakeAgentImpl, args) -> dict:
+    stop = threading.Event()
+    lock = threading.Lock()
+    latencies, counts = [], {"ok": 0, "errors": 0, "fallbacks": 0}
+
+    def client(seed: int) -> None:
+        rng = random.Random(seed)
+        while not stop.is_set():
+            query = f"question {rng.randrange(args.queries)}"
+            start = time.perf_counter()
+            try:
+                output = call(query)
+                key = "fallbacks" if output.get("guard", {}).get("fallback") else "ok"
+            except RuntimeError:
+                key = "errors"
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                counts[key] += 1
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    third = args.seconds / 3
+    time.sleep(third)
+    before = impl.calls
+    impl.failing = True
+    time.sleep(third)
+    impl.failing = False
+    outage_calls = impl.calls - before
+    time.sleep(third)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    return dict(
+        counts,
+        p50_ms=latencies[len(latencies) // 2] * 1000,
+        p95_ms=latencies[int(len(latencies) * 0.95)] * 1000,
+        outage_calls=outage_calls,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--capacity", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+    latency_s = args.latency_ms / 1000
+    logging.getLogger("control_plane").setLevel(logging.ERROR)  # quiet the breaker warnings
+
+    modes = {}
+    impl = FakeAgentImpl(latency_s=latency_s, capacity=args.capacity, seed=1)
+    plain = IntelligenceAgent("intelligence", "", None, impl)
+    modes["plain calls"] = (plain.run, impl)
+
+    impl = FakeAgentImpl(latency_s=latency_s, capacity=args.capacity, seed=1)
+    plain = IntelligenceAgent("intelligence", "", None, impl)
+    modes["naive retries"] = (naive_retry(plain), impl)
+
+    impl = FakeAgentImpl(latency_s=latency_s, capacity=args.capacity, seed=1)
+    guard = Guard(
+        "intelligence",
+        limit=AdaptiveLimit(initial=args.capacity, target_latency_s=latency_s * 2),
+        breaker=CircuitBreaker(failure_threshold=5, reset_timeout_s=args.seconds / 10),
+        backoff_s=latency_s,
+        fallback=TTLCache(maxsize=1024, ttl_s=3600),
+    )
+    guarded = IntelligenceAgent("intelligence", "", None, impl, guard=guard)
+    modes["Guard"] = (guarded.run, impl)
+
+    print(f"clients={args.clients} capacity={args.capacity} latency={args.latency_ms}ms "
+          f"outage={args.seconds / 3:.1f}s")
+    print(f"{'mode':14s} {'ok':>7s} {'errors':>7s} {'fallback':>8s} "
+          f"{'p50 ms':>8s} {'p95 ms':>8s} {'calls in outage':>16s}")
+    for name, (call, impl) in modes.items():
+        r = drive(call, impl, args)
+        print(f"{name:14s} {r['ok']:7d} {r['errors']:7d} {r['fallbacks']:8d} "
+              f"{r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['outage_calls']:16d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Query latency of `history.RecentRuns` over a full ring buffer.
+
+Fills the buffer with synthetic runs spread over the last `--span-s`
+seconds, then times the queries a dashboard or rate-limit policy makes.
+
+    python benchmarks/bench_history.py --capacity 10000 --queries 2000
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from control_plane.history import RecentRuns  # noqa: E402
+from control_plane.models import Decision, DecisionKind, RunLog, RunStatus  # noqa: E402
+
+
+def fill(history: RecentRuns, n: int, span_s: float, rng: random.Random) -> datetime:
+    now = datetime.utcnow()
+    for i in range(n):
+        when = now - timedelta(seconds=span_s * (n - i) / n)
+        decisions = [
+            Decision(f"policy_{p}", rng.choice((DecisionKind.ALLOW, DecisionKind.DENY)), {})
+            for p in range(rng.randint(1, 4))
+        ]
+        history.record(RunLog(
+            run_id=f"run-{i}",
+            workflow_name=f"workflow_{rng.randrange(20)}",
+            status=rng.choice((RunStatus.COMPLETED, RunStatus.FAILED)),
+            start_time=when,
+            end_time=when,
+            decisions=decisions,
+        ))
+    return now
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--capacity", type=int, default=10_000)
+    parser.add_argument("--span-s", type=float, default=6 * 3600)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    history = RecentRuns(capacity=args.capacity)
+    now = fill(history, args.capacity * 2, args.span_s, rng)
+    last_hour = now - timedelta(hours=1)
+
+    queries = {
+        "runs(workflow, last hour)": lambda: history.runs("workflow_3", since=last_hour),
+        "runs(policy, limit=50)": lambda: history.runs(policy_id="policy_2", limit=50),
+        "count(workflow, last hour)": lambda: history.count("workflow_3", since=last_hour),
+        "failure_rate(last hour)": lambda: history.failure_rate(since=last_hour),
+        "deny_rates(last hour)": lambda: history.deny_rates(since=last_hour),
+    }
+    print(f"capacity={args.capacity} runs in buffer={len(history)}")
+    for name, query in queries.items():
+        start = time.perf_counter()
+        for _ in range(args.queries):
+            query()
+        mean_us = (time.perf_counter() - start) / args.queries * 1e6
+        print(f"{name:28s} {mean_us:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Import-time and cold-start cost of the control_plane package.
+
+Each scenario runs in a fresh interpreter (`python -X importtime`) and
+reports the cumulative import time of `control_plane`, plus wall time of
+the whole process. Pass `--max-import-ms` to fail (exit 1) when the bare
+package import regresses past a budget.
+
+    python benchmarks/bench_import.py --repeat 5 --max-import-ms 50
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+SCENARIOS = {
+    "import": "import control_plane",
+    "engine": "import control_plane; control_plane.WorkflowEngine",
+    "registry_lazy_agent": (
+        "import control_plane\n"
+        "r = control_plane.ControlPlaneRegistry()\n"
+        "r.register_agent('atlas', 'Atlas', factory=lambda: control_plane.AtlasAgent("
+        "name='atlas', description='Atlas', session=None))\n"
+    ),
+    "batch_policies": (
+        "import control_plane\n"
+        "e = control_plane.PolicyEngine({})\n"
+        "e.evaluate_batch('missing', [{}])\n"
+    ),
+}
+
+
+def run_once(code: str):
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+    cumulative_us = 0
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == "control_plane":
+            cumulative_us = int(parts[1])
+    return cumulative_us / 1000, wall * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    failed = False
+    for name, code in SCENARIOS.items():
+        samples = [run_once(code) for _ in range(args.repeat)]
+        import_ms = statistics.median(s[0] for s in samples)
+        wall_ms = statistics.median(s[1] for s in samples)
+        print(f"{name:20s} import control_plane={import_ms:7.1f} ms  process wall={wall_ms:7.1f} ms")
+        if name == "import" and args.max_import_ms is not None and import_ms > args.max_import_ms:
+            print(f"  FAIL: exceeds budget of {args.max_import_ms} ms")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+"Does any upstream asset carry PII?" against a fake Atlas with latency.
+
+Compares one-hop-at-a-time connector calls with `LineageCache` on a
+cold and a warm cache, over a layered lineage graph.
+
+    python benchmarks/bench_lineage.py --layers 6 --width 20 --latency-ms 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from control_plane.connectors.lineage_cache import LineageCache  # noqa: E402
+from fakes import InMemoryAtlasConnector  # noqa: E402
+
+
+def build(layers: int, width: int, rng: random.Random):
+    edges = []
+    for layer in range(1, layers):
+        for i in range(width):
+            for source in rng.sample(range(width), 3):
+                edges.append((f"t{layer - 1}_{source}", f"t{layer}_{i}"))
+    edges += [(f"t{layers - 1}_{i}", "report") for i in range(width)]
+    tags = {f"t0_{rng.randrange(width)}": ["PII"]}
+    return edges, tags
+
+
+def naive_upstream_pii(connector, guid: str) -> bool:
+    seen, stack, found = {guid}, [guid], False
+    while stack:
+        node = stack.pop()
+        if "PII" in connector.get_asset_metadata(node)["tags"]:
+            found = True
+        for entity in connector.get_asset_lineage(node)["inputs"]:
+            if entity["guid"] not in seen:
+                seen.add(entity["guid"])
+                stack.append(entity["guid"])
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--layers", type=int, default=6)
+    parser.add_argument("--width", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    edges, tags = build(args.layers, args.width, random.Random(11))
+    connector = InMemoryAtlasConnector(edges, tags, latency_s=args.latency_ms / 1000)
+
+    start = time.perf_counter()
+    naive = naive_upstream_pii(connector, "report")
+    naive_s, naive_calls = time.perf_counter() - start, connector.calls
+
+    cache = LineageCache(connector)
+    connector.calls = 0
+    start = time.perf_counter()
+    cold = bool(cache.upstream_with_tag("report", "PII"))
+    cold_s, cold_calls = time.perf_counter() - start, connector.calls
+
+    connector.calls = 0
+    start = time.perf_counter()
+    warm = bool(cache.upstream_with_tag("report", "PII"))
+    warm_s, warm_calls = time.perf_counter() - start, connector.calls
+    cache.shutdown()
+
+    assert naive == cold == warm
+    print(f"assets={len(connector.inputs) + 1} latency={args.latency_ms}ms")
+    print(f"sequential calls   {naive_s * 1000:9.1f} ms  {naive_calls:5d} calls")
+    print(f"LineageCache cold  {cold_s * 1000:9.1f} ms  {cold_calls:5d} calls")
+    print(f"LineageCache warm  {warm_s * 1000:9.1f} ms  {warm_calls:5d} calls")
+
+
+if __name__ == "__main__":
+    main()
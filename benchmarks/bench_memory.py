@@ -0,0 +1,134 @@
+"""
+Memory retained by in-memory run history, measured with tracemalloc.
+
+Compares keeping `--decisions` decisions (spread over runs of
+`--per-run` decisions each) as the previous plain dataclasses with
+copied rules, as the slotted `models` records, and in `RunHistory`.
+
+    python benchmarks/bench_memory.py --decisions 1000000 --per-run 4
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from control_plane.history import RunHistory  # noqa: E402
+from control_plane.models import Decision, DecisionKind, RunLog, RunStatus  # noqa: E402
+
+RULES = [
+    {"field": "risk_score", "op": "lt", "value": 0.8},
+    {"field": "region", "op": "in", "value": ["us", "eu"]},
+]
+
+
+@dataclass
+class LegacyDecision:
+    policy_id: str
+    decision: str
+    details: Dict[str, Any]
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass
+class LegacyRunLog:
+    run_id: str
+    workflow_name: str
+    status: str
+    start_time: datetime
+    end_time: datetime = None
+    input_data: Dict[str, Any] = field(default_factory=dict)
+    decisions: List[LegacyDecision] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+def build_legacy(runs: int, per_run: int, start: datetime):
+    out = []
+    for r in range(runs):
+        log = LegacyRunLog(f"run-{r:08d}", "fraud_review", "completed", start, start)
+        for p in range(per_run):
+            log.decisions.append(LegacyDecision(
+                policy_id=f"policy_{p}",
+                decision="allow",
+                details={"message": "All rules satisfied.", "evaluated_rules": list(RULES)},
+                timestamp=start + timedelta(microseconds=r),
+            ))
+        out.append(log)
+    return out
+
+
+def build_slotted(runs: int, per_run: int, start: datetime):
+    out = []
+    details = {"message": "All rules satisfied."}
+    for r in range(runs):
+        log = RunLog(f"run-{r:08d}", "fraud_review", RunStatus.COMPLETED, start, start)
+        for p in range(per_run):
+            log.decisions.append(Decision(
+                policy_id=f"policy_{p}",
+                decision=DecisionKind.ALLOW,
+                details=dict(details),
+                timestamp=start + timedelta(microseconds=r),
+            ))
+        out.append(log)
+    return out
+
+
+def build_history(runs: int, per_run: int, start: datetime):
+    history = RunHistory()
+    for log in build_slotted_iter(runs, per_run, start):
+        history.append(log)
+    return history
+
+
+def build_slotted_iter(runs: int, per_run: int, start: datetime):
+    for r in range(runs):
+        log = RunLog(f"run-{r:08d}", "fraud_review", RunStatus.COMPLETED, start, start)
+        for p in range(per_run):
+            log.decisions.append(Decision(
+                policy_id=f"policy_{p}",
+                decision=DecisionKind.ALLOW,
+                details={"message": "All rules satisfied."},
+                timestamp=start + timedelta(microseconds=r),
+            ))
+        yield log
+
+
+def retained(build, *args) -> float:
+    gc.collect()
+    tracemalloc.start()
+    obj = build(*args)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current / (1024 * 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--decisions", type=int, default=1_000_000)
+    parser.add_argument("--per-run", type=int, default=4)
+    args = parser.parse_args()
+
+    runs = args.decisions // args.per_run
+    start = datetime(2025, 1, 1)
+    print(f"decisions={runs * args.per_run} runs={runs}")
+    baseline = None
+    for name, build in (
+        ("legacy dataclasses", build_legacy),
+        ("slotted records", build_slotted),
+        ("RunHistory", build_history),
+    ):
+        mib = retained(build, runs, args.per_run, start)
+        baseline = baseline or mib
+        print(f"{name:20s} {mib:9.1f} MiB  ({baseline / mib:5.1f}x smaller than legacy)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Per-tick cost of keeping drift decisions current: full re-evaluation vs
+`policy_session.EvaluationSession`.
+
+Each tick moves `observed_drift` by a small random step, as a monitoring
+loop would, and needs every policy's should_act afterwards.
+
+    python benchmarks/bench_policy_session.py --policies 1000 --ticks 2000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from control_plane.policies import PolicyEngine  # noqa: E402
+
+import loadgen  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--policies", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--step", type=float, default=0.005, help="stddev of each drift move")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    engine = PolicyEngine(loadgen.drift_policies(args.policies, rng))
+    names = engine.policy_names()
+    drifts, drift = [], 0.15
+    for _ in range(args.ticks):
+        drift = min(0.35, max(0.0, drift + rng.gauss(0, args.step)))
+        drifts.append(drift)
+
+    start = time.perf_counter()
+    acting = {}
+    for drift in drifts:
+        context = {"observed_drift": drift, "model": "fraud"}
+        for name in names:
+            acting[name] = engine.evaluate(name, context)["should_act"]
+    full_s = time.perf_counter() - start
+
+    session = engine.session({"observed_drift": 0.15, "model": "fraud"})
+    evaluations = session.evaluations
+    flips = 0
+    start = time.perf_counter()
+    for drift in drifts:
+        flips += len(session.update({"observed_drift": drift}))
+    session_s = time.perf_counter() - start
+
+    assert session.acting() == [name for name in names if acting[name]]
+    per_tick = (session.evaluations - evaluations) / args.ticks
+    print(f"policies={args.policies} ticks={args.ticks} flips={flips}")
+    print(f"full re-evaluation  {full_s / args.ticks * 1e6:9.1f} us/tick  {len(names):8.1f} evals/tick")
+    print(f"EvaluationSession   {session_s / args.ticks * 1e6:9.1f} us/tick  {per_tick:8.1f} evals/tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Evaluation latency of `policies.PolicyEngine` over a `PolicyStore`,
+idle vs while the store refreshes in the background.
+
+A fake session serves an in-memory POLICIES table; during the second
+phase a writer thread keeps updating rows and the store refreshes every
+`--refresh-ms`, or more often if the idle phase was too short for about
+ten refreshes; it runs until at least one new snapshot is published.
+
+    python benchmarks/bench_policy_store.py --policies 5000 --evaluations 200000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from control_plane.policies import PolicyEngine  # noqa: E402
+from control_plane.policy_store import PolicyStore  # noqa: E402
+from fakes import FakeRow, FakeSession  # noqa: E402
+
+
+class FakeTable:
+    """In-memory POLICIES table with a monotonically increasing UPDATED_AT."""
+
+    def __init__(self, n: int):
+        self._lock = threading.Lock()
+        self._clock = datetime(2025, 1, 1)
+        self.rows = {}
+        for i in range(n):
+            self.upsert(f"POLICY_{i}", 0.15)
+
+    def upsert(self, name: str, max_drift: float) -> None:
+        with self._lock:
+            self._clock += timedelta(microseconds=1)
+            self.rows[name] = {
+                "POLICY_NAME": name,
+                "DESCRIPTION": "Synthetic drift policy.",
+                "CONDITIONS": {"max_drift": max_drift},
+                "ACTIONS": ["trigger_retrain", "notify_owner"],
+                "RULES": None,
+                "UPDATED_AT": self._clock,
+                "IS_DELETED": False,
+            }
+
+    def select(self, query=None, params=None):
+        since = params[0] if params else None
+        with self._lock:
+            return [
+                FakeRow(r) for r in self.rows.values()
+                if since is None or r["UPDATED_AT"] >= since
+            ]
+
+
+def measure(engine: PolicyEngine, names, n: int, rng: random.Random, until=None):
+    """Times `n` evaluations, and more if `until()` isn't true yet."""
+    latencies = []
+    while len(latencies) < n or (until is not None and not until()):
+        name = rng.choice(names)
+        start = time.perf_counter()
+        engine.evaluate(name, {"observed_drift": 0.2})
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+        "mean_us": statistics.fmean(latencies) * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--policies", type=int, default=5000)
+    parser.add_argument("--evaluations", type=int, default=200_000)
+    parser.add_argument("--refresh-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    table = FakeTable(args.policies)
+    store = PolicyStore(FakeSession(rows=table.select), refresh_interval_s=args.refresh_ms / 1000)
+    store.load()
+    engine = PolicyEngine(store.policies())
+    names = list(table.rows)
+
+    start = time.perf_counter()
+    idle = measure(engine, names, args.evaluations, rng)
+    idle_s = time.perf_counter() - start
+    # The busy phase takes about as long as the idle one; refresh often
+    # enough that even a short run publishes snapshots.
+    store.refresh_interval_s = min(args.refresh_ms / 1000, idle_s / 10)
+
+    stop = threading.Event()
+
+    def writer():
+        while not stop.is_set():
+            table.upsert(rng.choice(names), rng.uniform(0.1, 0.3))
+            time.sleep(0.0005)
+
+    table.upsert(rng.choice(names), rng.uniform(0.1, 0.3))
+    writer_thread = threading.Thread(target=writer, daemon=True)
+    writer_thread.start()
+    version_before = store.snapshot.version
+    store.start()
+    busy = measure(
+        engine, names, args.evaluations, rng,
+        until=lambda: store.snapshot.version > version_before,
+    )
+    stop.set()
+    store.stop()
+    writer_thread.join()
+
+    print(f"policies={args.policies} evaluations={args.evaluations} "
+          f"refresh={store.refresh_interval_s * 1000:.2f}ms")
+    print(f"idle:        p50={idle['p50_us']:6.2f}us p99={idle['p99_us']:6.2f}us mean={idle['mean_us']:6.2f}us")
+    print(f"refreshing:  p50={busy['p50_us']:6.2f}us p99={busy['p99_us']:6.2f}us mean={busy['mean_us']:6.2f}us")
+    print(f"snapshots published during run: {store.snapshot.version - version_before}")
+
+
+if __name__ == "__main__":
+    main()
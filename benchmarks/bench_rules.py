@@ -0,0 +1,103 @@
+"""
+Per-decision latency of compiled vs interpreted policy rules.
+
+Builds a synthetic set of policies and contexts, then evaluates a random
+sample of (policy, context) pairs with both `rules.interpret_rules` and
+the compiled predicates cached by `policy_engine.PolicyEngine`.
+
+    python benchmarks/bench_rules.py --policies 10000 --contexts 100000
+
+The full 10k x 100k cross product is 1e9 decisions, so by default a
+uniform sample of `--decisions` pairs is timed instead.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from control_plane.models import Policy  # noqa: E402
+from control_plane.policy_engine import PolicyEngine  # noqa: E402
+from control_plane.rules import interpret_rules  # noqa: E402
+
+ROLES = ["admin", "analyst", "engineer", "viewer", "auditor"]
+REGIONS = ["us", "eu", "apac", "latam"]
+TAGS = ["PII", "Finance", "Public", "Internal"]
+
+
+def make_policy(rng: random.Random, index: int) -> Policy:
+    rules = [
+        {"field": "observed_drift", "op": "le", "value": round(rng.uniform(0.05, 0.3), 3)},
+        {"field": "user_role", "op": "in", "value": rng.sample(ROLES, 3)},
+        {
+            "any": [
+                {"field": "region", "op": "eq", "value": rng.choice(REGIONS)},
+                {"field": "asset.tags", "op": "contains", "value": rng.choice(TAGS)},
+            ]
+        },
+        {"not": {"field": "risk_score", "op": "between", "value": [0.8, 1.0]}},
+    ]
+    return Policy(
+        policy_id=f"policy_{index}",
+        name=f"Synthetic policy {index}",
+        description="Synthetic benchmark policy.",
+        rules=rules,
+    )
+
+
+def make_context(rng: random.Random) -> dict:
+    return {
+        "observed_drift": rng.random() * 0.4,
+        "user_role": rng.choice(ROLES),
+        "region": rng.choice(REGIONS),
+        "risk_score": rng.random(),
+        "asset": {"tags": rng.sample(TAGS, 2)},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--policies", type=int, default=10_000)
+    parser.add_argument("--contexts", type=int, default=100_000)
+    parser.add_argument("--decisions", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    policies = [make_policy(rng, i) for i in range(args.policies)]
+    contexts = [make_context(rng) for _ in range(args.contexts)]
+    pairs = [
+        (rng.randrange(args.policies), rng.randrange(args.contexts))
+        for _ in range(args.decisions)
+    ]
+
+    engine = PolicyEngine()
+    start = time.perf_counter()
+    compiled = [engine.compile(policy) for policy in policies]
+    compile_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    interpreted_allows = sum(
+        interpret_rules(policies[p].rules, contexts[c]) for p, c in pairs
+    )
+    interpreted_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled_allows = sum(compiled[p](contexts[c]) for p, c in pairs)
+    compiled_s = time.perf_counter() - start
+
+    assert interpreted_allows == compiled_allows, "compiled and interpreted results differ"
+
+    n = args.decisions
+    print(f"policies={args.policies} contexts={args.contexts} decisions={n}")
+    print(f"compile:      {compile_s * 1e3:9.1f} ms total, {compile_s / args.policies * 1e6:7.2f} us/policy")
+    print(f"interpreted:  {interpreted_s / n * 1e9:9.0f} ns/decision")
+    print(f"compiled:     {compiled_s / n * 1e9:9.0f} ns/decision")
+    print(f"speedup:      {interpreted_s / compiled_s:9.2f}x (allow rate {compiled_allows / n:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Runs/sec of `observability.RunLogger` in direct vs buffered mode.
+
+Uses a fake Snowpark session that counts statements and sleeps for a
+fixed round-trip latency per statement.
+
+    python benchmarks/bench_run_logger.py --runs 2000 --latency-ms 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from control_plane.observability import RunLogger  # noqa: E402
+from fakes import FakeSession  # noqa: E402
+
+
+def run(logger: RunLogger, runs: int) -> float:
+    start = time.perf_counter()
+    for i in range(runs):
+        run_id = f"run_{i}"
+        logger.log_start(run_id, "fraud_drift_management", {"observed_drift": 0.22})
+        logger.log_success(run_id, {"should_act": True, "actions": ["trigger_retrain"]})
+    logger.close()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    results = {}
+    for mode in ("direct", "buffered"):
+        session = FakeSession(args.latency_ms / 1000)
+        logger = RunLogger(
+            session=session,
+            run_log_table="CONTROL_PLANE_DB.CONTROL_PLANE_MONITORING.RUN_LOG",
+            buffered=mode == "buffered",
+            max_batch_size=args.batch_size,
+        )
+        elapsed = run(logger, args.runs)
+        results[mode] = elapsed
+        print(
+            f"{mode:9s} runs/sec={args.runs / elapsed:10.0f} "
+            f"statements={session.statements:6d} elapsed={elapsed:.3f}s"
+        )
+
+    print(f"speedup   {results['direct'] / results['buffered']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
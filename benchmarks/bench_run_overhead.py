@@ -0,0 +1,62 @@
+"""
+Per-run bookkeeping cost of `core.RunCore`, broken down by component.
+
+Times run id generation (against the `uuid4`-based ids it replaces),
+timestamps, building the `RunLog`, the tracer context and a whole
+`RunCore.execute` with a no-op body and no hooks, in microseconds.
+
+    python benchmarks/bench_run_overhead.py --number 100000
+"""
+
+import argparse
+import sys
+import timeit
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from control_plane.core import RunCore  # noqa: E402
+from control_plane.models import RunLog, RunStatus  # noqa: E402
+from control_plane.timing import tracer  # noqa: E402
+from control_plane.utils import generate_run_id, new_run_id  # noqa: E402
+
+
+def legacy_run_id(prefix: str = "run") -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:8]}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+
+
+def traced() -> None:
+    with tracer.run(), tracer.span("run"):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    core = RunCore()
+    context = {"observed_drift": 0.2}
+    cases = {
+        "str(uuid.uuid4())": lambda: str(uuid.uuid4()),
+        "new_run_id()": new_run_id,
+        "legacy generate_run_id()": lambda: legacy_run_id("fraud_drift"),
+        "generate_run_id()": lambda: generate_run_id("fraud_drift"),
+        "datetime.utcnow()": datetime.utcnow,
+        "RunLog(...)": lambda: RunLog(
+            run_id="run", workflow_name="fraud_drift", status=RunStatus.STARTED,
+            start_time=None, input_data=context,
+        ),
+        "tracer.run() + span": traced,
+        "RunCore.execute (no-op)": lambda: core.execute("fraud_drift", context, lambda run_log: None),
+    }
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=args.number, repeat=args.repeat))
+        print(f"{name:28s} {best / args.number * 1e6:8.3f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Warehouse round-trips of concurrent workflows: shared session vs
+`BatchingSession` over a `SessionPool`.
+
+`--threads` workflows each log START/SUCCESS through an unbuffered
+`RunLogger` and run one Atlas-style CALL; every statement a fake session
+receives costs `--latency-ms`.
+
+    python benchmarks/bench_sessions.py --threads 32 --runs 20 --latency-ms 20
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from control_plane.observability import RunLogger  # noqa: E402
+from control_plane.sessions import BatchingSession, SessionPool  # noqa: E402
+from fakes import FakeSession  # noqa: E402
+
+
+def workload(session, threads: int, runs: int) -> float:
+    logger = RunLogger(session, "CONTROL_PLANE_DB.CONTROL_PLANE_LOGS.RUN_LOG")
+
+    def worker(t: int) -> None:
+        for i in range(runs):
+            run_id = f"run_{t}_{i}"
+            logger.log_start(run_id, "fraud_drift_management", {"observed_drift": 0.22})
+            session.sql("SELECT CURRENT_TIMESTAMP()").collect()
+            logger.log_success(run_id, {"should_act": False})
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+    total = args.threads * args.runs * 3
+
+    # serial: like one Snowpark session, statements wait for each other.
+    single = FakeSession(latency, serial=True)
+    shared = workload(single, args.threads, args.runs)
+    shared_statements = single.statements
+
+    sessions = []
+
+    def factory() -> FakeSession:
+        sessions.append(FakeSession(latency, serial=True))
+        return sessions[-1]
+
+    pool = SessionPool(factory, size=args.pool_size)
+    with BatchingSession(pool, window_s=0.005, max_workers=args.pool_size) as session:
+        batched = workload(session, args.threads, args.runs)
+    batched_statements = sum(s.statements for s in sessions)
+
+    print(f"statements issued={total} latency={args.latency_ms}ms")
+    print(f"shared session   {total / shared:8.0f} stmt/s  round-trips={shared_statements}")
+    print(f"batching + pool  {total / batched:8.0f} stmt/s  round-trips={batched_statements}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Throughput of `ShardedExecutor` from 1 to N worker processes.
+
+Each item runs a workflow whose policies check many rules against a
+large trigger payload and whose step shapes a result from it, so the
+work is CPU-bound. The in-process `WorkflowEngine.run` loop is the
+baseline.
+
+    python benchmarks/bench_sharded.py --items 4000 --max-shards 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from control_plane.models import Policy, Workflow  # noqa: E402
+from control_plane.policy_engine import PolicyEngine  # noqa: E402
+from control_plane.sharded import ShardedExecutor  # noqa: E402
+from control_plane.workflow_engine import WorkflowEngine  # noqa: E402
+
+FIELDS = 200
+
+
+class NullWriter:
+    def write_log(self, run_log) -> None:
+        pass
+
+
+def summarize(step, inputs, trigger_data):
+    """A CPU-bound step: shapes a summary from the whole payload."""
+    values = [v for k, v in trigger_data.items() if k.startswith("metric_")]
+    ordered = sorted(values)
+    return {"max": ordered[-1], "median": ordered[len(ordered) // 2], "n": len(ordered)}
+
+
+def build(workflows: int, policies: int):
+    registry = {
+        f"policy_{p}": Policy(
+            policy_id=f"policy_{p}",
+            name=f"policy_{p}",
+            description="",
+            rules=[
+                {"field": f"metric_{(p * 7 + r) % FIELDS}", "op": "lt", "value": 10.0}
+                for r in range(40)
+            ],
+        )
+        for p in range(policies)
+    }
+    flows = [
+        Workflow(
+            workflow_id=f"wf_{w}",
+            name=f"wf_{w}",
+            description="",
+            steps=[{"name": "summarize", "type": "summarize"}],
+            policies=list(registry),
+        )
+        for w in range(workflows)
+    ]
+    return registry, flows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=4000)
+    parser.add_argument("--workflows", type=int, default=64)
+    parser.add_argument("--policies", type=int, default=20)
+    parser.add_argument("--max-shards", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    registry, flows = build(args.workflows, args.policies)
+    payload = {f"metric_{i}": (i % 97) / 10 for i in range(FIELDS)}
+    items = [(flows[i % len(flows)], dict(payload, item=i)) for i in range(args.items)]
+    handlers = {"summarize": summarize}
+
+    engine = WorkflowEngine(PolicyEngine(), NullWriter(), registry, step_handlers=handlers, step_workers=1)
+    start = time.perf_counter()
+    for workflow, data in items:
+        engine.run(workflow, data)
+    serial = time.perf_counter() - start
+    print(f"items={args.items} cpus={os.cpu_count()}")
+    print(f"in-process      {args.items / serial:9.0f} runs/s")
+
+    shards = 1
+    while shards <= args.max_shards:
+        with ShardedExecutor(registry, handlers, shards=shards) as executor:
+            executor.run_batch(items[: shards * 4])  # start and warm the workers
+            start = time.perf_counter()
+            logs = executor.run_batch(items)
+            elapsed = time.perf_counter() - start
+        assert [log.input_data["item"] for log in logs] == list(range(args.items))
+        print(f"shards={shards:<3d}      {args.items / elapsed:9.0f} runs/s  ({serial / elapsed:4.1f}x)")
+        shards *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Benchmark suite for the control plane, reported as JSON.
+
+Builds synthetic policies and workflows (see `loadgen.py`) and drives
+both policy engines, both workflow engines and `RunLogger` against fake
+sessions that sleep for `--latency-ms` per round-trip. Each scenario
+reports throughput, per-operation latency percentiles and, from a second
+pass under tracemalloc, peak traced memory. With `--baseline`, results
+are compared with a saved run and the exit status is 1 if any scenario
+regressed by more than `--tolerance`.
+
+    python benchmarks/bench_suite.py --output baseline.json
+    python benchmarks/bench_suite.py --baseline baseline.json --tolerance 0.15
+"""
+
+import argparse
+import functools
+import json
+import logging
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import loadgen  # also puts src/ on sys.path
+from control_plane import policies, policy_engine, workflow_engine, workflows
+from control_plane.observability import RunLogger
+from control_plane.run_log import RunLogWriter
+
+# A scenario builds its load and returns (op(i), finish()); finish() runs
+# after the last op (e.g. flushing a logger) and counts towards the time.
+Scenario = Callable[[argparse.Namespace, random.Random], Tuple[Callable[[int], Any], Callable[[], None]]]
+
+# metric -> direction that counts as worse
+_WORSE = {"ops_per_s": -1, "p95_us": 1, "p99_us": 1, "peak_mib": 1}
+
+
+def _noop() -> None:
+    pass
+
+
+def drift_evaluate(args, rng):
+    pool = loadgen.drift_policies(args.policies, rng)
+    engine = policies.PolicyEngine(pool)
+    names = list(pool)
+    picks = [rng.choice(names) for _ in range(args.ops)]
+    contexts = loadgen.contexts(args.ops, rng)
+    return (lambda i: engine.evaluate(picks[i], contexts[i])), _noop
+
+
+def rule_evaluate(args, rng):
+    registry = loadgen.rule_policies(args.policies, rng)
+    engine = policy_engine.PolicyEngine()
+    pool = list(registry.values())
+    picks = [rng.choice(pool) for _ in range(args.ops)]
+    contexts = loadgen.contexts(args.ops, rng)
+    return (lambda i: engine.evaluate(picks[i], contexts[i])), _noop
+
+
+def rule_workflow_run(args, rng):
+    registry = loadgen.rule_policies(args.policies, rng)
+    flows = loadgen.workflows(
+        args.workflows, list(registry), args.policies_per_workflow, args.steps, rng
+    )
+    writer = RunLogWriter(loadgen.FakeConnection(args.latency_ms / 1000))
+    engine = workflow_engine.WorkflowEngine(
+        policy_engine.PolicyEngine(),
+        writer,
+        registry,
+        step_handlers={"noop": lambda step, inputs, trigger_data: None},
+        step_workers=1,
+    )
+    picks = [rng.choice(flows) for _ in range(args.ops)]
+    contexts = loadgen.contexts(args.ops, rng)
+    return (lambda i: engine.run(picks[i], contexts[i])), writer.close
+
+
+def _drift_handler(policy_names: List[str], context, policy_engine, logger, run_id):
+    results = [policy_engine.evaluate(name, context) for name in policy_names]
+    return {"should_act": any(r.should_act for r in results), "evaluated": len(results)}
+
+
+def drift_workflow_run(args, rng):
+    pool = loadgen.drift_policies(args.policies, rng)
+    logger = RunLogger(
+        session=loadgen.FakeSession(args.latency_ms / 1000),
+        run_log_table="WORKFLOW_RUN_LOG",
+        buffered=True,
+    )
+    engine = workflows.WorkflowEngine(logger, policies.PolicyEngine(pool))
+    names = list(pool)
+    k = min(args.policies_per_workflow, len(names))
+    for i in range(args.workflows):
+        handler = functools.partial(_drift_handler, rng.sample(names, k))
+        engine.register_workflow(f"workflow_{i}", "Synthetic workflow.", handler)
+    picks = [f"workflow_{rng.randrange(args.workflows)}" for _ in range(args.ops)]
+    contexts = loadgen.contexts(args.ops, rng)
+    return (lambda i: engine.run_workflow(picks[i], contexts[i])), logger.close
+
+
+def _run_logger(buffered: bool, args, rng):
+    logger = RunLogger(
+        session=loadgen.FakeSession(args.latency_ms / 1000),
+        run_log_table="WORKFLOW_RUN_LOG",
+        buffered=buffered,
+    )
+    contexts = loadgen.contexts(args.ops, rng)
+
+    def op(i: int) -> None:
+        run_id = f"run_{i}"
+        logger.log_start(run_id, "workflow_0", contexts[i])
+        logger.log_success(run_id, {"should_act": True, "actions": ["trigger_retrain"]})
+
+    return op, logger.close
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "policies.evaluate": drift_evaluate,
+    "policy_engine.evaluate": rule_evaluate,
+    "workflow_engine.run": rule_workflow_run,
+    "workflows.run_workflow": drift_workflow_run,
+    "run_logger.direct": functools.partial(_run_logger, False),
+    "run_logger.buffered": functools.partial(_run_logger, True),
+}
+
+
+# ----------------------------------------------------------------------
+# Measuring
+# ----------------------------------------------------------------------
+
+def _percentile(sorted_ns: List[int], q: float) -> float:
+    if not sorted_ns:
+        return 0.0
+    index = min(len(sorted_ns) - 1, int(round(q * (len(sorted_ns) - 1))))
+    return sorted_ns[index] / 1000
+
+
+def measure(scenario: Scenario, args: argparse.Namespace) -> Dict[str, Any]:
+    op, finish = scenario(args, random.Random(args.seed))
+    for i in range(min(args.warmup, args.ops)):
+        op(i)
+    latencies = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for i in range(args.ops):
+        t0 = clock()
+        op(i)
+        latencies.append(clock() - t0)
+    finish()
+    elapsed_s = (clock() - start) / 1e9
+
+    latencies.sort()
+    result = {
+        "ops": args.ops,
+        "seconds": round(elapsed_s, 6),
+        "ops_per_s": round(args.ops / elapsed_s, 1) if elapsed_s else None,
+        "p50_us": round(_percentile(latencies, 0.50), 2),
+        "p95_us": round(_percentile(latencies, 0.95), 2),
+        "p99_us": round(_percentile(latencies, 0.99), 2),
+        "max_us": round(latencies[-1] / 1000, 2) if latencies else 0.0,
+    }
+    if args.memory:
+        result["peak_mib"] = round(peak_memory(scenario, args) / 2**20, 3)
+    return result
+
+
+def peak_memory(scenario: Scenario, args: argparse.Namespace) -> int:
+    # A separate pass: tracemalloc slows allocation enough to skew timings.
+    tracemalloc.start()
+    try:
+        op, finish = scenario(args, random.Random(args.seed))
+        for i in range(args.ops):
+            op(i)
+        finish()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Relative change of each metric against the baseline.
+
+    A metric regresses when it moved in its worse direction (lower
+    throughput, higher latency or memory) by more than `tolerance`.
+    """
+    out = {}
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        changes, regressions = {}, []
+        for metric, worse in _WORSE.items():
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            changes[metric] = round(change, 4)
+            if change * worse > tolerance:
+                regressions.append(metric)
+        out[name] = {"change": changes, "regressions": regressions}
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, default=2000, help="operations per scenario")
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--policies", type=int, default=200)
+    parser.add_argument("--workflows", type=int, default=20)
+    parser.add_argument("--policies-per-workflow", type=int, default=5)
+    parser.add_argument("--steps", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only these scenarios (repeatable)")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="relative change counted as a regression")
+    args = parser.parse_args()
+
+    # Denied and failed runs are part of the load; don't print each one.
+    logging.getLogger("control_plane").setLevel(logging.CRITICAL)
+    names = args.scenario or list(SCENARIOS)
+    results = {name: measure(SCENARIOS[name], args) for name in names}
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        },
+        "scenarios": results,
+    }
+
+    regressed: Optional[List[str]] = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["scenarios"]
+        report["comparison"] = compare(results, baseline, args.tolerance)
+        regressed = [name for name, c in report["comparison"].items() if c["regressions"]]
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if regressed:
+        print(f"Regressed: {', '.join(regressed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
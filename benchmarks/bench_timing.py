@@ -0,0 +1,82 @@
+"""
+Per-span overhead of `timing.tracer`, enabled and disabled, and the cost
+of a disabled span at a hot call site that checks `tracer.enabled` first.
+
+    python benchmarks/bench_timing.py --iterations 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from control_plane.timing import Tracer  # noqa: E402
+
+
+def loop_baseline(n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        pass
+    return time.perf_counter() - start
+
+
+def loop_spans(tracer: Tracer, n: int, in_run: bool) -> float:
+    start = time.perf_counter()
+    if in_run:
+        with tracer.run():
+            for _ in range(n):
+                with tracer.span("policy", "p1"):
+                    pass
+    else:
+        for _ in range(n):
+            with tracer.span("policy", "p1"):
+                pass
+    return time.perf_counter() - start
+
+
+def loop_checked(tracer: Tracer, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        if not tracer.enabled:
+            pass
+        else:
+            with tracer.span("policy", "p1"):
+                pass
+    return time.perf_counter() - start
+
+
+def loop_runs(tracer: Tracer, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        with tracer.run():
+            pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=1_000_000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    base = loop_baseline(n)
+    disabled = loop_spans(Tracer(enabled=False), n, in_run=True)
+    enabled = loop_spans(Tracer(enabled=True), n, in_run=False)
+    enabled_run = loop_spans(Tracer(enabled=True), n, in_run=True)
+    checked = loop_checked(Tracer(enabled=False), n)
+    disabled_runs = loop_runs(Tracer(enabled=False), n)
+    enabled_runs = loop_runs(Tracer(enabled=True), n)
+
+    print(f"iterations={n}")
+    print(f"disabled span:          {(disabled - base) / n * 1e9:8.0f} ns/span")
+    print(f"enabled span:           {(enabled - base) / n * 1e9:8.0f} ns/span")
+    print(f"enabled span in run():  {(enabled_run - base) / n * 1e9:8.0f} ns/span")
+    print(f"disabled, checked first:{(checked - base) / n * 1e9:8.0f} ns/span")
+    print(f"disabled run():         {(disabled_runs - base) / n * 1e9:8.0f} ns/run")
+    print(f"enabled run():          {(enabled_runs - base) / n * 1e9:8.0f} ns/run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Synthetic load for the control plane: policies, workflows and trigger
+contexts, plus the fake Snowflake sessions/connections from
+`tests/fakes.py` that inject latency.
+
+Imported by `bench_suite.py` (and puts src/ and tests/ on sys.path);
+everything takes a `random.Random` so a seed reproduces the same load.
+"""
+
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from control_plane import models, policies  # noqa: E402
+from fakes import FakeConnection, FakeSession  # noqa: E402,F401  (re-exported for the suite)
+
+ROLES = ["admin", "analyst", "engineer", "viewer", "auditor"]
+REGIONS = ["us", "eu", "apac", "latam"]
+TAGS = ["PII", "Finance", "Public", "Internal"]
+ACTIONS = ["trigger_retrain", "notify_slack", "open_ticket", "notify_security"]
+
+
+# ----------------------------------------------------------------------
+# Policies and workflows
+# ----------------------------------------------------------------------
+
+def drift_policies(n: int, rng: random.Random) -> Dict[str, policies.Policy]:
+    """Threshold policies for `policies.PolicyEngine`, keyed by name."""
+    out = {}
+    for i in range(n):
+        name = f"drift_policy_{i}"
+        out[name] = policies.Policy(
+            name=name,
+            description="Synthetic drift threshold.",
+            conditions={"max_drift": round(rng.uniform(0.05, 0.3), 3)},
+            actions=rng.sample(ACTIONS, 2),
+        )
+    return out
+
+
+def rule_policies(n: int, rng: random.Random) -> Dict[str, models.Policy]:
+    """Rule policies for `policy_engine.PolicyEngine`, keyed by policy_id."""
+    out = {}
+    for i in range(n):
+        rules = [
+            {"field": "observed_drift", "op": "le", "value": round(rng.uniform(0.25, 0.5), 3)},
+            {"field": "user_role", "op": "ne", "value": "viewer"},
+            {
+                "any": [
+                    {"field": "region", "op": "eq", "value": rng.choice(REGIONS)},
+                    {"field": "asset.tags", "op": "contains", "value": rng.choice(TAGS)},
+                    {"field": "risk_score", "op": "lt", "value": 0.9},
+                ]
+            },
+        ]
+        policy_id = f"policy_{i}"
+        out[policy_id] = models.Policy(
+            policy_id=policy_id,
+            name=f"Synthetic policy {i}",
+            description="Synthetic rule policy.",
+            rules=rules,
+        )
+    return out
+
+
+def steps(n: int) -> List[Dict[str, Any]]:
+    """A chain of `n` steps of type "noop"."""
+    return [{"name": f"step_{i}", "type": "noop"} for i in range(n)]
+
+
+def workflows(
+    n: int,
+    policy_ids: List[str],
+    policies_per_workflow: int,
+    steps_per_workflow: int,
+    rng: random.Random,
+) -> List[models.Workflow]:
+    """`models.Workflow`s each guarded by a sample of `policy_ids`."""
+    k = min(policies_per_workflow, len(policy_ids))
+    return [
+        models.Workflow(
+            workflow_id=f"workflow_{i}",
+            name=f"workflow_{i}",
+            description="Synthetic workflow.",
+            steps=steps(steps_per_workflow),
+            policies=rng.sample(policy_ids, k),
+        )
+        for i in range(n)
+    ]
+
+
+def context(rng: random.Random) -> Dict[str, Any]:
+    """A trigger context; rule policies deny roughly one in five."""
+    return {
+        "observed_drift": rng.random() * 0.3,
+        "user_role": rng.choice(ROLES),
+        "region": rng.choice(REGIONS),
+        "risk_score": rng.random(),
+        "asset": {"tags": rng.sample(TAGS, 2)},
+    }
+
+
+def contexts(n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    return [context(rng) for _ in range(n)]
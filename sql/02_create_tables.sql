@@ -1,11 +1,33 @@
-USE DATABASE CONTROL_PLANE_DB;
-USE SCHEMA CONTROL_PLANE_MONITORING;
-
-CREATE OR REPLACE TABLE RUN_LOG (
-    RUN_ID      STRING,
-    WORKFLOW    STRING,
-    STATUS      STRING,
-    DETAILS     VARIANT,
-    CREATED_AT  TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
-    UPDATED_AT  TIMESTAMP_NTZ
-);
+USE DATABASE CONTROL_PLANE_DB;
+USE SCHEMA CONTROL_PLANE_MONITORING;
+
+CREATE OR REPLACE TABLE RUN_LOG (
+    RUN_ID      STRING,
+    WORKFLOW    STRING,
+    STATUS      STRING,
+    DETAILS     VARIANT,
+    CREATED_AT  TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    UPDATED_AT  TIMESTAMP_NTZ
+);
+
+CREATE OR REPLACE TABLE WORKFLOW_RUN_LOG (
+    RUN_ID              STRING,
+    WORKFLOW_NAME       STRING,
+    STATUS              STRING,
+    START_TIME          TIMESTAMP_NTZ,
+    END_TIME            TIMESTAMP_NTZ,
+    INPUT_DATA          STRING,
+    ERRORS              STRING,
+    POLICIES_EVALUATED  INTEGER,
+    POLICIES_SKIPPED    INTEGER,
+    POLICIES_SHORT_CIRCUITED INTEGER
+);
+
+CREATE OR REPLACE TABLE WORKFLOW_RUN_DECISION (
+    RUN_ID      STRING,
+    SEQ         INTEGER,
+    POLICY_ID   STRING,
+    DECISION    STRING,
+    DETAILS     STRING,
+    DECIDED_AT  TIMESTAMP_NTZ
+);
@@ -1,17 +1,59 @@
-"""
-Enterprise AI Control Plane (Snowflake-native)
-
-This package defines a lightweight "AI OS"-style layer that coordinates:
-
-- Agents (e.g., Snowflake Intelligence Agent V2)
-- MLOps platforms (e.g., Atlas)
-- Governance engines (e.g., Governance Autopilot)
-- Cross-cutting workflows and policies
-"""
-
-from .config import ControlPlaneConfig
-from .registry import ControlPlaneRegistry
-from .agents import ControlPlaneAgent, AtlasAgent, IntelligenceAgent
-from .policies import Policy, PolicyEngine
-from .workflows import Workflow, WorkflowEngine
-from .observability import RunLogger
+"""
+Enterprise AI Control Plane (Snowflake-native)
+
+This package defines a lightweight "AI OS"-style layer that coordinates:
+
+- Agents (e.g., Snowflake Intelligence Agent V2)
+- MLOps platforms (e.g., Atlas)
+- Governance engines (e.g., Governance Autopilot)
+- Cross-cutting workflows and policies
+
+Public names are loaded lazily: `import control_plane` is cheap, and a
+submodule (and its dependencies, e.g. NumPy) is only imported when one
+of its names is first accessed.
+
+The package logs under the "control_plane" logger and, as a library,
+installs only a `NullHandler`; see `logs.configure_logging()`.
+"""
+
+import logging
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+_EXPORTS = {
+    "ControlPlaneConfig": ".config",
+    "ControlPlaneRegistry": ".registry",
+    "ControlPlaneAgent": ".agents",
+    "AtlasAgent": ".agents",
+    "IntelligenceAgent": ".agents",
+    "Policy": ".policies",
+    "PolicyEngine": ".policies",
+    "Workflow": ".workflows",
+    "WorkflowEngine": ".workflows",
+    "RunLogger": ".observability",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .config import ControlPlaneConfig
+    from .registry import ControlPlaneRegistry
+    from .agents import ControlPlaneAgent, AtlasAgent, IntelligenceAgent
+    from .policies import Policy, PolicyEngine
+    from .workflows import Workflow, WorkflowEngine
+    from .observability import RunLogger
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,59 +1,247 @@
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
-
-
-@dataclass
-class ControlPlaneAgent:
-    """
-    Base abstraction for any agent the Control Plane can call.
-
-    This might wrap:
-    - A Snowflake Intelligence Agent
-    - A governance evaluation agent
-    - An Atlas-triggering agent
-    """
-
-    name: str
-    description: str
-
-    def run(self, **kwargs) -> Dict[str, Any]:
-        raise NotImplementedError("Agent.run must be implemented by subclasses.")
-
-
-@dataclass
-class IntelligenceAgent(ControlPlaneAgent):
-    session: Any  # Snowflake Snowpark session
-    agent_impl: Any  # e.g., snowflake-intelligence-agent-v2.IntelligenceAgent
-
-    def run(self, query: str, **kwargs) -> Dict[str, Any]:
-        result = self.agent_impl.run(query=query)
-        return {
-            "agent": self.name,
-            "query": query,
-            "result": result,
-        }
-
-
-@dataclass
-class AtlasAgent(ControlPlaneAgent):
-    session: Any  # Snowflake Snowpark session
-
-    def run(self, action: str, **kwargs) -> Dict[str, Any]:
-        """
-        Thin abstraction to call Atlas-related stored procedures or tasks.
-
-        e.g., action = "check_drift", "trigger_retrain"
-        """
-        if action == "check_drift":
-            sql = "CALL ATLAS_PLATFORM_DB.ATLAS_MONITORING.CHECK_DRIFT();"
-        elif action == "trigger_retrain":
-            sql = "CALL ATLAS_PLATFORM_DB.ATLAS_MONITORING.TRIGGER_RETRAIN();"
-        else:
-            return {"error": f"Unknown Atlas action: {action}"}
-
-        df = self.session.sql(sql).collect()
-        return {
-            "agent": self.name,
-            "action": action,
-            "result": [row.as_dict() for row in df],
-        }
+from dataclasses import dataclass, field
+from datetime import datetime
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from .cache import TTLCache
+from .timing import tracer
+
+if TYPE_CHECKING:
+    from .guard import Guard
+
+
+@dataclass
+class ControlPlaneAgent:
+    """
+    Base abstraction for any agent the Control Plane can call.
+
+    This might wrap:
+    - A Snowflake Intelligence Agent
+    - A governance evaluation agent
+    - An Atlas-triggering agent
+    """
+
+    name: str
+    description: str
+
+    def run(self, **kwargs) -> Dict[str, Any]:
+        raise NotImplementedError("Agent.run must be implemented by subclasses.")
+
+
+@dataclass
+class IntelligenceAgent(ControlPlaneAgent):
+    """
+    Wraps a Snowflake Intelligence Agent implementation.
+
+    Pass a `TTLCache` as `cache` to memoize results. Entries are keyed on
+    the normalized query (case- and whitespace-insensitive) plus the
+    caller's `context_fingerprint`, so the same question asked about
+    different data is not shared. Concurrent identical requests are
+    collapsed into one agent call.
+
+    Pass a `guard.Guard` as `guard` to bound concurrency, retry and break
+    the circuit on agent calls; results then carry the guard's "guard"
+    info, and a result served from the guard's fallback is not cached.
+    """
+    session: Any  # Snowflake Snowpark session
+    agent_impl: Any  # e.g., snowflake-intelligence-agent-v2.IntelligenceAgent
+    cache: Optional[TTLCache] = None
+    guard: Optional["Guard"] = None
+
+    @staticmethod
+    def cache_key(query: str, context_fingerprint: Optional[str] = None):
+        return (" ".join(query.split()).casefold(), context_fingerprint)
+
+    def run(
+        self,
+        query: str,
+        context_fingerprint: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        if not tracer.enabled:
+            return self._run(query, context_fingerprint)
+        with tracer.span("agent", self.name):
+            return self._run(query, context_fingerprint)
+
+    def _run(self, query: str, context_fingerprint: Optional[str]) -> Dict[str, Any]:
+        key = self.cache_key(query, context_fingerprint)
+        guard_info = None
+
+        def call() -> Any:
+            nonlocal guard_info
+            if self.guard is None:
+                return self.agent_impl.run(query=query)
+            result, guard_info = self.guard.call(self.agent_impl.run, query=query, cache_key=key)
+            return result
+
+        if self.cache is None:
+            output = {
+                "agent": self.name,
+                "query": query,
+                "result": call(),
+            }
+        else:
+            result, cached = self.cache.get_or_compute(key, call)
+            if guard_info is not None and guard_info["fallback"]:
+                self.cache.invalidate(key)  # stale: don't serve it as fresh
+            output = {
+                "agent": self.name,
+                "query": query,
+                "result": result,
+                "cached": cached,
+            }
+        if guard_info is not None:
+            output["guard"] = guard_info
+        return output
+
+
+class DriftSnapshot(Sequence):
+    """
+    Columnar result of one CHECK_DRIFT call.
+
+    Holds one tuple per column instead of a dict per row. It is still a
+    sequence of row dicts, as the result used to be a list of them:
+    `snapshot[0]["DRIFT"]` and iteration build rows on demand, and
+    `to_rows()` lists them, which is also how `sql.to_json` stores a
+    snapshot.
+    """
+
+    __slots__ = ("columns", "names", "taken_at")
+
+    def __init__(self, names: Sequence[str], columns: Sequence[Tuple[Any, ...]], taken_at: datetime):
+        self.names = tuple(names)
+        self.columns = dict(zip(self.names, columns))
+        self.taken_at = taken_at
+
+    @classmethod
+    def from_rows(cls, rows: List[Any]) -> "DriftSnapshot":
+        """Builds a snapshot from Snowpark Rows (tuples with named fields)."""
+        taken_at = datetime.utcnow()
+        if not rows:
+            return cls((), (), taken_at)
+        names = list(rows[0].as_dict().keys())
+        return cls(names, list(zip(*rows)), taken_at)
+
+    def column(self, name: str) -> Tuple[Any, ...]:
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return len(self.columns[self.names[0]]) if self.names else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("DriftSnapshot index out of range")
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for values in zip(*self.columns.values()):
+            yield dict(zip(self.names, values))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (DriftSnapshot, list)):
+            return self.to_rows() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+
+@dataclass
+class AtlasAgent(ControlPlaneAgent):
+    """
+    Calls Atlas stored procedures.
+
+    `check_drift` results are shared: callers within `drift_freshness_s`
+    of the last call reuse its snapshot, and concurrent callers wait for
+    a single in-flight CALL. `trigger_retrain` requests for the same
+    `model` within `retrain_cooldown_s` (or while one is in flight)
+    return the first request's result instead of calling again; requests
+    without a `model` always call.
+
+    With a `guard.Guard` as `guard`, procedure calls go through it;
+    CHECK_DRIFT is retried and can be served from the guard's fallback,
+    TRIGGER_RETRAIN is never retried. Results carry the "guard" info.
+    """
+    session: Any  # Snowflake Snowpark session
+    drift_freshness_s: float = 0.0
+    retrain_cooldown_s: float = 0.0
+    guard: Optional["Guard"] = None
+    _drift_cache: TTLCache = field(init=False, repr=False)
+    _retrain_cache: TTLCache = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._drift_cache = TTLCache(maxsize=1, ttl_s=self.drift_freshness_s)
+        self._retrain_cache = TTLCache(maxsize=1024, ttl_s=self.retrain_cooldown_s)
+
+    def _call(self, sql: str) -> List[Any]:
+        return self.session.sql(sql).collect()
+
+    def _guarded(self, sql: str, idempotent: bool, info: Dict[str, Any]) -> List[Any]:
+        if self.guard is None:
+            return self._call(sql)
+        rows, guard_info = self.guard.call(
+            self._call, sql, cache_key=sql if idempotent else None, idempotent=idempotent
+        )
+        info["guard"] = guard_info
+        return rows
+
+    def run(self, action: str, **kwargs) -> Dict[str, Any]:
+        """
+        Thin abstraction to call Atlas-related stored procedures or tasks.
+
+        e.g., action = "check_drift", "trigger_retrain"
+        """
+        if not tracer.enabled:
+            return self._run(action, **kwargs)
+        with tracer.span("agent", self.name):
+            return self._run(action, **kwargs)
+
+    def _run(self, action: str, **kwargs) -> Dict[str, Any]:
+        info: Dict[str, Any] = {}
+        if action == "check_drift":
+            snapshot, cached = self._drift_cache.get_or_compute(
+                "check_drift",
+                lambda: DriftSnapshot.from_rows(
+                    self._guarded("CALL ATLAS_PLATFORM_DB.ATLAS_MONITORING.CHECK_DRIFT();", True, info)
+                ),
+            )
+            if info.get("guard", {}).get("fallback"):
+                self._drift_cache.invalidate("check_drift")
+            output = {
+                "agent": self.name,
+                "action": action,
+                "result": snapshot,
+                "cached": cached,
+            }
+            output.update(info)
+            return output
+        elif action == "trigger_retrain":
+            def retrain() -> List[Dict[str, Any]]:
+                return [
+                    row.as_dict()
+                    for row in self._guarded(
+                        "CALL ATLAS_PLATFORM_DB.ATLAS_MONITORING.TRIGGER_RETRAIN();", False, info
+                    )
+                ]
+
+            model = kwargs.get("model")
+            if model is None:
+                rows, deduplicated = retrain(), False
+            else:
+                rows, deduplicated = self._retrain_cache.get_or_compute(model, retrain)
+            output = {
+                "agent": self.name,
+                "action": action,
+                "result": rows,
+                "deduplicated": deduplicated,
+            }
+            output.update(info)
+            return output
+        else:
+            return {"error": f"Unknown Atlas action: {action}"}
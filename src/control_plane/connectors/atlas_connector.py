@@ -1,5 +1,8 @@
+import logging
 from typing import Dict, Any
 
+log = logging.getLogger(__name__)
+
 class AtlasConnector:
     """
     A stub connector for interfacing with a data catalog like Apache Atlas.
@@ -15,7 +18,7 @@ class AtlasConnector:
         """
         self.atlas_url = atlas_url
         self.credentials = credentials
-        print("INFO: AtlasConnector initialized (stub).")
+        log.info("AtlasConnector initialized (stub).", extra={"atlas_url": atlas_url})
 
     def get_asset_lineage(self, asset_id: str) -> Dict[str, Any]:
         """
@@ -30,7 +33,7 @@ class AtlasConnector:
         Returns:
             A dictionary representing the asset's lineage.
         """
-        print(f"INFO: Fetching lineage for asset '{asset_id}' from Atlas (stub).")
+        log.debug("Fetching lineage for asset '%s' from Atlas (stub).", asset_id)
         
         # Return a dummy lineage structure
         return {
@@ -54,7 +57,7 @@ class AtlasConnector:
         Returns:
             A dictionary of the asset's metadata.
         """
-        print(f"INFO: Fetching metadata for asset '{asset_id}' from Atlas (stub).")
+        log.debug("Fetching metadata for asset '%s' from Atlas (stub).", asset_id)
 
         return {
             "asset_id": asset_id,
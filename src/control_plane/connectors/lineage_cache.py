@@ -0,0 +1,185 @@
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from ..cache import TTLCache
+from ..timing import tracer
+
+log = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# (input guids, output guids) of one asset
+Edges = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+class LineageCache:
+    """
+    Memoized Atlas lineage and metadata with a local adjacency index.
+
+    Wraps anything with `get_asset_lineage` / `get_asset_metadata` (e.g.
+    `AtlasConnector`). Each asset's one-hop inputs/outputs and its
+    metadata (tags included) are cached for `ttl_s` seconds, and
+    transitive queries walk the cached graph. A traversal fetches every
+    uncached node of a level as one concurrent batch of up to
+    `max_workers` connector calls, so a lineage D hops deep costs D round
+    trips on a cold cache and none on a warm one. Concurrent callers
+    missing the same asset share a single connector call.
+    """
+
+    def __init__(
+        self,
+        connector: Any,
+        ttl_s: float = 300.0,
+        maxsize: int = 100_000,
+        max_workers: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.connector = connector
+        self.max_workers = max_workers
+        self._lineage = TTLCache(maxsize=maxsize, ttl_s=ttl_s, clock=clock)
+        self._metadata = TTLCache(maxsize=maxsize, ttl_s=ttl_s, clock=clock)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # ------------------------------------------------------------------
+    # Single assets
+    # ------------------------------------------------------------------
+
+    def lineage(self, guid: str) -> Edges:
+        return self._fetch_many(self._lineage, [guid], self._fetch_lineage)[guid]
+
+    def metadata(self, guid: str) -> Dict[str, Any]:
+        return self._fetch_many(self._metadata, [guid], self.connector.get_asset_metadata)[guid]
+
+    def tags(self, guid: str) -> FrozenSet[str]:
+        return frozenset(self.metadata(guid).get("tags") or ())
+
+    def prefetch(self, guids: Iterable[str], metadata: bool = True) -> None:
+        """Fetches lineage (and metadata) for any of `guids` not cached."""
+        guids = list(guids)
+        self._fetch_many(self._lineage, guids, self._fetch_lineage)
+        if metadata:
+            self._fetch_many(self._metadata, guids, self.connector.get_asset_metadata)
+
+    # ------------------------------------------------------------------
+    # Transitive queries
+    # ------------------------------------------------------------------
+
+    def upstream(self, guid: str, max_depth: Optional[int] = None) -> List[str]:
+        """Every asset `guid` is derived from, nearest first."""
+        return self._walk(guid, 0, max_depth)
+
+    def downstream(self, guid: str, max_depth: Optional[int] = None) -> List[str]:
+        """Every asset derived from `guid`, nearest first."""
+        return self._walk(guid, 1, max_depth)
+
+    def upstream_tags(self, guid: str, max_depth: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        Tags that propagate to `guid` from itself and its upstream assets.
+
+        Returns tag -> guids carrying it, nearest first.
+        """
+        guids = [guid] + self.upstream(guid, max_depth)
+        metadata = self._fetch_many(self._metadata, guids, self.connector.get_asset_metadata)
+        propagated: Dict[str, List[str]] = {}
+        for node in guids:
+            for tag in metadata[node].get("tags") or ():
+                propagated.setdefault(tag, []).append(node)
+        return propagated
+
+    def upstream_with_tag(self, guid: str, tag: str, max_depth: Optional[int] = None) -> List[str]:
+        """Upstream assets (or `guid` itself) carrying `tag`, e.g. "PII"."""
+        return self.upstream_tags(guid, max_depth).get(tag, [])
+
+    def _walk(self, guid: str, side: int, max_depth: Optional[int]) -> List[str]:
+        # side 0 follows inputs (upstream), side 1 follows outputs (downstream).
+        order: List[str] = []
+        seen = {guid}
+        frontier = [guid]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            lineage = self._fetch_many(self._lineage, frontier, self._fetch_lineage)
+            next_frontier = []
+            for node in frontier:
+                for neighbour in lineage[node][side]:
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        next_frontier.append(neighbour)
+            order.extend(next_frontier)
+            frontier = next_frontier
+            depth += 1
+        return order
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    def _fetch_lineage(self, guid: str) -> Edges:
+        lineage = self.connector.get_asset_lineage(guid)
+        return (
+            tuple(entity["guid"] for entity in lineage.get("inputs") or ()),
+            tuple(entity["guid"] for entity in lineage.get("outputs") or ()),
+        )
+
+    def _fetch_many(
+        self,
+        cache: TTLCache,
+        guids: Iterable[str],
+        fetch: Callable[[str], Any],
+    ) -> Dict[str, Any]:
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        for guid in dict.fromkeys(guids):
+            value = cache.get(guid, _MISSING)
+            if value is _MISSING:
+                missing.append(guid)
+            else:
+                found[guid] = value
+        if not missing:
+            return found
+
+        def load(guid: str) -> Any:
+            # Single-flight: concurrent traversals that miss the same guid
+            # share one connector call.
+            return cache.get_or_compute(guid, functools.partial(fetch, guid))[0]
+
+        if not tracer.enabled:
+            values = self._fetch_values(missing, load)
+        else:
+            with tracer.span("connector", "atlas"):
+                values = self._fetch_values(missing, load)
+        log.debug("Loaded %d uncached Atlas assets", len(missing))
+        found.update(zip(missing, values))
+        return found
+
+    def _fetch_values(self, guids: List[str], fetch: Callable[[str], Any]) -> List[Any]:
+        if len(guids) == 1 or self.max_workers <= 1:
+            return [fetch(guid) for guid in guids]
+        return list(self._get_executor().map(fetch, guids))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="atlas-lineage",
+            )
+        return self._executor
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def invalidate(self, guid: Optional[str] = None) -> None:
+        """Drops one asset, or every asset if no guid is given."""
+        self._lineage.invalidate(guid)
+        self._metadata.invalidate(guid)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {"lineage": self._lineage.stats(), "metadata": self._metadata.stats()}
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,109 @@
+"""
+The per-run bookkeeping shared by both workflow engines.
+
+    core = RunCore(on_start=..., on_finish=...)
+    run_log = core.execute("fraud_drift", context, body)
+
+`workflow_engine.WorkflowEngine` and `workflows.WorkflowEngine` are
+adapters over `RunCore`: each supplies the body of a run (policy checks
+and steps, or a workflow handler) and how runs are persisted, and turns
+the resulting `RunLog` into its own return value. Run ids, timestamps,
+status, error capture and the "log_write" timing live here once.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from .models import RunLog, RunStatus
+from .timing import tracer
+from .utils import new_run_id
+
+# on_finish(run_log, result, error): error is None for a completed run.
+FinishHook = Callable[[RunLog, Any, Optional[BaseException]], None]
+
+
+class RunCore:
+    """
+    Starts, runs and finishes workflow runs.
+
+    `on_start(run_log)` is called once a run's record exists and
+    `on_finish(run_log, result, error)` once it has ended; both are timed
+    as "log_write" spans and either may be None. `execute` covers the
+    synchronous case; async callers use `start` and `finish` around their
+    own awaiting.
+    """
+
+    __slots__ = ("on_start", "on_finish")
+
+    def __init__(
+        self,
+        on_start: Optional[Callable[[RunLog], None]] = None,
+        on_finish: Optional[FinishHook] = None,
+    ):
+        self.on_start = on_start
+        self.on_finish = on_finish
+
+    def start(
+        self,
+        name: str,
+        context: Dict[str, Any],
+        run_id: Optional[str] = None,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> RunLog:
+        run_log = RunLog(
+            run_id=run_id or new_run_id(),
+            workflow_name=name,
+            status=RunStatus.STARTED,
+            start_time=datetime.utcnow(),
+            input_data=context,
+            timings={} if timings is None else timings,
+        )
+        if self.on_start is not None:
+            if not tracer.enabled:
+                self.on_start(run_log)
+            else:
+                with tracer.span("log_write"):
+                    self.on_start(run_log)
+        return run_log
+
+    def finish(
+        self,
+        run_log: RunLog,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> RunLog:
+        if error is None:
+            run_log.status = RunStatus.COMPLETED
+        else:
+            run_log.status = RunStatus.FAILED
+            run_log.errors.append(str(error))
+        run_log.end_time = datetime.utcnow()
+        if self.on_finish is not None:
+            if not tracer.enabled:
+                self.on_finish(run_log, result, error)
+            else:
+                with tracer.span("log_write"):
+                    self.on_finish(run_log, result, error)
+        return run_log
+
+    def execute(
+        self,
+        name: str,
+        context: Dict[str, Any],
+        body: Callable[[RunLog], Any],
+        run_id: Optional[str] = None,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> RunLog:
+        """
+        Runs `body(run_log)` as one run and returns its finished RunLog.
+
+        An exception from `body` fails the run and is recorded in
+        `run_log.errors`; it is not raised. Exceptions from the hooks
+        are.
+        """
+        run_log = self.start(name, context, run_id, timings)
+        try:
+            result = body(run_log)
+        except Exception as exc:
+            return self.finish(run_log, error=exc)
+        return self.finish(run_log, result)
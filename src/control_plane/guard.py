@@ -0,0 +1,345 @@
+"""
+Overload protection for calls to agents and connectors.
+
+    guard = Guard("intelligence", fallback=TTLCache(maxsize=1024, ttl_s=3600))
+    value, info = guard.call(agent_impl.run, query=query, cache_key=query)
+
+A `Guard` combines an `AdaptiveLimit` (AIMD concurrency sized from
+observed latency), a `CircuitBreaker` and retries with jittered
+exponential backoff. `info` describes what happened to the call
+(attempts, breaker state, current limit, whether a cached value was
+served) and is meant to be copied into run results.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Type
+
+from .cache import TTLCache
+
+log = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_MISSING = object()
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+
+class OverloadedError(RuntimeError):
+    """Raised when no concurrency slot frees up within the acquire timeout."""
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit adjusted by additive increase / multiplicative decrease.
+
+    A call that succeeds within `target_latency_s` raises the limit by
+    1/limit, so about +1 per limit's worth of calls. A slower or failed
+    call multiplies it by `decrease`, at most once per round trip: calls
+    that started before the last cut don't cut it again. The limit stays
+    within [min_limit, max_limit]; callers beyond it wait in `acquire`.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        target_latency_s: float = 1.0,
+        decrease: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial <= max_limit.")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1.")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency_s = target_latency_s
+        self.decrease = decrease
+        self._clock = clock
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._last_cut = float("-inf")
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """
+        Waits for a free slot and returns the call's start time.
+
+        Raises:
+            OverloadedError: If no slot frees up within `timeout` seconds.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._in_flight < int(self._limit), timeout):
+                raise OverloadedError(f"No slot within {timeout}s (limit {int(self._limit)}).")
+            self._in_flight += 1
+            return self._clock()
+
+    def release(self, started: float, ok: Optional[bool]) -> None:
+        """Frees a slot; `ok=None` frees it without adjusting the limit."""
+        now = self._clock()
+        with self._cond:
+            self._in_flight -= 1
+            if ok and now - started <= self.target_latency_s:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            elif ok is not None and started >= self._last_cut:
+                self._limit = max(self.min_limit, self._limit * self.decrease)
+                self._last_cut = now
+            self._cond.notify_all()
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a dependency that keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    `allow()` refuses calls. After `reset_timeout_s` it is half-open: one
+    trial call is let through, and its success closes the circuit while
+    its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout_s:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout_s:
+                    return False
+                self._state = HALF_OPEN
+                self._trial = False
+            if self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                log.info("Circuit closed after a successful trial call")
+            self._state = CLOSED
+            self._failures = 0
+            self._trial = False
+
+    def release(self) -> None:
+        """Ends a call that was allowed but has no outcome to record."""
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                log.warning("Circuit opened after %d consecutive failures", self._failures)
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._trial = False
+
+
+class Guard:
+    """
+    Protects the calls to one agent or connector.
+
+    `call(fn, *args, **kwargs)` waits for a slot of `limit`, asks
+    `breaker` whether to call at all, and retries failures (instances of
+    `retry_on`) up to `retries` times, sleeping a random time up to
+    `backoff_s * 2**(attempt - 1)` (capped at `max_backoff_s`) in
+    between. Calls that are not `idempotent` are never retried.
+
+    With a `fallback` cache, every success with a `cache_key` is kept, and
+    a call that is refused (open circuit, no slot within
+    `acquire_timeout_s`) or that fails for good returns the last good
+    value for its key instead of raising. Without one it fails fast with
+    `CircuitOpenError`, `OverloadedError` or the call's own exception.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: Optional[AdaptiveLimit] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        retries: int = 2,
+        backoff_s: float = 0.1,
+        max_backoff_s: float = 5.0,
+        acquire_timeout_s: Optional[float] = None,
+        fallback: Optional[TTLCache] = None,
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+        rng: Optional[random.Random] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.name = name
+        self.limit = limit or AdaptiveLimit()
+        self.breaker = breaker or CircuitBreaker()
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.acquire_timeout_s = acquire_timeout_s
+        self.fallback = fallback
+        self.retry_on = retry_on
+        self._rng = rng or random.Random()
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.stats = {
+            "calls": 0, "succeeded": 0, "failed": 0, "retries": 0,
+            "rejected": 0, "shed": 0, "fallbacks": 0,
+        }
+
+    def call(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        cache_key: Optional[Hashable] = None,
+        idempotent: bool = True,
+        **kwargs,
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """Returns (value, info) for `fn(*args, **kwargs)`."""
+        self._count("calls")
+        attempts = 0
+        while True:
+            try:
+                started = self.limit.acquire(self.acquire_timeout_s)
+            except OverloadedError as exc:
+                self._count("shed")
+                return self._fall_back(cache_key, attempts, exc)
+            if not self.breaker.allow():
+                self.limit.release(started, ok=None)
+                self._count("rejected")
+                return self._fall_back(
+                    cache_key, attempts, CircuitOpenError(f"Circuit for '{self.name}' is open.")
+                )
+
+            attempts += 1
+            try:
+                value = fn(*args, **kwargs)
+            except self.retry_on as exc:
+                self.limit.release(started, ok=False)
+                error = exc
+            except BaseException:
+                # Not the dependency failing (e.g. an interrupt): no verdict.
+                self.limit.release(started, ok=None)
+                self.breaker.release()
+                raise
+            else:
+                self.limit.release(started, ok=True)
+                self.breaker.record_success()
+                self._count("succeeded")
+                if cache_key is not None and self.fallback is not None:
+                    self.fallback.set(cache_key, value)
+                return value, self._info(attempts, fallback=False)
+
+            self.breaker.record_failure()
+            if not idempotent or attempts > self.retries:
+                self._count("failed")
+                return self._fall_back(cache_key, attempts, error)
+            self._count("retries")
+            delay = min(self.max_backoff_s, self.backoff_s * 2 ** (attempts - 1))
+            log.debug("Retrying '%s' (attempt %d) after %s", self.name, attempts, error)
+            self._sleep(self._rng.uniform(0, delay))
+
+    def _fall_back(
+        self,
+        cache_key: Optional[Hashable],
+        attempts: int,
+        error: BaseException,
+    ) -> Tuple[Any, Dict[str, Any]]:
+        if cache_key is not None and self.fallback is not None:
+            value = self.fallback.get(cache_key, _MISSING)
+            if value is not _MISSING:
+                self._count("fallbacks")
+                log.debug("Serving cached result for '%s': %s", self.name, error)
+                return value, self._info(attempts, fallback=True)
+        raise error
+
+    def _info(self, attempts: int, fallback: bool) -> Dict[str, Any]:
+        return {
+            "guard": self.name,
+            "state": self.breaker.state,
+            "limit": self.limit.limit,
+            "attempts": attempts,
+            "fallback": fallback,
+        }
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state, limit and counters, e.g. for a health endpoint."""
+        with self._lock:
+            stats = dict(self.stats)
+        return dict(
+            stats,
+            guard=self.name,
+            state=self.breaker.state,
+            limit=self.limit.limit,
+            in_flight=self.limit.in_flight,
+        )
+
+
+class GuardedConnector:
+    """
+    Routes every public method call of `connector` through `guard`.
+
+    Calls are keyed on the method name and positional arguments for the
+    guard's fallback cache, so e.g. `get_asset_lineage(guid)` can be
+    answered from cache while Atlas is down. Can stand in for the
+    connector, e.g. in `LineageCache`.
+    """
+
+    def __init__(self, connector: Any, guard: Guard):
+        self.connector = connector
+        self.guard = guard
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.connector, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        def guarded(*args, **kwargs):
+            key: Optional[Hashable] = None if kwargs else (name,) + args
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+            return self.guard.call(attr, *args, cache_key=key, **kwargs)[0]
+
+        return guarded
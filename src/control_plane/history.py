@@ -0,0 +1,411 @@
+import sys
+import threading
+from array import array
+from collections import Counter, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from .models import Decision, DecisionKind, RunLog, RunStatus
+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+_EPOCH = datetime(1970, 1, 1)
+_STATUSES = tuple(RunStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_KINDS = tuple(DecisionKind)
+_KIND_CODES = {kind: code for code, kind in enumerate(_KINDS)}
+
+
+@dataclass(frozen=True, **_SLOTS)
+class HistoricalRun:
+    """A run read back from `RunHistory`."""
+    run_id: str
+    workflow_name: str
+    status: RunStatus
+    start_time: datetime
+    end_time: Optional[datetime]
+    decisions: Tuple[Decision, ...]
+    errors: Tuple[str, ...] = ()
+
+
+class RunHistory:
+    """
+    Compact, append-only history of finished runs for dashboards.
+
+    Runs and their decisions are stored column-wise in `array.array`s:
+    workflow names and policy ids are interned once into a shared table
+    and referenced by index, statuses and decisions are one-byte codes,
+    and timestamps are float seconds. Of a decision's details only
+    `failed_rule` is kept; rule text lives in the policy registry.
+    Input data and step results are not retained.
+    """
+
+    def __init__(self):
+        self._names: List[str] = []
+        self._name_codes: Dict[str, int] = {}
+
+        self._run_ids: List[str] = []
+        self._workflow = array("I")
+        self._status = array("B")
+        self._start = array("d")
+        self._end = array("d")                    # NaN when the run has no end time
+        self._decision_offsets = array("I", [0])  # run i owns [off[i], off[i+1])
+        self._errors: Dict[int, Tuple[str, ...]] = {}
+
+        self._policy = array("I")
+        self._kind = array("B")
+        self._failed_rule = array("i")            # -1 when no rule failed
+        self._timestamp = array("d")
+
+    def append(self, run_log: RunLog) -> None:
+        for decision in run_log.decisions:
+            self._policy.append(self._intern(decision.policy_id))
+            self._kind.append(_KIND_CODES[DecisionKind(decision.decision)])
+            failed = decision.details.get("failed_rule") if decision.details else None
+            self._failed_rule.append(-1 if failed is None else failed)
+            self._timestamp.append(_to_seconds(decision.timestamp))
+
+        self._run_ids.append(run_log.run_id)
+        self._workflow.append(self._intern(run_log.workflow_name))
+        self._status.append(_STATUS_CODES[RunStatus(run_log.status)])
+        self._start.append(_to_seconds(run_log.start_time))
+        self._end.append(float("nan") if run_log.end_time is None else _to_seconds(run_log.end_time))
+        self._decision_offsets.append(len(self._policy))
+        if run_log.errors:
+            self._errors[len(self._run_ids) - 1] = tuple(run_log.errors)
+
+    def __len__(self) -> int:
+        return len(self._run_ids)
+
+    def __getitem__(self, index: int) -> HistoricalRun:
+        if index < 0:
+            index += len(self._run_ids)
+        if not 0 <= index < len(self._run_ids):
+            raise IndexError("run history index out of range")
+
+        first, last = self._decision_offsets[index], self._decision_offsets[index + 1]
+        decisions = []
+        for i in range(first, last):
+            failed = self._failed_rule[i]
+            decisions.append(Decision(
+                policy_id=self._names[self._policy[i]],
+                decision=_KINDS[self._kind[i]],
+                details={} if failed < 0 else {"failed_rule": failed},
+                timestamp=_from_seconds(self._timestamp[i]),
+            ))
+        end = self._end[index]
+        return HistoricalRun(
+            run_id=self._run_ids[index],
+            workflow_name=self._names[self._workflow[index]],
+            status=_STATUSES[self._status[index]],
+            start_time=_from_seconds(self._start[index]),
+            end_time=None if end != end else _from_seconds(end),
+            decisions=tuple(decisions),
+            errors=self._errors.get(index, ()),
+        )
+
+    def __iter__(self) -> Iterator[HistoricalRun]:
+        for index in range(len(self._run_ids)):
+            yield self[index]
+
+    def decision_count(self) -> int:
+        return len(self._policy)
+
+    def _intern(self, name: str) -> int:
+        code = self._name_codes.get(name)
+        if code is None:
+            code = self._name_codes[name] = len(self._names)
+            self._names.append(sys.intern(name))
+        return code
+
+
+def _to_seconds(value: datetime) -> float:
+    # Naive datetimes are taken as UTC, matching `datetime.utcnow()` defaults.
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH).total_seconds()
+
+
+def _from_seconds(seconds: float) -> datetime:
+    return _EPOCH + timedelta(seconds=seconds)
+
+
+class _Bucket:
+    """Runs recorded in one time bucket, with per-bucket counters."""
+
+    __slots__ = ("seqs", "runs", "decisions")
+
+    def __init__(self):
+        self.seqs: Deque[int] = deque()
+        self.runs: Counter = Counter()       # (workflow_name or None, status) -> count
+        self.decisions: Counter = Counter()  # (policy_id, decision) -> count
+
+
+class RecentRuns:
+    """
+    Bounded in-memory ring buffer of recent `RunLog`s with query indexes.
+
+    Keeps the last `capacity` runs, indexed by workflow name, status,
+    policy id and time bucket (`bucket_s` seconds wide, keyed on the
+    run's end time, or its start time while it has none). Each bucket
+    also keeps run and decision counters, so aggregations over a time
+    range sum whole buckets and only inspect individual runs in the two
+    edge buckets; run counters also keep a (None, status) rollup across
+    workflows. Times are naive UTC datetimes, like `RunLog`'s.
+
+    Pass one to `RunLogWriter` or `RunLogger` (`history=`) to record
+    every logged run, and to `policies.PolicyEngine` for rate-limit
+    conditions.
+    """
+
+    def __init__(self, capacity: int = 10_000, bucket_s: float = 60.0):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive.")
+        if bucket_s <= 0:
+            raise ValueError("bucket_s must be positive.")
+        self.capacity = capacity
+        self.bucket_s = bucket_s
+        self._ring: List[Optional[RunLog]] = [None] * capacity
+        self._times = array("d", [0.0]) * capacity
+        # Index keys captured at record time, so later changes to a RunLog
+        # cannot desynchronize the indexes.
+        self._keys: List[Optional[_RunKeys]] = [None] * capacity
+        self._seq = 0  # sequence number of the next recorded run
+        self._by_workflow: Dict[str, Deque[int]] = {}
+        self._by_status: Dict[str, Deque[int]] = {}
+        self._by_policy: Dict[str, Deque[int]] = {}
+        self._buckets: Dict[int, _Bucket] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return min(self._seq, self.capacity)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record(self, run_log: RunLog) -> None:
+        when = _to_seconds(run_log.end_time or run_log.start_time)
+        with self._lock:
+            seq = self._seq
+            if seq >= self.capacity:
+                self._evict(seq - self.capacity)
+            slot = seq % self.capacity
+            keys = _RunKeys(run_log)
+            self._ring[slot] = run_log
+            self._times[slot] = when
+            self._keys[slot] = keys
+            self._seq = seq + 1
+
+            self._by_workflow.setdefault(keys.workflow, deque()).append(seq)
+            self._by_status.setdefault(keys.status, deque()).append(seq)
+            for policy_id in keys.policy_ids:
+                self._by_policy.setdefault(policy_id, deque()).append(seq)
+
+            key = int(when // self.bucket_s)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket()
+            bucket.seqs.append(seq)
+            bucket.runs.update(keys.runs)
+            bucket.decisions.update(keys.decisions)
+
+    def _evict(self, seq: int) -> None:
+        # Index deques hold sequence numbers in recording order, so the
+        # run being evicted is always at the front of each of its deques.
+        slot = seq % self.capacity
+        keys = self._keys[slot]
+        self._ring[slot] = self._keys[slot] = None
+        _pop_front(self._by_workflow, keys.workflow)
+        _pop_front(self._by_status, keys.status)
+        for policy_id in keys.policy_ids:
+            _pop_front(self._by_policy, policy_id)
+
+        key = int(self._times[slot] // self.bucket_s)
+        bucket = self._buckets[key]
+        bucket.seqs.popleft()
+        if not bucket.seqs:
+            del self._buckets[key]
+            return
+        bucket.runs.subtract(keys.runs)
+        bucket.decisions.subtract(keys.decisions)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def runs(
+        self,
+        workflow: Optional[str] = None,
+        status: Optional[str] = None,
+        policy_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[RunLog]:
+        """Matching runs recorded in [since, until), most recent first."""
+        start, end = _bounds(since, until)
+        with self._lock:
+            candidates = [
+                index.get(value, ()) for index, value in (
+                    (self._by_workflow, workflow),
+                    (self._by_status, status),
+                    (self._by_policy, policy_id),
+                ) if value is not None
+            ]
+            if candidates:
+                seqs = reversed(min(candidates, key=len))
+            else:
+                seqs = range(self._seq - 1, self._seq - len(self) - 1, -1)
+
+            out: List[RunLog] = []
+            for seq in seqs:
+                slot = seq % self.capacity
+                if not start <= self._times[slot] < end:
+                    continue
+                keys = self._keys[slot]
+                if workflow is not None and keys.workflow != workflow:
+                    continue
+                if status is not None and keys.status != status:
+                    continue
+                if policy_id is not None and policy_id not in keys.policy_ids:
+                    continue
+                out.append(self._ring[slot])
+                if limit is not None and len(out) >= limit:
+                    break
+            return out
+
+    def count(
+        self,
+        workflow: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> int:
+        """Number of matching runs recorded in [since, until)."""
+        statuses = RunStatus if status is None else (status,)
+        keys = [(workflow, run_status) for run_status in statuses]
+        return sum(self._aggregate("runs", since, until, keys).values())
+
+    def failure_rate(
+        self,
+        workflow: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Optional[float]:
+        """Failed / finished runs, or None when no run finished in range."""
+        counts = self._aggregate(
+            "runs", since, until,
+            [(workflow, RunStatus.COMPLETED), (workflow, RunStatus.FAILED)],
+        )
+        failed = counts[(workflow, RunStatus.FAILED)]
+        finished = failed + counts[(workflow, RunStatus.COMPLETED)]
+        return failed / finished if finished else None
+
+    def deny_rates(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Dict[str, float]:
+        """Policy id -> share of its decisions that were deny."""
+        totals: Counter = Counter()
+        denies: Counter = Counter()
+        for (policy_id, decision), n in self.decision_counts(since, until).items():
+            totals[policy_id] += n
+            if decision == DecisionKind.DENY:
+                denies[policy_id] += n
+        return {policy_id: denies[policy_id] / n for policy_id, n in totals.items() if n}
+
+    def deny_rate(
+        self,
+        policy_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Optional[float]:
+        """Share of `policy_id`'s decisions that were deny, or None without any."""
+        counts = self._aggregate(
+            "decisions", since, until, [(policy_id, kind) for kind in DecisionKind]
+        )
+        total = sum(counts.values())
+        return counts[(policy_id, DecisionKind.DENY)] / total if total else None
+
+    def run_counts(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Counter:
+        """(workflow_name, status) -> number of runs recorded in [since, until)."""
+        counts = self._aggregate("runs", since, until)
+        return Counter({key: n for key, n in counts.items() if key[0] is not None})
+
+    def decision_counts(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Counter:
+        """(policy_id, decision) -> number of decisions recorded in [since, until)."""
+        return self._aggregate("decisions", since, until)
+
+    def _aggregate(
+        self,
+        counters: str,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        keys: Optional[List[tuple]] = None,
+    ) -> Counter:
+        """Sums bucket counters over [since, until), restricted to `keys` if given."""
+        start, end = _bounds(since, until)
+        wanted = None if keys is None else set(keys)
+        total: Counter = Counter()
+        with self._lock:
+            for key, bucket in self._buckets.items():
+                bucket_start = key * self.bucket_s
+                bucket_end = bucket_start + self.bucket_s
+                if bucket_end <= start or bucket_start >= end:
+                    continue
+                if start <= bucket_start and bucket_end <= end:
+                    counter = getattr(bucket, counters)
+                    if keys is None:
+                        total.update(counter)
+                    else:
+                        for key in keys:
+                            n = counter.get(key)
+                            if n:
+                                total[key] += n
+                    continue
+                # Edge bucket: count its runs one by one.
+                for seq in bucket.seqs:
+                    slot = seq % self.capacity
+                    if not start <= self._times[slot] < end:
+                        continue
+                    run_keys = getattr(self._keys[slot], counters)
+                    if wanted is not None:
+                        run_keys = [key for key in run_keys if key in wanted]
+                    total.update(run_keys)
+        return +total  # drops zero counts left behind by eviction
+
+
+class _RunKeys:
+    __slots__ = ("workflow", "status", "runs", "policy_ids", "decisions")
+
+    def __init__(self, run_log: RunLog):
+        self.workflow = run_log.workflow_name
+        self.status = run_log.status
+        self.runs = ((self.workflow, self.status), (None, self.status))
+        self.decisions = tuple((d.policy_id, d.decision) for d in run_log.decisions)
+        self.policy_ids = tuple(dict.fromkeys(policy_id for policy_id, _ in self.decisions))
+
+
+def _pop_front(index: Dict[str, Deque[int]], key: str) -> None:
+    seqs = index[key]
+    seqs.popleft()
+    if not seqs:
+        del index[key]
+
+
+def _bounds(since: Optional[datetime], until: Optional[datetime]) -> Tuple[float, float]:
+    return (
+        float("-inf") if since is None else _to_seconds(since),
+        float("inf") if until is None else _to_seconds(until),
+    )
@@ -0,0 +1,303 @@
+import heapq
+import json
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .registry import ControlPlaneRegistry
+
+log = logging.getLogger(__name__)
+
+# (offset just past the event, parsed event or None if unparseable)
+SourceItem = Tuple[int, Optional[Dict[str, Any]]]
+
+
+class JsonlFileSource:
+    """
+    Reads events from a JSON-lines file, one object per line.
+
+    Reads one line at a time, so memory stays bounded however large the
+    file grows. Offsets are byte positions. With `follow=True` the source
+    keeps polling for appended lines (like `tail -f`) until `stop()`, and
+    a trailing line without its newline is treated as still being written
+    and left for the next poll; without it, that line is the last event.
+    Lines longer than `max_line_bytes` or that are not JSON objects are
+    skipped with a warning.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        follow: bool = False,
+        poll_interval_s: float = 0.5,
+        max_line_bytes: int = 1 << 20,
+    ):
+        self.path = path
+        self.follow = follow
+        self.poll_interval_s = poll_interval_s
+        self.max_line_bytes = max_line_bytes
+        self._offset = 0
+        self._stop = threading.Event()
+
+    def seek(self, offset: int) -> None:
+        self._offset = offset
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def __iter__(self) -> Iterator[SourceItem]:
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            while not self._stop.is_set():
+                start = f.tell()
+                line = f.readline(self.max_line_bytes + 1)
+                if line.endswith(b"\n"):
+                    yield f.tell(), _parse(line, start)
+                    continue
+                if len(line) > self.max_line_bytes:
+                    log.warning("Skipping event at offset %d: longer than %d bytes",
+                                start, self.max_line_bytes)
+                    if self._skip_line(f) or not self.follow:
+                        yield f.tell(), None
+                        continue
+                elif line and not self.follow:
+                    # Nothing will be appended: the unterminated line is the last event.
+                    yield f.tell(), _parse(line, start)
+                    return
+                # End of file, possibly inside a line that is still being written.
+                f.seek(start)
+                if not self.follow:
+                    return
+                self._stop.wait(self.poll_interval_s)
+
+    def _skip_line(self, f) -> bool:
+        while True:
+            chunk = f.readline(self.max_line_bytes)
+            if not chunk:
+                return False
+            if chunk.endswith(b"\n"):
+                return True
+
+
+class QueueSource:
+    """
+    Reads events from a `queue.Queue`, e.g. standing in for a Snowflake stream.
+
+    Offsets count events taken from the queue; they are only meaningful
+    within one process. Putting None on the queue ends the stream.
+    """
+
+    def __init__(self, events: "queue.Queue[Optional[Dict[str, Any]]]", poll_interval_s: float = 0.5):
+        self.events = events
+        self.poll_interval_s = poll_interval_s
+        self._offset = 0
+        self._stop = threading.Event()
+
+    def seek(self, offset: int) -> None:
+        self._offset = offset
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def __iter__(self) -> Iterator[SourceItem]:
+        while not self._stop.is_set():
+            try:
+                event = self.events.get(timeout=self.poll_interval_s)
+            except queue.Empty:
+                continue
+            if event is None:
+                return
+            self._offset += 1
+            yield self._offset, event
+
+
+class TriggerPipeline:
+    """
+    Streams events from a source into the workflows of a registry.
+
+    Each event is routed to the workflow named by its `route_key` field,
+    or by `routes[event["type"]]`, and that workflow's entrypoint is
+    called as `entrypoint(context)` on one of `workers` threads, with the
+    event's "context" field (or the whole event) as context. To drive a
+    `workflows.WorkflowEngine`, register
+    `functools.partial(engine.run_workflow, name)` as the entrypoint.
+
+    At most `max_in_flight` events are read but not finished; beyond
+    that the reader blocks, so a slow engine throttles reading instead of
+    growing a queue. With `checkpoint_path`, the offset below which every
+    event has finished is saved every `checkpoint_every` events and on
+    exit, and a restart resumes from it. Events in flight during a crash
+    are delivered again (at-least-once). Unroutable and unparseable
+    events, and runs that raise or return a FAILED status, are logged and
+    counted.
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        registry: ControlPlaneRegistry,
+        checkpoint_path: Optional[str] = None,
+        workers: int = 4,
+        max_in_flight: int = 32,
+        route_key: str = "workflow",
+        routes: Optional[Dict[str, str]] = None,
+        checkpoint_every: int = 100,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1.")
+        self.source = source
+        self.registry = registry
+        self.checkpoint_path = checkpoint_path
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        self.route_key = route_key
+        self.routes = routes or {}
+        self.checkpoint_every = checkpoint_every
+
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._checkpoint_lock = threading.Lock()
+        self._pending: List[int] = []  # heap of offsets not yet finished
+        self._finished: set = set()    # finished offsets above the watermark
+        self._committed = 0
+        self._since_checkpoint = 0
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"routed": 0, "succeeded": 0, "failed": 0, "unroutable": 0, "invalid": 0}
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    def run(self) -> Dict[str, int]:
+        """Consumes the source until it ends or `stop()` is called."""
+        self._committed = self._load_checkpoint()
+        self.source.seek(self._committed)
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ingest")
+        try:
+            for offset, event in self.source:
+                self._slots.acquire()  # backpressure: wait for a free slot
+                with self._lock:
+                    heapq.heappush(self._pending, offset)
+                name = self._route(event)
+                if name is None:
+                    self._finish(offset)
+                    continue
+                executor.submit(self._dispatch, offset, name, event)
+        finally:
+            executor.shutdown(wait=True)
+            self._save_checkpoint()
+        return dict(self.stats)
+
+    def start(self) -> None:
+        """Runs the pipeline on a background thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run, name="trigger-pipeline", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops reading, lets in-flight events finish and checkpoints."""
+        self.source.stop()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def committed_offset(self) -> int:
+        return self._committed
+
+    def _route(self, event: Optional[Dict[str, Any]]) -> Optional[str]:
+        if event is None:
+            self._count("invalid")
+            return None
+        name = event.get(self.route_key) or self.routes.get(event.get("type"))
+        if name is None or self.registry.get_workflow(name) is None:
+            log.warning("No registered workflow for event %r", name or event.get("type"))
+            self._count("unroutable")
+            return None
+        self._count("routed")
+        return name
+
+    def _dispatch(self, offset: int, name: str, event: Dict[str, Any]) -> None:
+        try:
+            context = event.get("context", event)
+            outcome = self.registry.get_workflow(name).entrypoint(context)
+        except Exception as exc:
+            log.error("Workflow '%s' failed on event at offset %d: %s", name, offset, exc)
+            self._count("failed")
+        else:
+            if _failed(outcome):
+                log.error("Workflow '%s' failed on event at offset %d", name, offset)
+                self._count("failed")
+            else:
+                self._count("succeeded")
+        finally:
+            self._finish(offset)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def _finish(self, offset: int) -> None:
+        save = False
+        with self._lock:
+            self._finished.add(offset)
+            # Advance the watermark past every finished event at its front.
+            while self._pending and self._pending[0] in self._finished:
+                done = heapq.heappop(self._pending)
+                self._finished.discard(done)
+                self._committed = done
+            self._since_checkpoint += 1
+            if self._since_checkpoint >= self.checkpoint_every:
+                self._since_checkpoint = 0
+                save = True
+        self._slots.release()
+        if save:
+            self._save_checkpoint()
+
+    def _load_checkpoint(self) -> int:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path) as f:
+            return int(json.load(f)["offset"])
+
+    def _save_checkpoint(self) -> None:
+        if not self.checkpoint_path:
+            return
+        with self._checkpoint_lock:
+            with self._lock:
+                offset = self._committed
+            # Write-then-rename so a crash never leaves a torn checkpoint.
+            tmp = f"{self.checkpoint_path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump({"offset": offset}, f)
+            os.replace(tmp, self.checkpoint_path)
+
+
+def _failed(outcome: Any) -> bool:
+    # Engines report failures in their result rather than raising: a
+    # {"status": "FAILED"} dict (workflows) or a RunLog (workflow_engine).
+    if isinstance(outcome, dict):
+        status = outcome.get("status")
+    else:
+        status = getattr(outcome, "status", None)
+    return status is not None and str(status).upper() == "FAILED"
+
+
+def _parse(line: bytes, offset: int) -> Optional[Dict[str, Any]]:
+    try:
+        event = json.loads(line)
+    except ValueError:
+        log.warning("Skipping unparseable event at offset %d", offset)
+        return None
+    if not isinstance(event, dict):
+        log.warning("Skipping non-object event at offset %d", offset)
+        return None
+    return event
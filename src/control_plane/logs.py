@@ -0,0 +1,149 @@
+"""
+Structured, non-blocking logging for the Control Plane.
+
+Modules log through the standard `logging` module under the
+`control_plane` namespace, passing values as %-style arguments and
+structured fields via `extra=`:
+
+    log.info("Workflow %s started", name, extra={"run_id": run_id})
+
+Nothing is formatted unless a record passes the level check. By default
+the package only installs a NullHandler (in `control_plane/__init__.py`);
+call `configure_logging()` to emit JSON lines. Records are handed to a
+queue in the calling thread and formatted and written by a background
+listener thread, so request threads never block on stdout or file I/O.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import IO, Any, Optional, Union
+
+ROOT_LOGGER = "control_plane"
+
+# Attributes every LogRecord has; anything else came in through `extra=`.
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None))
+) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                event[key] = value
+        if record.exc_info:
+            event["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(event, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The stock handler merges the message and args in the calling thread.
+    Records never leave the process here, so they are enqueued unformatted
+    and rendered when the listener gets to them. The caller may still be
+    changing the dicts and lists it logged (run contexts, results) by
+    then, so those args and `extra` values are copied, one level deep,
+    before the record is queued.
+    """
+
+    dropped = 0
+    _dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if isinstance(args, tuple):
+            if any(isinstance(arg, _MUTABLE) for arg in args):
+                record.args = tuple(_snapshot(arg) for arg in args)
+        elif isinstance(args, dict):  # log.info("%(run_id)s", {...})
+            record.args = {key: _snapshot(value) for key, value in args.items()}
+        fields = record.__dict__
+        for key in [k for k, v in fields.items() if k not in _RECORD_ATTRS and isinstance(v, _MUTABLE)]:
+            fields[key] = _snapshot(fields[key])
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                type(self).dropped += 1
+
+
+_MUTABLE = (dict, list, set)
+
+
+def _snapshot(value: Any) -> Any:
+    return value.copy() if isinstance(value, _MUTABLE) else value
+
+
+def configure_logging(
+    level: Union[int, str] = logging.INFO,
+    stream: Optional[IO[str]] = None,
+    path: Optional[str] = None,
+    max_queue: int = 10_000,
+) -> logging.handlers.QueueListener:
+    """
+    Routes `control_plane` logs through a background JSON-lines writer.
+
+    Args:
+        level: Minimum level emitted; lower-level calls cost one check.
+        stream: Stream to write to (default: stdout) when no `path` is given.
+        path: File to append JSON lines to.
+        max_queue: Records buffered before new ones are dropped rather
+            than blocking the caller.
+
+    Calling it again replaces the previous configuration.
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    if path is not None:
+        target: logging.Handler = logging.FileHandler(path, encoding="utf-8")
+    else:
+        target = logging.StreamHandler(stream or sys.stdout)
+    target.setFormatter(JsonFormatter())
+
+    records: "queue.Queue[logging.LogRecord]" = queue.Queue(max_queue)
+    _queue_handler = _DeferredQueueHandler(records)
+    _listener = logging.handlers.QueueListener(records, target, respect_handler_level=False)
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flushes queued records and detaches the background writer."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger(ROOT_LOGGER).removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
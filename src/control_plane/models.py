@@ -1,7 +1,39 @@
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
+from enum import Enum
 from typing import Dict, Any, List
 
+# Slotted dataclasses need Python 3.10+; on 3.9 they fall back to __dict__.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+class DecisionKind(str, Enum):
+    """Interned decision values; compare equal to their plain strings."""
+    ALLOW = "allow"
+    DENY = "deny"
+    NEEDS_REVIEW = "needs_review"
+
+    def __str__(self) -> str:
+        return self.value
+
+    # Hash like the plain string so either can be used as a dict key.
+    __hash__ = str.__hash__
+
+
+class RunStatus(str, Enum):
+    """Interned run statuses; compare equal to their plain strings."""
+    STARTED = "started"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    def __str__(self) -> str:
+        return self.value
+
+    # Hash like the plain string so either can be used as a dict key.
+    __hash__ = str.__hash__
+
+
 @dataclass
 class Policy:
     """Represents a single policy to be evaluated."""
@@ -11,25 +43,34 @@ class Policy:
     rules: List[Dict[str, Any]]
     created_at: datetime = field(default_factory=datetime.utcnow)
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class Decision:
-    """Represents the outcome of a policy evaluation."""
+    """
+    Represents the outcome of a policy evaluation.
+
+    Refers to its policy by id only; look rules up in the policy registry.
+    """
     policy_id: str
-    decision: str  # e.g., "allow", "deny", "needs_review"
+    decision: DecisionKind  # e.g., "allow", "deny", "needs_review"
     details: Dict[str, Any]
     timestamp: datetime = field(default_factory=datetime.utcnow)
 
-@dataclass
+@dataclass(**_SLOTS)
 class RunLog:
     """Represents a log entry for a workflow run."""
     run_id: str
     workflow_name: str
-    status: str  # e.g., "started", "completed", "failed"
+    status: RunStatus  # e.g., "started", "completed", "failed"
     start_time: datetime
     end_time: datetime = None
     input_data: Dict[str, Any] = field(default_factory=dict)
     decisions: List[Decision] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
+    policies_evaluated: int = 0
+    policies_skipped: int = 0  # not applicable to the input data
+    policies_short_circuited: int = 0  # not evaluated after a deny
+    step_results: Dict[str, Any] = field(default_factory=dict)  # step name -> StepResult
+    timings: Dict[str, float] = field(default_factory=dict)  # "stage:detail" -> seconds
 
 @dataclass
 class Workflow:
@@ -1,55 +1,245 @@
-from dataclasses import dataclass
-from typing import Any, Dict
-from datetime import datetime
-
-
-@dataclass
-class RunLogger:
-    """
-    Simple run logger.
-
-    V1 prints to stdout and optionally writes to a Snowflake table if
-    a Snowpark session is provided.
-    """
-
-    session: Any  # Snowpark session or None
-    run_log_table: str
-
-    def _now(self) -> str:
-        return datetime.utcnow().isoformat()
-
-    def log_start(self, run_id: str, workflow: str, context: Dict[str, Any]) -> None:
-        print(f"[{self._now()}] START {workflow} run_id={run_id} context={context}")
-        if self.session:
-            self.session.sql(
-                f"""
-                INSERT INTO {self.run_log_table} (RUN_ID, WORKFLOW, STATUS, DETAILS, CREATED_AT)
-                SELECT '{run_id}', '{workflow}', 'START', PARSE_JSON('{str(context)}'), CURRENT_TIMESTAMP();
-                """
-            ).collect()
-
-    def log_success(self, run_id: str, result: Dict[str, Any]) -> None:
-        print(f"[{self._now()}] SUCCESS run_id={run_id} result={result}")
-        if self.session:
-            self.session.sql(
-                f"""
-                UPDATE {self.run_log_table}
-                SET STATUS = 'SUCCESS',
-                    DETAILS = PARSE_JSON('{str(result)}'),
-                    UPDATED_AT = CURRENT_TIMESTAMP()
-                WHERE RUN_ID = '{run_id}';
-                """
-            ).collect()
-
-    def log_failure(self, run_id: str, exc: Exception) -> None:
-        print(f"[{self._now()}] FAILURE run_id={run_id} error={exc}")
-        if self.session:
-            self.session.sql(
-                f"""
-                UPDATE {self.run_log_table}
-                SET STATUS = 'FAILED',
-                    DETAILS = PARSE_JSON('{{"error": "{str(exc)}"}}'),
-                    UPDATED_AT = CURRENT_TIMESTAMP()
-                WHERE RUN_ID = '{run_id}';
-                """
-            ).collect()
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .models import RunLog, RunStatus
+from .sql import Statement, to_json
+from .timing import tracer
+
+if TYPE_CHECKING:
+    from .history import RecentRuns
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class RunLogger:
+    """
+    Simple run logger.
+
+    V1 logs each event (see `control_plane.logs`) and optionally writes to
+    a Snowflake table if a Snowpark session is provided. Context and
+    result dicts are only rendered if the INFO record is actually emitted.
+
+    Every write is a MERGE keyed on RUN_ID with bind parameters: values
+    never touch the statement text, details are serialized with
+    `sql.to_json`, and the text for a given number of rows is built once
+    and reused.
+
+    With `buffered=True`, events are queued in memory instead of issuing
+    one statement per event. A background thread flushes them as a single
+    multi-row MERGE into the run log table once `max_batch_size` runs are
+    pending or every `flush_interval_s` seconds, and `close()` (also
+    registered with atexit) flushes whatever is left. Events for the same
+    run are coalesced into one row. A failed flush puts its rows back in
+    the queue, so delivery is at-least-once; the MERGE keyed on RUN_ID
+    makes redelivery harmless.
+
+    With `history`, finished runs are also recorded in that
+    `history.RecentRuns` so recent runs can be queried locally.
+    """
+
+    session: Any  # Snowpark session or None
+    run_log_table: str
+    buffered: bool = False
+    max_batch_size: int = 500
+    flush_interval_s: float = 5.0
+    history: Optional["RecentRuns"] = None
+
+    def __post_init__(self) -> None:
+        # run_id -> (workflow, start time) for runs not yet in `history`
+        self._started: Dict[str, Tuple[str, datetime]] = {}
+        # run_id -> pending row, in first-seen order
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._statements: Dict[int, Statement] = {}  # rows per MERGE -> statement
+        if self.buffered and self.session:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="run-logger-flush", daemon=True
+            )
+            self._flusher.start()
+            atexit.register(self.close)
+
+    def log_start(self, run_id: str, workflow: str, context: Dict[str, Any]) -> None:
+        log.info(
+            "START %s run_id=%s context=%s", workflow, run_id, context,
+            extra={"event": "run_start", "workflow": workflow, "run_id": run_id},
+        )
+        if self.history is not None:
+            self._started[run_id] = (workflow, datetime.utcnow())
+        self._write_event(run_id, workflow, "START", context)
+
+    def log_success(self, run_id: str, result: Dict[str, Any]) -> None:
+        log.info(
+            "SUCCESS run_id=%s result=%s", run_id, result,
+            extra={"event": "run_success", "run_id": run_id},
+        )
+        if self.history is not None:
+            self._record(run_id, RunStatus.COMPLETED, [])
+        self._write_event(run_id, None, "SUCCESS", result)
+
+    def log_failure(self, run_id: str, exc: Exception) -> None:
+        log.info(
+            "FAILURE run_id=%s error=%s", run_id, exc,
+            extra={"event": "run_failure", "run_id": run_id},
+        )
+        if self.history is not None:
+            self._record(run_id, RunStatus.FAILED, [str(exc)])
+        self._write_event(run_id, None, "FAILED", {"error": str(exc)})
+
+    def _write_event(
+        self,
+        run_id: str,
+        workflow: Optional[str],
+        status: str,
+        details: Dict[str, Any],
+    ) -> None:
+        if self._flusher is not None:
+            self._enqueue(run_id, workflow, status, details)
+        elif self.session:
+            self._merge([_row(run_id, workflow, status, details)])
+
+    def _record(self, run_id: str, status: RunStatus, errors: List[str]) -> None:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        workflow, start_time = started
+        self.history.record(RunLog(
+            run_id=run_id,
+            workflow_name=workflow,
+            status=status,
+            start_time=start_time,
+            end_time=datetime.utcnow(),
+            errors=errors,
+        ))
+
+    # ------------------------------------------------------------------
+    # Buffered mode
+    # ------------------------------------------------------------------
+
+    def _enqueue(
+        self,
+        run_id: str,
+        workflow: Optional[str],
+        status: str,
+        details: Dict[str, Any],
+    ) -> None:
+        row = _row(run_id, workflow, status, details)
+        with self._lock:
+            previous = self._pending.get(run_id)
+            self._pending[run_id] = _coalesce(previous, row) if previous else row
+            full = len(self._pending) >= self.max_batch_size
+        if full:
+            self._wake.set()
+
+    def pending(self) -> int:
+        """Number of runs waiting to be flushed."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """
+        Writes all pending rows, in batches of at most `max_batch_size`.
+
+        Returns the number of rows written. If a batch fails, it and every
+        batch not yet written go back to the front of the queue and the
+        error is raised.
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows = list(self._pending.values())
+                self._pending = OrderedDict()
+            if not rows:
+                return 0
+            with tracer.span("log_flush"):
+                return self._write_rows(rows)
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> int:
+        written = 0
+        for start in range(0, len(rows), self.max_batch_size):
+            batch = rows[start:start + self.max_batch_size]
+            try:
+                self._merge(batch)
+            except Exception:
+                self._requeue(rows[start:])
+                raise
+            written += len(batch)
+        return written
+
+    def close(self) -> None:
+        """Stops the background flusher and flushes remaining rows."""
+        if self._flusher is None or self._closed.is_set():
+            return
+        self._closed.set()
+        self._wake.set()
+        self._flusher.join()
+        self.flush()
+
+    def _flush_loop(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            if self._closed.is_set():
+                break
+            try:
+                self.flush()
+            except Exception as exc:
+                log.warning("RUN_LOG flush failed, will retry: %s", exc)
+
+    def _requeue(self, rows: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            merged: "OrderedDict[str, Dict[str, Any]]" = OrderedDict(
+                (row["RUN_ID"], row) for row in rows
+            )
+            # Events that arrived during the failed flush are newer.
+            for run_id, row in self._pending.items():
+                previous = merged.get(run_id)
+                merged[run_id] = _coalesce(previous, row) if previous else row
+            self._pending = merged
+
+    def _merge(self, rows: List[Dict[str, Any]]) -> None:
+        params: List[Any] = []
+        for row in rows:
+            params += (row["RUN_ID"], row["WORKFLOW"], row["STATUS"], row["DETAILS"])
+        self._merge_statement(len(rows)).run(self.session, params)
+
+    def _merge_statement(self, n_rows: int) -> Statement:
+        statement = self._statements.get(n_rows)
+        if statement is None:
+            values = ", ".join(["(?, ?, ?, ?)"] * n_rows)
+            statement = self._statements[n_rows] = Statement(
+                f"MERGE INTO {self.run_log_table} AS t "
+                "USING (SELECT column1 AS RUN_ID, column2 AS WORKFLOW, column3 AS STATUS, "
+                f"PARSE_JSON(column4) AS DETAILS FROM VALUES {values}) AS s "
+                "ON t.RUN_ID = s.RUN_ID "
+                "WHEN MATCHED THEN UPDATE SET "
+                "WORKFLOW = COALESCE(s.WORKFLOW, t.WORKFLOW), "
+                "STATUS = s.STATUS, DETAILS = s.DETAILS, UPDATED_AT = CURRENT_TIMESTAMP() "
+                "WHEN NOT MATCHED THEN INSERT (RUN_ID, WORKFLOW, STATUS, DETAILS, CREATED_AT, UPDATED_AT) "
+                "VALUES (s.RUN_ID, s.WORKFLOW, s.STATUS, s.DETAILS, CURRENT_TIMESTAMP(), "
+                "IFF(s.STATUS = 'START', NULL, CURRENT_TIMESTAMP()))"
+            )
+        return statement
+
+
+def _row(run_id: str, workflow: Optional[str], status: str, details: Dict[str, Any]) -> Dict[str, Any]:
+    # Details are serialized now, so later changes to the caller's dict
+    # can't leak into a buffered row.
+    return {"RUN_ID": run_id, "WORKFLOW": workflow, "STATUS": status, "DETAILS": to_json(details)}
+
+
+def _coalesce(previous: Dict[str, Any], row: Dict[str, Any]) -> Dict[str, Any]:
+    """Folds a newer event for a run into its pending row."""
+    merged = dict(row)
+    if merged["WORKFLOW"] is None:
+        merged["WORKFLOW"] = previous["WORKFLOW"]
+    return merged
+
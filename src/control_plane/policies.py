@@ -1,91 +1,399 @@
-from dataclasses import dataclass
-from typing import Dict, Any, Optional, List
-
-
-@dataclass
-class Policy:
-    """
-    Simple representation of a policy in the Control Plane.
-
-    This can represent:
-    - drift thresholds
-    - governance constraints (e.g., no PII to external tools)
-    - risk levels and escalation rules
-    """
-    name: str
-    description: str
-    conditions: Dict[str, Any]  # e.g., {"max_drift": 0.15}
-    actions: List[str]          # e.g., ["trigger_retrain", "notify_security"]
-
-
-class PolicyEngine:
-    """
-    Central policy interpretation layer.
-
-    V1 keeps evaluation logic simple and transparent.
-    """
-
-    def __init__(self, policies: Dict[str, Policy]):
-        self._policies = policies
-
-    def get_policy(self, name: str) -> Optional[Policy]:
-        return self._policies.get(name)
-
-    def evaluate(
-        self,
-        policy_name: str,
-        context: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """
-        Evaluate a policy given a context.
-
-        Returns:
-            {
-                "policy": <Policy or None>,
-                "should_act": bool,
-                "actions": [...],
-                "reason": str
-            }
-        """
-        policy = self._policies.get(policy_name)
-        if not policy:
-            return {
-                "policy": None,
-                "should_act": False,
-                "actions": [],
-                "reason": f"No policy named {policy_name}."
-            }
-
-        # Example: drift policy
-        max_drift = policy.conditions.get("max_drift")
-        observed_drift = context.get("observed_drift")
-
-        if max_drift is not None and observed_drift is not None:
-            if observed_drift > max_drift:
-                return {
-                    "policy": policy,
-                    "should_act": True,
-                    "actions": policy.actions,
-                    "reason": (
-                        f"Observed drift {observed_drift} exceeds "
-                        f"threshold {max_drift}."
-                    ),
-                }
-            else:
-                return {
-                    "policy": policy,
-                    "should_act": False,
-                    "actions": [],
-                    "reason": (
-                        f"Observed drift {observed_drift} is within "
-                        f"threshold {max_drift}."
-                    ),
-                }
-
-        # Default: no decision
-        return {
-            "policy": policy,
-            "should_act": False,
-            "actions": [],
-            "reason": "No applicable evaluation rule for this policy/context.",
-        }
+import warnings
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Optional, List, Mapping, Sequence, Tuple, Union
+
+from .timing import tracer
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .history import RecentRuns
+    from .policy_session import EvaluationSession
+
+
+@dataclass
+class Policy:
+    """
+    Simple representation of a policy in the Control Plane.
+
+    This can represent:
+    - drift thresholds
+    - governance constraints (e.g., no PII to external tools)
+    - risk levels and escalation rules
+    """
+    name: str
+    description: str
+    conditions: Dict[str, Any]  # e.g., {"max_drift": 0.15}
+    actions: List[str]          # e.g., ["trigger_retrain", "notify_security"]
+
+
+class EvaluationResult(Mapping):
+    """
+    Result of `PolicyEngine.evaluate`, readable as a mapping.
+
+    Holds the policy by name and shares `policy.actions` rather than
+    copying them; `reason` is formatted on first access, so results that
+    are only kept for their decision never build the string.
+
+    `result["policy"]`, the Policy object results used to embed (None for
+    an unknown policy), still works but is deprecated and is not among
+    the keys; use `policy_name` with `PolicyEngine.get_policy`.
+    """
+
+    __slots__ = ("policy_name", "should_act", "actions", "_template", "_args", "_reason", "_policy")
+
+    _KEYS = ("policy_name", "should_act", "actions", "reason")
+
+    def __init__(
+        self,
+        policy_name: str,
+        should_act: bool,
+        actions: Sequence[str],
+        template: str,
+        args: Tuple[Any, ...],
+        policy: Optional[Policy] = None,
+    ):
+        self.policy_name = policy_name
+        self.should_act = should_act
+        self.actions = actions
+        self._template = template
+        self._args = args
+        self._reason: Optional[str] = None
+        self._policy = policy
+
+    @property
+    def reason(self) -> str:
+        if self._reason is None:
+            self._reason = self._template.format(*self._args) if self._args else self._template
+            self._args = ()
+        return self._reason
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            if key == "policy":
+                warnings.warn(
+                    'EvaluationResult["policy"] is deprecated; use "policy_name".',
+                    DeprecationWarning,
+                    stacklevel=2,
+                )
+                return self._policy
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._KEYS
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self._KEYS}
+
+    def __repr__(self) -> str:
+        return f"EvaluationResult({self.to_dict()!r})"
+
+
+class PolicyEngine:
+    """
+    Central policy interpretation layer.
+
+    V1 keeps evaluation logic simple and transparent.
+
+    Given a `history.RecentRuns`, policies with a `max_runs` condition act
+    once the context's "workflow" has recorded that many runs in the last
+    `window_s` seconds (default 3600), answered from memory.
+    """
+
+    def __init__(self, policies: Dict[str, Policy], history: Optional["RecentRuns"] = None):
+        self._policies = policies
+        self.history = history
+
+    def get_policy(self, name: str) -> Optional[Policy]:
+        return self._policies.get(name)
+
+    def policy_names(self) -> List[str]:
+        return list(self._policies)
+
+    def session(
+        self,
+        context: Optional[Dict[str, Any]] = None,
+        policy_names: Optional[Iterable[str]] = None,
+    ) -> "EvaluationSession":
+        """Starts a `policy_session.EvaluationSession` over this engine."""
+        from .policy_session import EvaluationSession
+
+        return EvaluationSession(self, context, policy_names)
+
+    def evaluate(
+        self,
+        policy_name: str,
+        context: Dict[str, Any]
+    ) -> "EvaluationResult":
+        """
+        Evaluate a policy given a context.
+
+        Returns an `EvaluationResult`, a read-only mapping:
+            {
+                "policy_name": str,
+                "should_act": bool,
+                "actions": [...],
+                "reason": str
+            }
+        """
+        if not tracer.enabled:
+            return self.evaluate_untraced(policy_name, context)
+        with tracer.span("policy", policy_name):
+            return self.evaluate_untraced(policy_name, context)
+
+    def evaluate_untraced(
+        self,
+        policy_name: str,
+        context: Dict[str, Any]
+    ) -> "EvaluationResult":
+        """`evaluate` without a timing span per call, for callers that time a whole pass."""
+        policy = self._policies.get(policy_name)
+        if not policy:
+            return EvaluationResult(policy_name, False, (), _NO_POLICY, (policy_name,))
+
+        # Example: drift policy
+        max_drift = policy.conditions.get("max_drift")
+        observed_drift = context.get("observed_drift")
+
+        if max_drift is not None and observed_drift is not None:
+            if observed_drift > max_drift:
+                return EvaluationResult(
+                    policy_name, True, policy.actions,
+                    _THRESHOLD_REASON, ("Observed drift", observed_drift, "exceeds", max_drift),
+                    policy,
+                )
+            else:
+                return EvaluationResult(
+                    policy_name, False, (),
+                    _THRESHOLD_REASON, ("Observed drift", observed_drift, "is within", max_drift),
+                    policy,
+                )
+
+        # Example: rate limit over recent runs
+        max_runs = policy.conditions.get("max_runs")
+        workflow = context.get("workflow")
+
+        if max_runs is not None and workflow is not None and self.history is not None:
+            window_s = policy.conditions.get("window_s", 3600)
+            recent = self.history.count(
+                workflow=workflow,
+                since=datetime.utcnow() - timedelta(seconds=window_s),
+            )
+            return EvaluationResult(
+                policy_name, recent >= max_runs, policy.actions if recent >= max_runs else (),
+                _RATE_REASON, (workflow, recent, window_s, max_runs),
+                policy,
+            )
+
+        # Default: no decision
+        return EvaluationResult(policy_name, False, (), _NOT_APPLICABLE, (), policy)
+
+    def condition_keys(self, policy_name: str) -> Dict[str, str]:
+        """
+        The context keys a policy's decision reads.
+
+        Maps each condition the policy sets to the context key it reads,
+        e.g. {"max_drift": "observed_drift"}. Empty for an unknown policy.
+        """
+        policy = self._policies.get(policy_name)
+        if policy is None:
+            return {}
+        return {
+            condition: context_key
+            for condition, context_key in _CONDITION_KEYS.items()
+            if policy.conditions.get(condition) is not None
+        }
+
+    def threshold(self, policy_name: str) -> Optional[Tuple[str, Any]]:
+        """
+        (context key, limit) if a threshold is the policy's only condition.
+
+        Such a policy acts exactly when the context value exceeds the
+        limit. Returns None for any other policy.
+        """
+        conditions = self.condition_keys(policy_name)
+        if len(conditions) != 1:
+            return None
+        (condition, context_key), = conditions.items()
+        if condition not in _THRESHOLD_CONDITIONS:
+            return None
+        return context_key, self._policies[policy_name].conditions[condition]
+
+    def evaluate_batch(
+        self,
+        policy_name: str,
+        contexts: Union[Mapping[str, Any], Sequence[Dict[str, Any]]],
+        reasons: str = "acting",
+    ) -> Dict[str, Any]:
+        """
+        Evaluate a policy over many contexts at once.
+
+        `contexts` is either columnar (a mapping of context key to a NumPy
+        array or sequence, one entry per row) or a list of context dicts,
+        which is transposed once into columns. Threshold conditions are
+        compared as whole-array operations; rows they don't decide are
+        passed to `evaluate` one by one when the policy has other
+        conditions (e.g. `max_runs`), so every row gets what `evaluate`
+        would return for it. As there, a missing or None value makes a
+        threshold not applicable, while NaN is compared (and is within it).
+
+        `reasons` controls which rows get a reason string:
+        "acting" (default) only rows where should_act is True,
+        "all" every row, "none" no rows. Rows without one hold None.
+
+        Returns:
+            {
+                "policy_name": str,
+                "should_act": np.ndarray[bool],
+                "actions": np.ndarray[object],  # policy.actions or ()
+                "reason": np.ndarray[object],
+            }
+        """
+        import numpy as np  # deferred: only batch evaluation needs it
+
+        if reasons not in ("acting", "all", "none"):
+            raise ValueError(f"Unknown reasons mode: {reasons}")
+
+        policy = self._policies.get(policy_name)
+        thresholds = [] if policy is None else [
+            (condition, context_key, policy.conditions[condition])
+            for condition, context_key in _THRESHOLD_CONDITIONS.items()
+            if policy.conditions.get(condition) is not None
+        ]
+        columns, present, n = _to_columns(contexts, [key for _, key, _ in thresholds])
+
+        should_act = np.zeros(n, dtype=bool)
+        # Index of the threshold that decides each row, -1 if none does.
+        # As in `evaluate`, the first threshold with a value decides.
+        decided_by = np.full(n, -1, dtype=np.int64)
+        for index, (_, context_key, limit) in enumerate(thresholds):
+            rows = present[context_key] & (decided_by < 0)
+            decided_by[rows] = index
+            should_act[rows] = columns[context_key][rows] > limit
+
+        # Rows no threshold decides: conditions without a vectorized form.
+        scalar: Dict[int, EvaluationResult] = {}
+        if policy is not None and any(c not in _THRESHOLD_CONDITIONS for c in policy.conditions):
+            for row in np.flatnonzero(decided_by < 0):
+                result = self.evaluate_untraced(policy_name, _row_context(contexts, row))
+                scalar[row] = result
+                should_act[row] = result.should_act
+
+        # Rows share references to one of two values, as `evaluate` does.
+        choices = np.empty(2, dtype=object)
+        choices[0] = ()
+        choices[1] = policy.actions if policy is not None else ()
+        actions = choices[should_act.astype(np.intp)]
+
+        reason = np.full(n, None, dtype=object)
+        if reasons == "all":
+            rows = np.arange(n)
+        elif reasons == "acting":
+            rows = np.flatnonzero(should_act)
+        else:
+            rows = np.arange(0)
+
+        columnar = isinstance(contexts, Mapping)
+        for row in rows:
+            if policy is None:
+                reason[row] = _NO_POLICY.format(policy_name)
+            elif scalar and row in scalar:
+                reason[row] = scalar[row].reason
+            elif decided_by[row] < 0:
+                reason[row] = _NOT_APPLICABLE
+            else:
+                _, context_key, limit = thresholds[decided_by[row]]
+                # Formatted as passed in, as `evaluate` would.
+                observed = contexts[context_key][row] if columnar else contexts[row][context_key]
+                verb = "exceeds" if should_act[row] else "is within"
+                reason[row] = _THRESHOLD_REASON.format(
+                    _THRESHOLD_LABELS[context_key], observed, verb, limit
+                )
+
+        return {
+            "policy_name": policy_name,
+            "should_act": should_act,
+            "actions": actions,
+            "reason": reason,
+        }
+
+
+_NO_POLICY = "No policy named {}."
+_NOT_APPLICABLE = "No applicable evaluation rule for this policy/context."
+_THRESHOLD_REASON = "{} {} {} threshold {}."
+_RATE_REASON = "Workflow {} ran {} times in the last {}s (limit {})."
+
+# Threshold conditions that `evaluate_batch` compares column-wise:
+# policy condition key -> context key whose value must not exceed it.
+_THRESHOLD_CONDITIONS: Dict[str, str] = {
+    "max_drift": "observed_drift",
+}
+
+# Context key each condition reads in `evaluate`.
+_CONDITION_KEYS: Dict[str, str] = {
+    "max_drift": "observed_drift",
+    "max_runs": "workflow",
+}
+
+_THRESHOLD_LABELS: Dict[str, str] = {
+    "observed_drift": "Observed drift",
+}
+
+
+def _to_columns(
+    contexts: Union[Mapping[str, Any], Sequence[Dict[str, Any]]],
+    keys: List[str],
+) -> Tuple[Dict[str, "np.ndarray"], Dict[str, "np.ndarray"], int]:
+    """
+    Build float columns for `keys`, plus a mask of the rows that have a
+    value (not missing or None) for each.
+    """
+    import numpy as np
+
+    columns, present = {}, {}
+    if isinstance(contexts, Mapping):
+        lengths = {len(np.asarray(v)) for v in contexts.values()}
+        if len(lengths) > 1:
+            raise ValueError("All context columns must have the same length.")
+        n = lengths.pop() if lengths else 0
+        for key in keys:
+            if key not in contexts:
+                columns[key], present[key] = np.full(n, np.nan), np.zeros(n, dtype=bool)
+                continue
+            column = np.asarray(contexts[key])
+            if column.dtype == object:
+                present[key] = np.fromiter((v is not None for v in column), dtype=bool, count=n)
+                columns[key] = np.fromiter(
+                    (np.nan if v is None else v for v in column), dtype=float, count=n
+                )
+            else:
+                present[key] = np.ones(n, dtype=bool)
+                columns[key] = column.astype(float)
+        return columns, present, n
+
+    n = len(contexts)
+    for key in keys:
+        values = [context.get(key) for context in contexts]
+        present[key] = np.fromiter((v is not None for v in values), dtype=bool, count=n)
+        columns[key] = np.fromiter(
+            (np.nan if v is None else v for v in values), dtype=float, count=n
+        )
+    return columns, present, n
+
+
+def _row_context(
+    contexts: Union[Mapping[str, Any], Sequence[Dict[str, Any]]],
+    row: int,
+) -> Dict[str, Any]:
+    """One row as a context dict, values as passed in."""
+    if not isinstance(contexts, Mapping):
+        return contexts[row]
+    return {key: column[row] for key, column in contexts.items()}
@@ -1,17 +1,55 @@
-from typing import Dict, Any
-from .models import Policy, Decision
+import logging
+from typing import Dict, Any, Optional
+from .models import Policy, Decision, DecisionKind
+from .rules import CompiledPolicy, compile_rules
+from .timing import tracer
+
+log = logging.getLogger(__name__)
 
 class PolicyEngine:
     """
     Evaluates policies against provided data to make decisions.
+
+    Each policy's rules are compiled once (see `control_plane.rules`) and
+    cached by `policy_id`, so repeated evaluations never re-parse them.
+    Rules are treated as immutable once compiled: to change a policy,
+    assign it a new `rules` list (or call `invalidate`). Edits made in
+    place to the list or its rule dicts are not seen.
     """
 
+    def __init__(self):
+        self._compiled: Dict[str, CompiledPolicy] = {}
+
+    def compile(self, policy: Policy) -> CompiledPolicy:
+        """
+        Returns the compiled form of a policy, compiling it on first use.
+
+        The cache entry is rebuilt if the policy's `rules` list has been
+        replaced since it was compiled. It is checked by identity, which
+        costs nothing per evaluation; in-place edits go unnoticed.
+
+        Raises:
+            ValueError: If the policy's rules are malformed.
+        """
+        compiled = self._compiled.get(policy.policy_id)
+        if compiled is None or compiled.rules is not policy.rules:
+            compiled = compile_rules(policy.policy_id, policy.rules)
+            self._compiled[policy.policy_id] = compiled
+        return compiled
+
+    def invalidate(self, policy_id: Optional[str] = None) -> None:
+        """Drops one cached policy, or all of them if no id is given."""
+        if policy_id is None:
+            self._compiled.clear()
+        else:
+            self._compiled.pop(policy_id, None)
+
     def evaluate(self, policy: Policy, data: Dict[str, Any]) -> Decision:
         """
         Evaluates a single policy based on the input data.
 
-        This is a stub implementation. A real policy engine would parse
-        the policy's rules and evaluate them against the data.
+        The policy allows when every rule in `policy.rules` holds for
+        `data`, and denies otherwise. A policy with no rules allows.
 
         Args:
             policy: The Policy object to evaluate.
@@ -20,21 +58,30 @@ class PolicyEngine:
         Returns:
             A Decision object representing the outcome.
         """
-        print(f"INFO: Evaluating policy: {policy.name} ({policy.policy_id})")
-
-        # Stub logic: For demonstration, we'll just assume the policy
-        # passes if the input data contains a 'user_role' of 'admin'.
-        is_allowed = data.get("user_role") == "admin"
-        decision_str = "allow" if is_allowed else "deny"
-
-        decision = Decision(
-            policy_id=policy.policy_id,
-            decision=decision_str,
-            details={
-                "message": f"Decision '{decision_str}' based on stub logic.",
-                "evaluated_rules": policy.rules
-            }
-        )
+        log.debug("Evaluating policy: %s (%s)", policy.name, policy.policy_id)
+
+        if tracer.enabled:
+            with tracer.span("policy", policy.policy_id):
+                failed = self.compile(policy).first_failure(data)
+        else:
+            failed = self.compile(policy).first_failure(data)
+        # Details refer to rules by index; the rules themselves stay on the
+        # policy in the registry rather than being copied into every decision.
+        if failed is None:
+            decision = Decision(
+                policy_id=policy.policy_id,
+                decision=DecisionKind.ALLOW,
+                details={"message": "All rules satisfied."},
+            )
+        else:
+            decision = Decision(
+                policy_id=policy.policy_id,
+                decision=DecisionKind.DENY,
+                details={"message": "Rule not satisfied.", "failed_rule": failed},
+            )
 
-        print(f"INFO: Policy decision: {decision.decision}")
+        log.debug(
+            "Policy decision: %s", decision.decision,
+            extra={"policy_id": policy.policy_id, "decision": decision.decision},
+        )
         return decision
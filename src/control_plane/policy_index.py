@@ -0,0 +1,90 @@
+from typing import Dict, Any, List, Mapping, Set, Tuple, FrozenSet
+
+from .models import Policy, Workflow
+from .policy_engine import PolicyEngine
+
+class PolicyIndex:
+    """
+    Inverted index from context keys to the policies whose rules read them.
+
+    A policy is a candidate for a context when at least one of the fields
+    its rules reference is present in the data. A policy none of whose
+    fields are present evaluates exactly as it would against empty data,
+    so it is only skipped when it allows empty data: a plain comparison
+    on a missing field denies (the policy stays a candidate), while e.g.
+    `{"not": {"field": "x", "op": "exists"}}` allows and can be skipped.
+    Policies without any field references (e.g. no rules) are always
+    candidates.
+    """
+
+    def __init__(self, policy_engine: PolicyEngine, policy_registry: Mapping[str, Policy]):
+        """
+        Builds the index by compiling every policy in the registry.
+
+        Args:
+            policy_engine: The engine whose compiled-policy cache is used.
+            policy_registry: A dictionary mapping policy_ids to Policy objects.
+        """
+        self.policy_registry = policy_registry
+        self._by_field: Dict[str, Set[str]] = {}
+        self._unconditional: Set[str] = set()
+        # workflow_id -> (policies list it was built from, position map)
+        self._plans: Dict[str, Tuple[List[str], Dict[str, int]]] = {}
+
+        for policy_id, policy in policy_registry.items():
+            compiled = policy_engine.compile(policy)
+            fields = compiled.fields
+            if not fields or not compiled({}):
+                self._unconditional.add(policy_id)
+            for field in fields:
+                self._by_field.setdefault(field, set()).add(policy_id)
+
+    def candidates(self, data: Dict[str, Any]) -> FrozenSet[str]:
+        """Returns the ids of all registry policies that apply to `data`."""
+        matched: Set[str] = set(self._unconditional)
+        if len(data) <= len(self._by_field):
+            for key in data:
+                ids = self._by_field.get(key)
+                if ids:
+                    matched |= ids
+        else:
+            for field, ids in self._by_field.items():
+                if field in data:
+                    matched |= ids
+        return frozenset(matched)
+
+    def plan(self, workflow: Workflow, data: Dict[str, Any]) -> List[str]:
+        """
+        Returns the workflow's applicable policy ids, in workflow order.
+
+        Raises:
+            ValueError: If the workflow references a policy not in the registry.
+        """
+        positions = self._positions(workflow)
+        matched = self.candidates(data)
+        if len(matched) < len(positions):
+            ids = [policy_id for policy_id in matched if policy_id in positions]
+            ids.sort(key=positions.__getitem__)
+            return ids
+        return [policy_id for policy_id in positions if policy_id in matched]
+
+    def plan_with_skipped(self, workflow: Workflow, data: Dict[str, Any]) -> Tuple[List[str], int]:
+        """
+        Like `plan`, also returning how many of the workflow's distinct
+        policies were skipped as not applicable to `data`.
+        """
+        planned = self.plan(workflow, data)
+        return planned, len(self._positions(workflow)) - len(planned)
+
+    def _positions(self, workflow: Workflow) -> Dict[str, int]:
+        cached = self._plans.get(workflow.workflow_id)
+        if cached is not None and cached[0] is workflow.policies:
+            return cached[1]
+
+        positions: Dict[str, int] = {}
+        for policy_id in workflow.policies:
+            if policy_id not in self.policy_registry:
+                raise ValueError(f"Policy '{policy_id}' not found in registry.")
+            positions.setdefault(policy_id, len(positions))
+        self._plans[workflow.workflow_id] = (workflow.policies, positions)
+        return positions
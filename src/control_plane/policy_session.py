@@ -0,0 +1,187 @@
+import bisect
+import sys
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .policies import EvaluationResult, PolicyEngine
+from .timing import tracer
+
+# Slotted dataclasses need Python 3.10+, as in `models`.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
+class DecisionChange:
+    """A policy whose should_act flipped; `result` is its new evaluation."""
+    policy_name: str
+    should_act: bool
+    result: EvaluationResult
+
+
+class EvaluationSession:
+    """
+    Keeps the decisions of `policies.PolicyEngine` current for a context
+    that changes a few keys at a time, e.g. a monitoring loop.
+
+    The session holds the context and each policy's should_act. An
+    `update({"observed_drift": 0.21})` re-evaluates only the policies
+    whose conditions read a changed key and returns a `DecisionChange`
+    for each one whose should_act flipped (listeners added with
+    `subscribe` get them too). Policies whose only condition is a
+    threshold (`max_drift`) are kept sorted by limit, so when a value
+    moves from a to b only the policies with a limit between a and b are
+    touched: the cost follows how far the value moved, not how many
+    policies there are.
+
+    `max_runs` conditions also depend on recorded history and the clock,
+    which the session can't see; call `refresh()` to re-check them.
+    Policies are read when the session starts; after they change, call
+    `reset()`. A session is not thread-safe.
+    """
+
+    def __init__(
+        self,
+        engine: PolicyEngine,
+        context: Optional[Dict[str, Any]] = None,
+        policy_names: Optional[Iterable[str]] = None,
+    ):
+        self.engine = engine
+        self.policy_names = list(policy_names) if policy_names is not None else None
+        self.evaluations = 0  # policies evaluated so far, initial pass included
+        self._context: Dict[str, Any] = {}
+        self._acting: Dict[str, bool] = {}
+        self._listeners: List[Callable[[DecisionChange], None]] = []
+        self.reset(context)
+
+    @property
+    def context(self) -> Mapping[str, Any]:
+        return MappingProxyType(self._context)
+
+    def subscribe(self, listener: Callable[[DecisionChange], None]) -> None:
+        """Calls `listener(change)` for every decision that flips."""
+        self._listeners.append(listener)
+
+    def should_act(self, policy_name: str) -> bool:
+        return self._acting.get(policy_name, False)
+
+    def acting(self) -> List[str]:
+        """Names of the policies that currently act."""
+        return [name for name, acting in self._acting.items() if acting]
+
+    def result(self, policy_name: str) -> EvaluationResult:
+        """A full evaluation of one policy against the current context."""
+        return self.engine.evaluate(policy_name, self._context)
+
+    # ------------------------------------------------------------------
+    # Changes
+    # ------------------------------------------------------------------
+
+    def update(self, changes: Mapping[str, Any]) -> List[DecisionChange]:
+        """
+        Applies changed context values and re-evaluates what they affect.
+
+        A value of None counts as missing, as in `PolicyEngine.evaluate`.
+        Keys set to their current value change nothing.
+        """
+        with tracer.span("policy_session", "update"):
+            affected: Dict[str, None] = {}  # ordered set of policy names
+            for key, value in changes.items():
+                old = self._context.get(key)
+                if key in self._context and _same(old, value):
+                    continue
+                self._context[key] = value
+                affected.update(dict.fromkeys(self._dependents.get(key, ())))
+                thresholds = self._thresholds.get(key)
+                if thresholds is not None:
+                    limits, names = thresholds
+                    if _is_number(old) and _is_number(value):
+                        # `observed > limit` flips exactly for a limit in [low, high).
+                        low, high = (old, value) if old < value else (value, old)
+                        names = names[bisect.bisect_left(limits, low):bisect.bisect_left(limits, high)]
+                    affected.update(dict.fromkeys(names))
+            return self._reevaluate(affected)
+
+    def refresh(self) -> List[DecisionChange]:
+        """Re-evaluates the policies that depend on history (`max_runs`)."""
+        with tracer.span("policy_session", "refresh"):
+            return self._reevaluate(self._history_dependent)
+
+    def reset(self, context: Optional[Dict[str, Any]] = None) -> List[DecisionChange]:
+        """
+        Re-reads the policies and evaluates all of them from scratch.
+
+        Replaces the context if one is given. Returns the decisions that
+        differ from before; a policy new to the session never counts as
+        a change.
+        """
+        if context is not None:
+            self._context = dict(context)
+        names = self.policy_names if self.policy_names is not None else self.engine.policy_names()
+        self._index(names)
+        previous, self._acting = self._acting, {}
+        changes = []
+        for name in names:
+            result = self.engine.evaluate_untraced(name, self._context)
+            self._acting[name] = result.should_act
+            if name in previous and previous[name] != result.should_act:
+                changes.append(DecisionChange(name, result.should_act, result))
+        self.evaluations += len(names)
+        self._notify(changes)
+        return changes
+
+    def _index(self, names: List[str]) -> None:
+        # key -> policies re-evaluated whenever it changes
+        self._dependents: Dict[str, List[str]] = {}
+        # key -> (sorted limits, policy names in the same order)
+        self._thresholds: Dict[str, Tuple[List[float], List[str]]] = {}
+        self._history_dependent: List[str] = []
+        sortable: Dict[str, List[Tuple[float, str]]] = {}
+
+        for name in names:
+            threshold = self.engine.threshold(name)
+            if threshold is not None and _is_number(threshold[1]):
+                key, limit = threshold
+                sortable.setdefault(key, []).append((limit, name))
+                continue
+            conditions = self.engine.condition_keys(name)
+            for key in conditions.values():
+                self._dependents.setdefault(key, []).append(name)
+            if "max_runs" in conditions:
+                self._history_dependent.append(name)
+
+        for key, entries in sortable.items():
+            entries.sort()
+            self._thresholds[key] = ([limit for limit, _ in entries], [name for _, name in entries])
+
+    def _reevaluate(self, names: Iterable[str]) -> List[DecisionChange]:
+        changes = []
+        count = 0
+        for name in names:
+            count += 1
+            result = self.engine.evaluate_untraced(name, self._context)
+            if result.should_act != self._acting.get(name, False):
+                self._acting[name] = result.should_act
+                changes.append(DecisionChange(name, result.should_act, result))
+        self.evaluations += count
+        self._notify(changes)
+        return changes
+
+    def _notify(self, changes: List[DecisionChange]) -> None:
+        for change in changes:
+            for listener in self._listeners:
+                listener(change)
+
+
+def _is_number(value: Any) -> bool:
+    # NaN never compares greater, so it can't be placed among the limits.
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value == value
+
+
+def _same(old: Any, new: Any) -> bool:
+    if old is new:
+        return True
+    try:
+        return type(old) is type(new) and bool(old == new)
+    except Exception:
+        return False
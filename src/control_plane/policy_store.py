@@ -0,0 +1,235 @@
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+
+from . import models
+from .policies import Policy
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PolicySnapshot:
+    """
+    An immutable, versioned view of the POLICIES table.
+
+    `policies` maps POLICY_NAME to a `policies.Policy`; `rule_policies`
+    maps the same names to a `models.Policy` built from the RULES column,
+    for `workflow_engine.WorkflowEngine`. Unchanged policies keep the same
+    objects across snapshots, so compiled-rule caches stay warm.
+    """
+    version: int
+    policies: Mapping[str, Policy]
+    rule_policies: Mapping[str, models.Policy]
+    watermark: Optional[datetime]
+
+
+class LivePolicies(Mapping):
+    """
+    Read-only mapping that always reflects the store's current snapshot.
+
+    Pass it wherever a policy dict is expected (e.g. `PolicyEngine`). Each
+    lookup reads one snapshot reference, so it never takes a lock and
+    never observes a half-applied refresh.
+    """
+
+    def __init__(self, store: "PolicyStore", attr: str):
+        self._store = store
+        self._attr = attr
+
+    def _current(self) -> Mapping[str, Any]:
+        return getattr(self._store.snapshot, self._attr)
+
+    def __getitem__(self, name: str) -> Any:
+        return self._current()[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self._current().get(name, default)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._current())
+
+    def __len__(self) -> int:
+        return len(self._current())
+
+
+class PolicyStore:
+    """
+    Policy registry backed by CONTROL_PLANE_CONFIG.POLICIES.
+
+    `load()` reads the whole table once. `refresh()` then reads only rows
+    whose UPDATED_AT is at or after the last one seen, applies them to a
+    copy of the current policies (rows with IS_DELETED remove a policy)
+    and publishes the result as a new snapshot with a single reference
+    swap. `start()` runs `refresh()` on a background thread every
+    `refresh_interval_s` seconds. Readers use `snapshot`, `policies()` or
+    `rule_policies()` and never block on a refresh.
+    """
+
+    _COLUMNS = "POLICY_NAME, DESCRIPTION, CONDITIONS, ACTIONS, RULES, UPDATED_AT, IS_DELETED"
+
+    def __init__(
+        self,
+        session: Any,
+        table: str = "CONTROL_PLANE_DB.CONTROL_PLANE_CONFIG.POLICIES",
+        refresh_interval_s: float = 60.0,
+    ):
+        self.session = session
+        self.table = table
+        self.refresh_interval_s = refresh_interval_s
+        self.snapshot = PolicySnapshot(
+            version=0,
+            policies=MappingProxyType({}),
+            rule_policies=MappingProxyType({}),
+            watermark=None,
+        )
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[PolicySnapshot], None]] = []
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    def policies(self) -> LivePolicies:
+        """Live name -> `policies.Policy` mapping for `policies.PolicyEngine`."""
+        return LivePolicies(self, "policies")
+
+    def rule_policies(self) -> LivePolicies:
+        """Live name -> `models.Policy` mapping (policy_id is the name)."""
+        return LivePolicies(self, "rule_policies")
+
+    def subscribe(self, listener: Callable[[PolicySnapshot], None]) -> None:
+        """Calls `listener(snapshot)` after every published change."""
+        self._listeners.append(listener)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self) -> PolicySnapshot:
+        """Reads the full table and replaces the current snapshot."""
+        with self._refresh_lock:
+            rows = self.session.sql(f"SELECT {self._COLUMNS} FROM {self.table}").collect()
+            return self._apply(rows, base=None)
+
+    def refresh(self) -> PolicySnapshot:
+        """Applies rows changed since the last load or refresh."""
+        with self._refresh_lock:
+            watermark = self.snapshot.watermark
+            if watermark is None:
+                rows = self.session.sql(f"SELECT {self._COLUMNS} FROM {self.table}").collect()
+            else:
+                # >= rather than >: rows committed later with the same
+                # timestamp are re-read; unchanged ones are ignored below.
+                rows = self.session.sql(
+                    f"SELECT {self._COLUMNS} FROM {self.table} WHERE UPDATED_AT >= ?",
+                    params=[watermark],
+                ).collect()
+            return self._apply(rows, base=self.snapshot)
+
+    def _apply(self, rows: List[Any], base: Optional[PolicySnapshot]) -> PolicySnapshot:
+        policies: Dict[str, Policy] = dict(base.policies) if base else {}
+        rule_policies: Dict[str, models.Policy] = dict(base.rule_policies) if base else {}
+        watermark = base.watermark if base else None
+        changed = base is None
+
+        for row in rows:
+            record = row.as_dict()
+            name = record["POLICY_NAME"]
+            updated_at = record.get("UPDATED_AT")
+            if updated_at is not None and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+
+            if record.get("IS_DELETED"):
+                if name in policies:
+                    del policies[name]
+                    rule_policies.pop(name, None)
+                    changed = True
+                continue
+
+            policy = Policy(
+                name=name,
+                description=record.get("DESCRIPTION") or "",
+                conditions=_variant(record.get("CONDITIONS"), {}),
+                actions=_variant(record.get("ACTIONS"), []),
+            )
+            rules = _variant(record.get("RULES"), [])
+            current = rule_policies.get(name)
+            if policies.get(name) == policy and current is not None and current.rules == rules:
+                continue
+            policies[name] = policy
+            rule_policies[name] = models.Policy(
+                policy_id=name,
+                name=name,
+                description=policy.description,
+                rules=rules,
+            )
+            changed = True
+
+        if not changed:
+            if base is not None and watermark != base.watermark:
+                self.snapshot = PolicySnapshot(
+                    base.version, base.policies, base.rule_policies, watermark
+                )
+            return self.snapshot
+
+        snapshot = PolicySnapshot(
+            version=(base.version if base else self.snapshot.version) + 1,
+            policies=MappingProxyType(policies),
+            rule_policies=MappingProxyType(rule_policies),
+            watermark=watermark,
+        )
+        self.snapshot = snapshot  # the atomic swap readers rely on
+        log.info(
+            "Loaded policy snapshot v%d (%d policies)", snapshot.version, len(policies),
+            extra={"version": snapshot.version},
+        )
+        for listener in self._listeners:
+            listener(snapshot)
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Loads the table if needed and starts background refreshes."""
+        if self._thread is not None:
+            return
+        if self.snapshot.version == 0:
+            self.load()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_loop, name="policy-store-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self.refresh_interval_s):
+            try:
+                self.refresh()
+            except Exception as exc:
+                log.warning("Policy refresh failed, keeping snapshot v%d: %s",
+                            self.snapshot.version, exc)
+
+
+def _variant(value: Any, default: Any) -> Any:
+    """Snowpark returns VARIANT/ARRAY columns as JSON text."""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
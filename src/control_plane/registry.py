@@ -1,58 +1,165 @@
-from dataclasses import dataclass, field
-from typing import Dict, Callable, Any, Optional
-
-
-@dataclass
-class RegisteredAgent:
-    name: str
-    description: str
-    handler: Callable[..., Any]
-
-
-@dataclass
-class RegisteredWorkflow:
-    name: str
-    description: str
-    entrypoint: Callable[..., Any]
-
-
-@dataclass
-class ControlPlaneRegistry:
-    """
-    In-memory registry for agents and workflows.
-
-    In a production system, this could be backed by a Snowflake table
-    or a metadata service. For V1, in-memory is enough to show the pattern.
-    """
-    agents: Dict[str, RegisteredAgent] = field(default_factory=dict)
-    workflows: Dict[str, RegisteredWorkflow] = field(default_factory=dict)
-
-    def register_agent(
-        self,
-        name: str,
-        description: str,
-        handler: Callable[..., Any]
-    ) -> None:
-        self.agents[name] = RegisteredAgent(
-            name=name,
-            description=description,
-            handler=handler,
-        )
-
-    def get_agent(self, name: str) -> Optional[RegisteredAgent]:
-        return self.agents.get(name)
-
-    def register_workflow(
-        self,
-        name: str,
-        description: str,
-        entrypoint: Callable[..., Any]
-    ) -> None:
-        self.workflows[name] = RegisteredWorkflow(
-            name=name,
-            description=description,
-            entrypoint=entrypoint,
-        )
-
-    def get_workflow(self, name: str) -> Optional[RegisteredWorkflow]:
-        return self.workflows.get(name)
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Callable, Any, Optional
+
+_UNSET = object()
+
+
+class Lazy:
+    """Builds a value with `factory` on first `get()`, exactly once."""
+
+    __slots__ = ("factory", "_value", "_lock")
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self._value: Any = _UNSET
+        self._lock = threading.Lock()
+
+    @classmethod
+    def of(cls, value: Any) -> "Lazy":
+        """An already-built value."""
+        lazy = cls(lambda: value)
+        lazy._value = value
+        return lazy
+
+    @property
+    def loaded(self) -> bool:
+        return self._value is not _UNSET
+
+    def get(self) -> Any:
+        value = self._value
+        if value is _UNSET:
+            with self._lock:
+                value = self._value
+                if value is _UNSET:
+                    value = self._value = self.factory()
+        return value
+
+
+@dataclass(init=False)
+class RegisteredAgent:
+    """
+    An agent and its handler.
+
+    Takes the handler itself, `factory=` (a zero-argument callable that
+    builds it on first access) or a `Lazy`, e.g.
+    `RegisteredAgent("atlas", "drift checks", handler)`.
+    """
+    name: str
+    description: str
+    _handler: Lazy = field(repr=False)
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        handler: Optional[Callable[..., Any]] = None,
+        factory: Optional[Callable[[], Callable[..., Any]]] = None,
+    ):
+        if (handler is None) == (factory is None):
+            raise ValueError("RegisteredAgent needs exactly one of handler or factory.")
+        self.name = name
+        self.description = description
+        if factory is not None:
+            self._handler = Lazy(factory)
+        elif isinstance(handler, Lazy):
+            self._handler = handler
+        else:
+            self._handler = Lazy.of(handler)
+
+    @property
+    def handler(self) -> Callable[..., Any]:
+        """The agent handler, constructed by its factory on first access."""
+        return self._handler.get()
+
+    @handler.setter
+    def handler(self, handler: Callable[..., Any]) -> None:
+        self._handler = Lazy.of(handler)
+
+    @property
+    def loaded(self) -> bool:
+        return self._handler.loaded
+
+
+@dataclass
+class RegisteredConnector:
+    name: str
+    description: str
+    _connector: Lazy = field(repr=False)
+
+    @property
+    def connector(self) -> Any:
+        """The connector instance, constructed by its factory on first access."""
+        return self._connector.get()
+
+    @property
+    def loaded(self) -> bool:
+        return self._connector.loaded
+
+
+@dataclass
+class RegisteredWorkflow:
+    name: str
+    description: str
+    entrypoint: Callable[..., Any]
+
+
+@dataclass
+class ControlPlaneRegistry:
+    """
+    In-memory registry for agents, connectors and workflows.
+
+    In a production system, this could be backed by a Snowflake table
+    or a metadata service. For V1, in-memory is enough to show the pattern.
+
+    Agents and connectors can be registered with a zero-argument factory
+    instead of an instance; it runs on first use, so short-lived processes
+    never build (or connect) what their workflows don't touch.
+    """
+    agents: Dict[str, RegisteredAgent] = field(default_factory=dict)
+    connectors: Dict[str, RegisteredConnector] = field(default_factory=dict)
+    workflows: Dict[str, RegisteredWorkflow] = field(default_factory=dict)
+
+    def register_agent(
+        self,
+        name: str,
+        description: str,
+        handler: Optional[Callable[..., Any]] = None,
+        factory: Optional[Callable[[], Callable[..., Any]]] = None,
+    ) -> None:
+        if (handler is None) == (factory is None):
+            raise ValueError("register_agent needs exactly one of handler or factory.")
+        self.agents[name] = RegisteredAgent(name, description, handler, factory=factory)
+
+    def get_agent(self, name: str) -> Optional[RegisteredAgent]:
+        return self.agents.get(name)
+
+    def register_connector(
+        self,
+        name: str,
+        description: str,
+        factory: Callable[[], Any],
+    ) -> None:
+        self.connectors[name] = RegisteredConnector(
+            name=name,
+            description=description,
+            _connector=Lazy(factory),
+        )
+
+    def get_connector(self, name: str) -> Optional[RegisteredConnector]:
+        return self.connectors.get(name)
+
+    def register_workflow(
+        self,
+        name: str,
+        description: str,
+        entrypoint: Callable[..., Any]
+    ) -> None:
+        self.workflows[name] = RegisteredWorkflow(
+            name=name,
+            description=description,
+            entrypoint=entrypoint,
+        )
+
+    def get_workflow(self, name: str) -> Optional[RegisteredWorkflow]:
+        return self.workflows.get(name)
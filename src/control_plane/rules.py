@@ -0,0 +1,313 @@
+"""
+Rule language for `models.Policy.rules`.
+
+A policy's `rules` is a list of rule dicts that must *all* hold for the
+policy to allow. Each rule is either a leaf comparison over a field of the
+input data or a boolean combinator:
+
+    {"field": "user_role", "op": "eq", "value": "admin"}
+    {"field": "observed_drift", "op": "between", "value": [0.0, 0.15]}
+    {"field": "region", "op": "in", "value": ["us", "eu"]}
+    {"field": "request.tags", "op": "contains", "value": "PII"}
+    {"field": "approver", "op": "exists"}
+    {"all": [<rule>, ...]}
+    {"any": [<rule>, ...]}
+    {"not": <rule>}
+
+Dotted field names walk nested dicts. A comparison against a missing field
+(or a value of an incomparable type) is False rather than an error.
+
+`compile_rules` turns a rules list into a `CompiledPolicy`, a tree of
+closures that is built once and reused for every evaluation.
+`interpret_rules` walks the raw dicts on every call; it defines the
+reference semantics and serves as the baseline for benchmarks.
+"""
+
+import operator
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+_MISSING = object()
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+}
+
+_ALIASES = {
+    "==": "eq",
+    "!=": "ne",
+    "<": "lt",
+    "<=": "le",
+    ">": "gt",
+    ">=": "ge",
+}
+
+_LEAF_OPS = frozenset(_COMPARISONS) | {"in", "not_in", "contains", "between", "exists"}
+
+
+def _normalize_op(rule: Dict[str, Any]) -> str:
+    op = rule.get("op")
+    if not isinstance(op, str):
+        raise ValueError(f"Rule is missing an 'op': {rule!r}")
+    op = _ALIASES.get(op, op)
+    if op not in _LEAF_OPS:
+        raise ValueError(f"Unknown rule operator: {rule.get('op')!r}")
+    return op
+
+
+def _field_path(rule: Dict[str, Any]) -> List[str]:
+    field = rule.get("field")
+    if not isinstance(field, str) or not field:
+        raise ValueError(f"Rule is missing a 'field': {rule!r}")
+    return field.split(".")
+
+
+def _lookup(data: Dict[str, Any], path: Sequence[str]) -> Any:
+    value: Any = data
+    for key in path:
+        if not isinstance(value, dict):
+            return _MISSING
+        value = value.get(key, _MISSING)
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+
+def _range_bounds(rule: Dict[str, Any]):
+    bounds = rule.get("value")
+    if not isinstance(bounds, (list, tuple)) or len(bounds) != 2:
+        raise ValueError(f"'between' expects a [low, high] value: {rule!r}")
+    return bounds[0], bounds[1]
+
+
+def _membership_set(values: Any):
+    if not isinstance(values, (list, tuple, set, frozenset)):
+        raise ValueError(f"Membership operators expect a list value, got {values!r}")
+    try:
+        return frozenset(values)
+    except TypeError:
+        # Unhashable members (e.g. dicts): fall back to a linear scan.
+        return tuple(values)
+
+
+def _children(rule: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+    children = rule[key]
+    if not isinstance(children, (list, tuple)) or not children:
+        raise ValueError(f"'{key}' expects a non-empty list of rules: {rule!r}")
+    return list(children)
+
+
+# ---------------------------------------------------------------------------
+# Interpreted evaluation (reference semantics)
+# ---------------------------------------------------------------------------
+
+def interpret_rule(rule: Dict[str, Any], data: Dict[str, Any]) -> bool:
+    """Evaluate a single rule by walking its dict on every call."""
+    if "all" in rule:
+        return all(interpret_rule(r, data) for r in _children(rule, "all"))
+    if "any" in rule:
+        return any(interpret_rule(r, data) for r in _children(rule, "any"))
+    if "not" in rule:
+        return not interpret_rule(rule["not"], data)
+
+    op = _normalize_op(rule)
+    value = _lookup(data, _field_path(rule))
+
+    if op == "exists":
+        return (value is not _MISSING) == bool(rule.get("value", True))
+    if value is _MISSING:
+        return False
+    try:
+        if op in _COMPARISONS:
+            return bool(_COMPARISONS[op](value, rule.get("value")))
+        if op == "in":
+            return value in _membership_set(rule.get("value"))
+        if op == "not_in":
+            return value not in _membership_set(rule.get("value"))
+        if op == "contains":
+            return rule.get("value") in value
+        low, high = _range_bounds(rule)
+        return low <= value <= high
+    except TypeError:
+        return False
+
+
+def interpret_rules(rules: List[Dict[str, Any]], data: Dict[str, Any]) -> bool:
+    """Evaluate a policy's rules list (implicit AND) without compiling it."""
+    return all(interpret_rule(rule, data) for rule in rules)
+
+
+# ---------------------------------------------------------------------------
+# Compiled evaluation
+# ---------------------------------------------------------------------------
+
+def _compile_getter(path: List[str]) -> Callable[[Dict[str, Any]], Any]:
+    if len(path) == 1:
+        key = path[0]
+
+        def get(data: Dict[str, Any]) -> Any:
+            return data.get(key, _MISSING)
+
+        return get
+
+    def get_nested(data: Dict[str, Any]) -> Any:
+        return _lookup(data, path)
+
+    return get_nested
+
+
+def _compile_leaf(rule: Dict[str, Any]) -> Predicate:
+    op = _normalize_op(rule)
+    get = _compile_getter(_field_path(rule))
+
+    if op == "exists":
+        expected = bool(rule.get("value", True))
+
+        def exists(data: Dict[str, Any]) -> bool:
+            return (get(data) is not _MISSING) == expected
+
+        return exists
+
+    if op in _COMPARISONS:
+        compare = _COMPARISONS[op]
+        target = rule.get("value")
+
+        def comparison(data: Dict[str, Any]) -> bool:
+            value = get(data)
+            if value is _MISSING:
+                return False
+            try:
+                return bool(compare(value, target))
+            except TypeError:
+                return False
+
+        return comparison
+
+    if op in ("in", "not_in"):
+        members = _membership_set(rule.get("value"))
+        negate = op == "not_in"
+
+        def membership(data: Dict[str, Any]) -> bool:
+            value = get(data)
+            if value is _MISSING:
+                return False
+            try:
+                return (value in members) != negate
+            except TypeError:
+                # Unhashable data value checked against a frozenset.
+                return False
+
+        return membership
+
+    if op == "contains":
+        needle = rule.get("value")
+
+        def contains(data: Dict[str, Any]) -> bool:
+            value = get(data)
+            if value is _MISSING:
+                return False
+            try:
+                return needle in value
+            except TypeError:
+                return False
+
+        return contains
+
+    low, high = _range_bounds(rule)
+
+    def between(data: Dict[str, Any]) -> bool:
+        value = get(data)
+        if value is _MISSING:
+            return False
+        try:
+            return low <= value <= high
+        except TypeError:
+            return False
+
+    return between
+
+
+def _compile_rule(rule: Dict[str, Any], fields: set) -> Predicate:
+    if not isinstance(rule, dict):
+        raise ValueError(f"Rules must be dicts, got {rule!r}")
+
+    if "all" in rule:
+        parts = tuple(_compile_rule(r, fields) for r in _children(rule, "all"))
+        if len(parts) == 1:
+            return parts[0]
+
+        def all_of(data: Dict[str, Any]) -> bool:
+            for part in parts:
+                if not part(data):
+                    return False
+            return True
+
+        return all_of
+
+    if "any" in rule:
+        parts = tuple(_compile_rule(r, fields) for r in _children(rule, "any"))
+        if len(parts) == 1:
+            return parts[0]
+
+        def any_of(data: Dict[str, Any]) -> bool:
+            for part in parts:
+                if part(data):
+                    return True
+            return False
+
+        return any_of
+
+    if "not" in rule:
+        inner = _compile_rule(rule["not"], fields)
+
+        def negation(data: Dict[str, Any]) -> bool:
+            return not inner(data)
+
+        return negation
+
+    fields.add(_field_path(rule)[0])
+    return _compile_leaf(rule)
+
+
+class CompiledPolicy:
+    """
+    A policy's rules compiled into a reusable predicate.
+
+    Calling the object returns True when every top-level rule holds.
+    `first_failure` returns the index of the first rule that does not
+    hold (or None), which callers use to explain a deny.
+    """
+
+    __slots__ = ("policy_id", "rules", "fields", "_predicates")
+
+    def __init__(self, policy_id: str, rules: List[Dict[str, Any]]):
+        fields: set = set()
+        self.policy_id = policy_id
+        self.rules = rules
+        self._predicates = tuple(_compile_rule(rule, fields) for rule in rules)
+        self.fields: FrozenSet[str] = frozenset(fields)
+
+    def __call__(self, data: Dict[str, Any]) -> bool:
+        for predicate in self._predicates:
+            if not predicate(data):
+                return False
+        return True
+
+    def first_failure(self, data: Dict[str, Any]) -> Optional[int]:
+        for index, predicate in enumerate(self._predicates):
+            if not predicate(data):
+                return index
+        return None
+
+
+def compile_rules(policy_id: str, rules: List[Dict[str, Any]]) -> CompiledPolicy:
+    """Compile a policy's rules list, raising ValueError on malformed rules."""
+    if not isinstance(rules, (list, tuple)):
+        raise ValueError(f"Policy '{policy_id}' rules must be a list, got {rules!r}")
+    return CompiledPolicy(policy_id, rules)
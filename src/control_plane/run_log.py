@@ -1,34 +1,325 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
 from .models import RunLog
+from .sql import to_json
+from .timing import tracer
+
+if TYPE_CHECKING:
+    from .history import RecentRuns
+
+log = logging.getLogger(__name__)
+
+_RUN_COLUMNS = (
+    "run_id", "workflow_name", "status", "start_time", "end_time",
+    "input_data", "errors", "policies_evaluated", "policies_skipped",
+    "policies_short_circuited",
+)
+_DECISION_COLUMNS = (
+    "run_id", "seq", "policy_id", "decision", "details", "decided_at",
+)
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def run_log_rows(run_log: RunLog) -> Tuple[tuple, List[tuple]]:
+    """
+    Maps a RunLog to one run row and one row per Decision.
+
+    Timestamps become ISO-8601 strings and dict/list fields become JSON
+    text, so the rows bind on any DB-API driver and round-trip through
+    the spool file unchanged.
+    """
+    run_row = (
+        run_log.run_id,
+        run_log.workflow_name,
+        run_log.status,
+        _iso(run_log.start_time),
+        _iso(run_log.end_time),
+        to_json(run_log.input_data),
+        to_json(run_log.errors),
+        run_log.policies_evaluated,
+        run_log.policies_skipped,
+        run_log.policies_short_circuited,
+    )
+    decision_rows = [
+        (run_log.run_id, seq, d.policy_id, d.decision, to_json(d.details), _iso(d.timestamp))
+        for seq, d in enumerate(run_log.decisions)
+    ]
+    return run_row, decision_rows
+
 
 class RunLogWriter:
     """
     Handles writing RunLog entries to a persistent store, like Snowflake.
+
+    `write_log` only queues a log; a background thread writes them
+    `batch_size` at a time, or every `flush_interval_s` seconds, with
+    parameterized `executemany` calls, one transaction per batch, so a
+    slow warehouse never holds up a run. If a write fails, or takes
+    longer than `slow_write_s`, the batch is appended to a local
+    append-only spool file (JSON lines) and, for the next `retry_after_s`
+    seconds, new batches go straight to the spool without touching the
+    database. The spool is replayed in order before the next database
+    write; lines that can't be parsed, or hold the wrong number of run
+    fields, are moved to `<spool_path>.bad`.
+    `close()` (also registered with atexit) flushes whatever is left.
     """
 
-    def __init__(self, connection):
+    def __init__(
+        self,
+        connection,
+        batch_size: int = 50,
+        spool_path: Optional[str] = None,
+        paramstyle: str = "pyformat",
+        run_table: str = "workflow_run_log",
+        decision_table: str = "workflow_run_decision",
+        slow_write_s: Optional[float] = 5.0,
+        retry_after_s: float = 30.0,
+        history: Optional["RecentRuns"] = None,
+        flush_interval_s: float = 1.0,
+    ):
         """
         Initializes the writer with a database connection.
 
         Args:
-            connection: A database connection object (e.g., Snowflake connection).
+            connection: A DB-API connection object (e.g., Snowflake connection).
+            batch_size: Number of queued logs that triggers a write.
+            spool_path: Local file used when the database is slow or down.
+                Without one, failed batches stay buffered in memory.
+            paramstyle: The driver's DB-API paramstyle, "pyformat" (%s,
+                Snowflake's default) or "qmark" (?, e.g. sqlite3).
+            run_table: Table receiving one row per RunLog.
+            decision_table: Table receiving one row per Decision.
+            slow_write_s: Batches slower than this divert later writes to
+                the spool for `retry_after_s` seconds. None disables it.
+            retry_after_s: How long to bypass the database after a failed
+                or slow write.
+            history: A `history.RecentRuns` that also records every log
+                written, for local queries over recent runs.
+            flush_interval_s: Longest a queued log waits to be written,
+                and so the most a crash can lose.
         """
+        if paramstyle not in ("pyformat", "qmark"):
+            raise ValueError(f"Unsupported paramstyle: {paramstyle}")
         self.connection = connection
+        self.batch_size = batch_size
+        self.spool_path = spool_path
+        self.slow_write_s = slow_write_s
+        self.retry_after_s = retry_after_s
+        self.history = history
+        self.flush_interval_s = flush_interval_s
+
+        marker = "%s" if paramstyle == "pyformat" else "?"
+        self._run_sql = self._insert_sql(run_table, _RUN_COLUMNS, marker)
+        self._decision_sql = self._insert_sql(decision_table, _DECISION_COLUMNS, marker)
+
+        self._pending: List[Tuple[tuple, List[tuple]]] = []
+        self._lock = threading.Lock()  # guards _pending only; never held during I/O
+        self._flush_lock = threading.RLock()  # one flush or replay at a time
+        self._bypass_until = 0.0
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="run-log-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    @staticmethod
+    def _insert_sql(table: str, columns: Sequence[str], marker: str) -> str:
+        placeholders = ", ".join([marker] * len(columns))
+        return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+    def write_log(self, run_log: RunLog):
+        """
+        Queues a RunLog object for writing to the database.
+
+        Never waits for the database: once `batch_size` logs are queued
+        the background thread is woken to write them.
+        """
+        log.debug("Queueing run log for run_id: %s", run_log.run_id)
+        if self.history is not None:
+            self.history.record(run_log)
+        record = run_log_rows(run_log)
+        with self._lock:
+            self._pending.append(record)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def pending(self) -> int:
+        """Number of logs queued but not yet written or spooled."""
+        with self._lock:
+            return len(self._pending)
 
-    def write_log(self, log: RunLog):
+    def flush(self) -> int:
         """
-        Writes a RunLog object to the database.
+        Writes queued logs, replaying any spooled logs first.
 
-        This is a stub implementation. In a real scenario, this method would
-        map the RunLog dataclass to the corresponding database schema and
-        execute an INSERT statement.
+        Returns the number of logs written to the database. Never raises on
+        database errors: logs that could not be written are spooled (or
+        kept in memory when no spool is configured).
         """
-        print(f"INFO: Writing log for run_id: {log.run_id} to persistent storage.")
-        # TODO: Implement the actual database write logic.
-        # Example:
-        # cursor = self.connection.cursor()
-        # insert_sql = "INSERT INTO run_log (run_id, workflow_name, status, ...) VALUES (%s, %s, %s, ...)"
-        # values = (log.run_id, log.workflow_name, log.status, ...)
-        # cursor.execute(insert_sql, values)
-        # self.connection.commit()
-        print("INFO: Log write successful (stub).")
+        with self._flush_lock:
+            with self._lock:
+                records, self._pending = self._pending, []
+            if not records and not self._spool_has_records():
+                return 0
+            with tracer.span("log_flush"):
+                return self._flush(records)
+
+    def _flush(self, records: List[Tuple[tuple, List[tuple]]]) -> int:
+        if time.monotonic() < self._bypass_until:
+            self._divert(records)
+            return 0
+
+        if not self.replay_spool():
+            self._divert(records)
+            return 0
+
+        if records and not self._write(records):
+            self._divert(records)
+            return 0
+        return len(records)
+
+    def replay_spool(self) -> bool:
+        """
+        Writes spooled logs to the database in the order they were spooled.
+
+        Returns True once the spool is empty. On failure the spool keeps
+        every log that was not committed and False is returned. Lines
+        that can't be parsed are moved to `<spool_path>.bad`.
+        """
+        with self._flush_lock:
+            if not self._spool_has_records():
+                return True
+
+            with open(self.spool_path, "r", encoding="utf-8") as spool:
+                lines = [line if line.endswith("\n") else line + "\n" for line in spool if line.strip()]
+
+            spooled, bad = [], []
+            for line in lines:
+                try:
+                    spooled.append((line, _parse_spooled(line)))
+                except (ValueError, KeyError, TypeError):
+                    bad.append(line)
+            if bad:
+                self._quarantine(bad)
+
+            done = 0
+            while done < len(spooled):
+                chunk = spooled[done:done + self.batch_size]
+                if not self._write([record for _, record in chunk]):
+                    break
+                done += len(chunk)
+
+            self._rewrite_spool([line for line, _ in spooled[done:]])
+            return done == len(spooled)
+
+    def close(self):
+        """Stops the background thread and flushes anything still queued."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._wake.set()
+        self._flusher.join()
+        self.flush()
+
+    def _flush_loop(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            if self._closed.is_set():
+                break
+            try:
+                self.flush()
+            except Exception as exc:
+                # e.g. the spool's disk is full; the logs stay queued.
+                log.warning("Run log flush failed, will retry: %s", exc)
+
+    def _write(self, records: List[Tuple[tuple, List[tuple]]]) -> bool:
+        run_rows = [run_row for run_row, _ in records]
+        decision_rows = [row for _, rows in records for row in rows]
+        started = time.monotonic()
+        cursor = None
+        try:
+            cursor = self.connection.cursor()
+            cursor.executemany(self._run_sql, run_rows)
+            if decision_rows:
+                cursor.executemany(self._decision_sql, decision_rows)
+            self.connection.commit()
+        except Exception as exc:
+            log.warning("Run log write failed, spooling %d log(s): %s", len(records), exc)
+            try:
+                self.connection.rollback()
+            except Exception:
+                pass
+            self._bypass_until = time.monotonic() + self.retry_after_s
+            return False
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+        if self.slow_write_s is not None and time.monotonic() - started > self.slow_write_s:
+            self._bypass_until = time.monotonic() + self.retry_after_s
+        return True
+
+    def _divert(self, records: List[Tuple[tuple, List[tuple]]]) -> None:
+        if not records:
+            return
+        if self.spool_path is None:
+            # Nowhere durable to put them; retry on the next flush.
+            with self._lock:
+                self._pending[:0] = records
+            return
+        try:
+            self._append(self.spool_path, [
+                json.dumps({"run": run_row, "decisions": decision_rows}) + "\n"
+                for run_row, decision_rows in records
+            ])
+        except Exception:
+            with self._lock:
+                self._pending[:0] = records
+            raise
+
+    def _quarantine(self, lines: List[str]) -> None:
+        bad_path = f"{self.spool_path}.bad"
+        log.warning("Moving %d unreadable spool line(s) to %s", len(lines), bad_path)
+        self._append(bad_path, lines)
+
+    @staticmethod
+    def _append(path: str, lines: List[str]) -> None:
+        with open(path, "a", encoding="utf-8") as spool:
+            spool.writelines(lines)
+            spool.flush()
+            os.fsync(spool.fileno())
+
+    def _spool_has_records(self) -> bool:
+        return (
+            self.spool_path is not None
+            and os.path.exists(self.spool_path)
+            and os.path.getsize(self.spool_path) > 0
+        )
+
+    def _rewrite_spool(self, remaining: List[str]) -> None:
+        tmp_path = f"{self.spool_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as spool:
+            spool.writelines(remaining)
+            spool.flush()
+            os.fsync(spool.fileno())
+        os.replace(tmp_path, self.spool_path)
+
 
+def _parse_spooled(line: str) -> Tuple[tuple, List[tuple]]:
+    entry = json.loads(line)
+    run_row = tuple(entry["run"])
+    if len(run_row) != len(_RUN_COLUMNS):
+        raise ValueError(f"Spooled run has {len(run_row)} fields, expected {len(_RUN_COLUMNS)}.")
+    return run_row, [tuple(row) for row in entry["decisions"]]
@@ -0,0 +1,304 @@
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .timing import tracer
+
+# A single-row `VALUES (?, ?, ...)` group, e.g. in RunLogger's MERGE.
+_VALUES_ROW = re.compile(r"VALUES\s*(\((?:\s*\?\s*,)*\s*\?\s*\))", re.IGNORECASE)
+_READ_ONLY = ("SELECT", "WITH", "SHOW", "DESCRIBE", "DESC")
+
+
+class SessionPool:
+    """
+    A pool of Snowpark sessions, created by `factory` on demand.
+
+    At most `size` sessions exist; callers beyond that wait for one to be
+    returned. The pool can stand in for a session: `pool.sql(query,
+    params).collect()` checks a session out for just that statement, so
+    agents and loggers can share a few sessions instead of each holding
+    its own.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 4):
+        if size < 1:
+            raise ValueError("size must be at least 1.")
+        self.factory = factory
+        self.size = size
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._created: List[Any] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def session(self) -> Iterator[Any]:
+        """Checks out a session for the duration of the block."""
+        session = self._checkout()
+        try:
+            yield session
+        finally:
+            self._idle.put(session)
+
+    def _checkout(self) -> Any:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = len(self._created) < self.size
+            if create:
+                session = self.factory()
+                self._created.append(session)
+        if create:
+            return session
+        return self._idle.get()
+
+    def sql(self, query: str, params: Optional[Sequence[Any]] = None) -> "_Query":
+        return _Query(lambda: self._run(query, params))
+
+    def _run(self, query: str, params: Optional[Sequence[Any]]) -> List[Any]:
+        with self.session() as session:
+            return _collect(session, query, params)
+
+    def close(self) -> None:
+        """Closes every session the pool created."""
+        with self._lock:
+            sessions, self._created = self._created, []
+        for session in sessions:
+            close = getattr(session, "close", None)
+            if close is not None:
+                close()
+
+
+class BatchingSession:
+    """
+    Session wrapper that micro-batches statements from concurrent callers.
+
+    `sql(query, params).collect()` (or `submit(query, params)`, which
+    returns a Future) queues the statement. A background thread waits up
+    to `window_s` after the first queued statement, or until `max_batch`
+    are queued, then sends the batch to `session` (a session or a
+    `SessionPool`):
+
+    - identical read-only statements (SELECT/WITH/SHOW/DESCRIBE with the
+      same binds) run once and share the result;
+    - statements with the same text and a single `VALUES (?, ...)` row
+      are combined into one multi-row statement. INSERTs always combine;
+      MERGEs combine only while their first bind value (the merge key by
+      convention, as in `RunLogger`) is distinct, since a MERGE must not
+      see the same key twice;
+    - everything else runs as sent.
+
+    Every caller in a combined statement gets the combined statement's
+    result, not a share of it: Snowflake reports one row count for the
+    whole INSERT or MERGE, so e.g. "number of rows inserted" counts the
+    other callers' rows too. Callers that need their own count should
+    not go through this wrapper.
+
+    Groups run on up to `max_workers` threads, so with a pool they use
+    several sessions at once; the chunks of one combined statement run in
+    queue order. A failed statement fails every caller in it. Statements
+    whose binds can't be compared (e.g. a list bound to `IN (?)`) run as
+    sent. `collect()` waits at most `timeout_s` for its result.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        window_s: float = 0.005,
+        max_batch: int = 100,
+        max_workers: int = 1,
+        timeout_s: Optional[float] = 60.0,
+    ):
+        self.session = session
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self.timeout_s = timeout_s
+        self._pending: List[Tuple[str, Tuple[Any, ...], Future]] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sql-batch")
+        self._thread = threading.Thread(target=self._loop, name="sql-batcher", daemon=True)
+        self._thread.start()
+        self.statements_sent = 0
+        self.statements_received = 0
+
+    def sql(self, query: str, params: Optional[Sequence[Any]] = None) -> "_Query":
+        return _Query(lambda: self.submit(query, params).result(self.timeout_s))
+
+    def submit(self, query: str, params: Optional[Sequence[Any]] = None) -> Future:
+        """Queues a statement; the Future resolves to its collected rows."""
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchingSession is closed.")
+            self._pending.append((query, tuple(params or ()), future))
+            self.statements_received += 1
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._cond.notify()
+        return future
+
+    def close(self) -> None:
+        """Sends whatever is queued and stops the batching thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "BatchingSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Batching
+    # ------------------------------------------------------------------
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                deadline = time.monotonic() + self.window_s
+                while len(self._pending) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+            # Failures go to the callers; the thread itself must not die.
+            try:
+                tasks = _group(batch)
+            except BaseException as exc:
+                for _, _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for statements in tasks:
+                try:
+                    self._executor.submit(self._send, statements)
+                except BaseException as exc:
+                    for _, _, futures in statements:
+                        for future in futures:
+                            future.set_exception(exc)
+                    continue
+                self.statements_sent += len(statements)
+
+    def _send(self, statements: List["_Statement"]) -> None:
+        for query, params, futures in statements:
+            try:
+                if not tracer.enabled:
+                    rows = _collect(self.session, query, params)
+                else:
+                    with tracer.span("sql_batch"):
+                        rows = _collect(self.session, query, params)
+            except BaseException as exc:
+                for future in futures:
+                    future.set_exception(exc)
+                continue
+            for future in futures:
+                future.set_result(rows)
+
+
+class _Query:
+    """What `sql()` returns: runs the statement on `collect()`, like Snowpark."""
+
+    __slots__ = ("_run",)
+
+    def __init__(self, run: Callable[[], List[Any]]):
+        self._run = run
+
+    def collect(self) -> List[Any]:
+        return self._run()
+
+
+def _collect(session: Any, query: str, params: Optional[Sequence[Any]]) -> List[Any]:
+    if params:
+        return session.sql(query, params=list(params)).collect()
+    return session.sql(query).collect()
+
+
+# (query, params, futures of every caller it answers)
+_Statement = Tuple[str, Tuple[Any, ...], List[Future]]
+
+
+def _group(batch: List[Tuple[str, Tuple[Any, ...], Future]]) -> List[List[_Statement]]:
+    """
+    Turns queued statements into the statements to send.
+
+    Returns independent tasks, each a list of statements to run in order.
+    """
+    out: List[List[_Statement]] = []
+    reads: Dict[Tuple[str, Tuple[Any, ...]], List[Future]] = {}
+    rows: Dict[str, List[Tuple[Tuple[Any, ...], Future]]] = {}
+
+    for query, params, future in batch:
+        verb = query.lstrip().split(None, 1)[0].upper() if query.strip() else ""
+        if verb in _READ_ONLY and _hashable(params):
+            key = (query, params)
+            waiters = reads.get(key)
+            if waiters is None:
+                waiters = reads[key] = []
+                out.append([(query, params, waiters)])
+            waiters.append(future)
+        elif (
+            verb in ("INSERT", "MERGE")
+            and _single_row(query, params)
+            and (verb == "INSERT" or _hashable(params[0]))
+        ):
+            rows.setdefault(query, []).append((params, future))
+        else:
+            out.append([(query, params, [future])])
+
+    for query, entries in rows.items():
+        verb = query.lstrip().split(None, 1)[0].upper()
+        row = _VALUES_ROW.search(query)
+        task: List[_Statement] = []
+        for chunk in _chunks(entries, unique_key=verb == "MERGE"):
+            task.append((
+                query[:row.start(1)] + ", ".join([row.group(1)] * len(chunk)) + query[row.end(1):],
+                tuple(value for params, _ in chunk for value in params),
+                [future for _, future in chunk],
+            ))
+        out.append(task)
+    return out
+
+
+def _single_row(query: str, params: Tuple[Any, ...]) -> bool:
+    found = _VALUES_ROW.findall(query)
+    return len(found) == 1 and found[0].count("?") == len(params) == query.count("?")
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _chunks(
+    entries: List[Tuple[Tuple[Any, ...], Future]],
+    unique_key: bool,
+) -> Iterator[List[Tuple[Tuple[Any, ...], Future]]]:
+    # Starts a new chunk whenever a MERGE key repeats, keeping order.
+    chunk: List[Tuple[Tuple[Any, ...], Future]] = []
+    keys = set()
+    for entry in entries:
+        key = entry[0][0]
+        if unique_key and key in keys:
+            yield chunk
+            chunk, keys = [], set()
+        chunk.append(entry)
+        if unique_key:
+            keys.add(key)
+    if chunk:
+        yield chunk
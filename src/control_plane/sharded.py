@@ -0,0 +1,157 @@
+import logging
+import os
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+from .models import Policy, RunLog, Workflow
+from .run_log import RunLogWriter
+from .timing import tracer
+
+log = logging.getLogger(__name__)
+
+# policy_id -> (name, rules): all a worker needs to rebuild and compile a policy.
+PolicyState = Dict[str, Tuple[str, List[Dict[str, Any]]]]
+
+
+def policy_state(policy_registry: Mapping[str, Policy]) -> PolicyState:
+    """The minimal, picklable form of a policy registry sent to workers."""
+    return {
+        policy_id: (policy.name, policy.rules)
+        for policy_id, policy in policy_registry.items()
+    }
+
+
+class ShardedExecutor:
+    """
+    Runs batches of `workflow_engine.WorkflowEngine` runs on worker processes.
+
+    Each shard is a single-process pool, and every item of a batch goes to
+    the shard picked by `shard_key(workflow, trigger_data)` (the workflow
+    id by default), so related runs always land on the same worker and
+    share its warm compiled-rule cache. The policy registry is pickled
+    once per worker, as `policy_state`, when the worker starts; each
+    batch then ships one chunk of items per shard.
+
+    Step handlers must be picklable (module-level functions). Run logs
+    come back to the parent, are written to `run_log_writer` (if given)
+    in batch order and returned in batch order; as with `run`, failed or
+    denied runs come back with their status and errors set.
+    """
+
+    def __init__(
+        self,
+        policy_registry: Mapping[str, Policy],
+        step_handlers: Optional[Dict[str, Callable[..., Any]]] = None,
+        shards: Optional[int] = None,
+        run_log_writer: Optional[RunLogWriter] = None,
+        shard_key: Optional[Callable[[Workflow, Dict[str, Any]], Hashable]] = None,
+        step_workers: int = 1,
+        mp_context: Any = None,
+    ):
+        """
+        Args:
+            policy_registry: A dictionary mapping policy_ids to Policy objects.
+            step_handlers: Step type -> handler, as for `WorkflowEngine`.
+            shards: Number of worker processes (default: CPU count).
+            run_log_writer: Receives every run log, in batch order.
+            shard_key: Maps an item to the key that picks its shard.
+            step_workers: Step thread pool size inside each worker.
+            mp_context: A `multiprocessing` context (e.g. "spawn").
+        """
+        self.shards = shards or os.cpu_count() or 1
+        self.run_log_writer = run_log_writer
+        self.shard_key = shard_key or (lambda workflow, data: workflow.workflow_id)
+        state = policy_state(policy_registry)
+        self._pools = [
+            ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(state, step_handlers or {}, step_workers),
+            )
+            for _ in range(self.shards)
+        ]
+
+    def shard_of(self, workflow: Workflow, trigger_data: Dict[str, Any]) -> int:
+        # crc32 rather than hash(): stable across processes and runs.
+        key = self.shard_key(workflow, trigger_data)
+        return zlib.crc32(repr(key).encode()) % self.shards
+
+    def run_batch(self, items: Sequence[Tuple[Workflow, Dict[str, Any]]]) -> List[RunLog]:
+        """Runs every (workflow, trigger_data) item and returns their logs in order."""
+        chunks: List[List[Tuple[int, Workflow, Dict[str, Any]]]] = [[] for _ in self._pools]
+        for index, (workflow, trigger_data) in enumerate(items):
+            chunks[self.shard_of(workflow, trigger_data)].append((index, workflow, trigger_data))
+
+        with tracer.span("sharded_batch"):
+            futures: List[Future] = [
+                pool.submit(_run_chunk, chunk)
+                for pool, chunk in zip(self._pools, chunks) if chunk
+            ]
+            results: List[Optional[RunLog]] = [None] * len(items)
+            for future in futures:
+                for index, run_log in future.result():
+                    run_log.input_data = items[index][1]
+                    results[index] = run_log
+
+        if self.run_log_writer is not None:
+            with tracer.span("log_write"):
+                for run_log in results:
+                    self.run_log_writer.write_log(run_log)
+        return results
+
+    def shutdown(self) -> None:
+        for pool in self._pools:
+            pool.shutdown()
+
+    def __enter__(self) -> "ShardedExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+
+# ----------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------
+
+class _DiscardLog:
+    """Stands in for `RunLogWriter` inside a worker; the parent writes logs."""
+
+    def write_log(self, run_log: RunLog) -> None:
+        pass
+
+
+_worker_engine = None
+
+
+def _init_worker(state: PolicyState, step_handlers: Dict[str, Callable[..., Any]], step_workers: int) -> None:
+    global _worker_engine
+    from .policy_engine import PolicyEngine
+    from .workflow_engine import WorkflowEngine
+
+    registry = {
+        policy_id: Policy(policy_id=policy_id, name=name, description="", rules=rules)
+        for policy_id, (name, rules) in state.items()
+    }
+    policy_engine = PolicyEngine()
+    for policy in registry.values():
+        policy_engine.compile(policy)
+    _worker_engine = WorkflowEngine(
+        policy_engine,
+        _DiscardLog(),
+        registry,
+        step_handlers=step_handlers,
+        step_workers=step_workers,
+    )
+
+
+def _run_chunk(chunk: List[Tuple[int, Workflow, Dict[str, Any]]]) -> List[Tuple[int, RunLog]]:
+    out = []
+    for index, workflow, trigger_data in chunk:
+        run_log = _worker_engine.run(workflow, trigger_data)
+        # The parent still holds the trigger data; don't pickle it back.
+        run_log.input_data = None
+        out.append((index, run_log))
+    return out
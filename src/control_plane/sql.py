@@ -0,0 +1,69 @@
+import dataclasses
+import json
+from collections.abc import Mapping
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, List, Sequence
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        # Shallow: the encoder recurses into the field values itself.
+        return {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    if isinstance(value, Mapping):
+        return dict(value)
+    to_rows = getattr(value, "to_rows", None)  # e.g. agents.DriftSnapshot
+    if callable(to_rows):
+        return to_rows()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    item = getattr(value, "item", None)  # NumPy scalars
+    if callable(item):
+        return item()
+    return str(value)
+
+
+# One shared encoder: `json.dumps(..., default=...)` builds a new one per call.
+_encode = json.JSONEncoder(
+    default=_default, separators=(",", ":"), ensure_ascii=False
+).encode
+
+
+def to_json(value: Any) -> str:
+    """
+    Serializes `value` as compact JSON text for a VARIANT/JSON column.
+
+    Handles datetimes (ISO-8601), enums, dataclasses, mappings (e.g.
+    `policies.EvaluationResult`), objects with a `to_rows()` method (e.g.
+    `agents.DriftSnapshot`), sets/tuples, Decimals and NumPy scalars;
+    anything else falls back to `str()`.
+    """
+    return _encode(value)
+
+
+class Statement:
+    """
+    SQL text with `?` placeholders, executed with bind parameters.
+
+    The text never changes between executions, so values can't break or
+    inject into it and the warehouse can reuse the compiled statement.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def run(self, session: Any, params: Sequence[Any]) -> List[Any]:
+        """Runs on a Snowpark session with qmark bindings."""
+        return session.sql(self.text, params=list(params)).collect()
+
+    def __repr__(self) -> str:
+        return f"Statement({self.text!r})"
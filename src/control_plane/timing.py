@@ -0,0 +1,202 @@
+"""
+Lightweight timing spans and in-process latency histograms.
+
+    from control_plane.timing import tracer
+
+    with tracer.run() as timings:        # per-run durations, by stage
+        with tracer.span("policy", policy_id):
+            ...
+
+Every span is recorded twice: under "stage:detail" in the timings dict of
+the enclosing `tracer.run()` (if any), and in an aggregate histogram for
+its stage. `tracer.histograms.snapshot()` exports count/sum/p50/p95/p99 as
+a dict and `tracer.histograms.to_prometheus()` as Prometheus text.
+
+The module-level `tracer` is enabled by default, since run results and
+`RunLog` carry its timings; every span then takes the histogram lock
+once. With `tracer.enabled = False`, `span()` returns a shared no-op
+object, `run()` doesn't touch its context variable and nothing is
+recorded. Entering even the no-op span costs a couple of Python calls
+(a few hundred ns), so spans entered per policy, step, agent call, log
+write or statement check `tracer.enabled` first and skip the `with`.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Union
+
+# Upper bounds in seconds: 50us .. ~105s, doubling.
+DEFAULT_BUCKETS = tuple(0.00005 * 2 ** i for i in range(22))
+
+_run_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("run_timings", default=None)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram. Not thread-safe on its own."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile by interpolating inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.bounds[-1]
+
+
+class Histograms:
+    """Thread-safe collection of per-stage histograms."""
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        self._bounds = bounds
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self._bounds)
+            histogram.observe(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                stage: {
+                    "count": h.count,
+                    "sum": h.sum,
+                    "p50": h.quantile(0.50),
+                    "p95": h.quantile(0.95),
+                    "p99": h.quantile(0.99),
+                }
+                for stage, h in self._histograms.items()
+            }
+
+    def to_prometheus(self, metric: str = "control_plane_stage_duration_seconds") -> str:
+        lines: List[str] = [
+            f"# HELP {metric} Duration of control plane stages in seconds.",
+            f"# TYPE {metric} histogram",
+        ]
+        with self._lock:
+            for stage, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, n in zip(h.bounds, h.counts):
+                    cumulative += n
+                    lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {h.sum}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+
+class Span:
+    """Times a block and records it on exit."""
+
+    __slots__ = ("stage", "detail", "_histograms", "_start")
+
+    def __init__(self, stage: str, detail: Optional[str], histograms: Histograms):
+        self.stage = stage
+        self.detail = detail
+        self._histograms = histograms
+
+    def __enter__(self) -> "Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter() - self._start
+        timings = _run_timings.get()
+        if timings is not None:
+            key = f"{self.stage}:{self.detail}" if self.detail is not None else self.stage
+            timings[key] = timings.get(key, 0.0) + elapsed
+        self._histograms.observe(self.stage, elapsed)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms = Histograms()
+
+    def span(self, stage: str, detail: Optional[str] = None):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(stage, detail, self.histograms)
+
+    def run(self) -> "Union[_RunScope, _NoopRunScope]":
+        """
+        Collects the durations of spans opened inside the block.
+
+        Yields the dict that receives them (left empty when disabled).
+        Spans run on other threads are included when the work is submitted
+        with `contextvars.copy_context().run`.
+        """
+        return _RunScope() if self.enabled else _NoopRunScope()
+
+
+class _RunScope:
+    # A class rather than @contextmanager: it is entered once per run.
+    __slots__ = ("timings", "_token")
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    def __enter__(self) -> Dict[str, float]:
+        self._token = _run_timings.set(self.timings)
+        return self.timings
+
+    def __exit__(self, *exc) -> None:
+        _run_timings.reset(self._token)
+
+
+class _NoopRunScope:
+    # Disabled: yields an empty dict and leaves the context variable alone.
+    __slots__ = ("timings",)
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    def __enter__(self) -> Dict[str, float]:
+        return self.timings
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+tracer = Tracer()
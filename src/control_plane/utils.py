@@ -1,6 +1,52 @@
-import uuid
-from datetime import datetime
-
-
-def generate_run_id(prefix: str = "run") -> str:
-    return f"{prefix}_{uuid.uuid4().hex[:8]}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+import os
+import time
+from typing import Awaitable, Callable, Iterable, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# UTC second -> its "%Y%m%d%H%M%S" text; runs within a second share it.
+_stamp: Tuple[int, str] = (-1, "")
+
+# First hex digit of a UUID's clock_seq_hi with the RFC 4122 variant bits.
+_VARIANT = {c: "89ab"[int(c, 16) & 3] for c in "0123456789abcdef"}
+
+
+def generate_run_id(prefix: str = "run") -> str:
+    global _stamp
+    now = int(time.time())
+    second, stamp = _stamp
+    if second != now:
+        stamp = time.strftime("%Y%m%d%H%M%S", time.gmtime(now))
+        _stamp = (now, stamp)
+    return f"{prefix}_{os.urandom(4).hex()}_{stamp}"
+
+
+def new_run_id() -> str:
+    """
+    A random (version 4) UUID as text, like `str(uuid.uuid4())`.
+
+    Formats 16 random bytes directly instead of building a `uuid.UUID`,
+    which is most of the cost of `str(uuid.uuid4())`.
+    """
+    h = os.urandom(16).hex()
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{_VARIANT[h[16]]}{h[17:20]}-{h[20:]}"
+
+
+async def gather_bounded(
+    factories: Iterable[Callable[[], Awaitable[T]]],
+    limit: int,
+) -> List[T]:
+    """
+    Await coroutines from `factories` with at most `limit` in flight.
+
+    Results come back in the order of `factories`.
+    """
+    import asyncio  # deferred to keep `import control_plane` cheap
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(factory: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(*(bounded(factory) for factory in factories))
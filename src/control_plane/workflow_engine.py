@@ -1,17 +1,36 @@
-import uuid
-from datetime import datetime
-from typing import Dict, Any
+import contextvars
+import dataclasses
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterable, List, Mapping, Optional, Tuple
 
-from .models import Workflow, RunLog, Policy
+from .core import RunCore
+from .models import Workflow, RunLog, Policy, DecisionKind, RunStatus
 from .policy_engine import PolicyEngine
+from .policy_index import PolicyIndex
 from .run_log import RunLogWriter
+from .step_scheduler import StepScheduler
+from .timing import tracer
+from .utils import gather_bounded
+
+log = logging.getLogger(__name__)
 
 class WorkflowEngine:
     """
     Orchestrates the execution of workflows, including policy evaluation and logging.
     """
 
-    def __init__(self, policy_engine: PolicyEngine, run_log_writer: RunLogWriter, policy_registry: Dict[str, Policy]):
+    def __init__(
+        self,
+        policy_engine: PolicyEngine,
+        run_log_writer: RunLogWriter,
+        policy_registry: Dict[str, Policy],
+        max_concurrency: int = 8,
+        step_handlers: Optional[Dict[str, Callable[..., Any]]] = None,
+        step_workers: int = 4,
+        run_timeout_s: Optional[float] = None,
+    ):
         """
         Initializes the workflow engine.
 
@@ -19,74 +38,234 @@ class WorkflowEngine:
             policy_engine: An instance of the PolicyEngine.
             run_log_writer: An instance of the RunLogWriter.
             policy_registry: A dictionary mapping policy_ids to Policy objects.
+            max_concurrency: Thread pool size and in-flight limit for `arun`
+                and `run_many`.
+            step_handlers: A dictionary mapping step types to callables
+                invoked as handler(step=..., inputs=..., trigger_data=...).
+                Steps of other types are only recorded.
+            step_workers: Size of the thread pool running independent steps.
+            run_timeout_s: Default per-run timeout for `arun` and `run_many`.
         """
         self.policy_engine = policy_engine
         self.run_log_writer = run_log_writer
         self.policy_registry = policy_registry
+        self.policy_index = PolicyIndex(policy_engine, policy_registry)
+        self.max_concurrency = max_concurrency
+        self.run_timeout_s = run_timeout_s
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.step_handlers = step_handlers or {}
+        self.step_scheduler = StepScheduler(max_workers=step_workers)
+        self.core = RunCore(on_finish=self._write)
+
+    def reload_policies(self, policy_registry: Mapping[str, Policy]):
+        """
+        Replaces the policy registry and rebuilds the policy index.
+
+        Runs already evaluating keep using the index (and registry) they
+        started with. Compiled rules of unchanged policies are reused.
+        Can be passed to `PolicyStore.subscribe` as
+        `lambda snapshot: engine.reload_policies(snapshot.rule_policies)`.
+
+        Args:
+            policy_registry: A dictionary mapping policy_ids to Policy objects.
+        """
+        for policy_id in set(self.policy_registry) - set(policy_registry):
+            self.policy_engine.invalidate(policy_id)
+        index = PolicyIndex(self.policy_engine, policy_registry)
+        self.policy_registry = policy_registry
+        self.policy_index = index
 
-    def run(self, workflow: Workflow, trigger_data: Dict[str, Any]):
+    def run(self, workflow: Workflow, trigger_data: Dict[str, Any]) -> RunLog:
         """
         Executes a workflow from detection to recording.
 
         Args:
             workflow: The Workflow to execute.
             trigger_data: The data that triggered the workflow.
+
+        Returns:
+            The RunLog recorded for this run.
+        """
+        with tracer.run() as timings, tracer.span("run"):
+            run_log = self.core.execute(
+                workflow.name, trigger_data, functools.partial(self._execute, workflow), timings=timings
+            )
+        self._report(workflow, run_log)
+        return run_log
+
+    def _report(self, workflow: Workflow, run_log: RunLog) -> None:
+        if run_log.status == RunStatus.FAILED:
+            log.error(
+                "Workflow '%s' failed: %s", workflow.name, run_log.errors[-1],
+                extra={"workflow": workflow.name, "run_id": run_log.run_id},
+            )
+        if log.isEnabledFor(logging.INFO):
+            log.info(
+                "Workflow '%s' finished with status: %s", workflow.name, run_log.status,
+                extra={"workflow": workflow.name, "run_id": run_log.run_id, "status": run_log.status},
+            )
+
+    def _execute(self, workflow: Workflow, run_log: RunLog) -> None:
+        # 1. Detect (assumed to have happened to trigger this run)
+        if log.isEnabledFor(logging.INFO):
+            log.info(
+                "Workflow '%s' triggered for run_id: %s", workflow.name, run_log.run_id,
+                extra={"workflow": workflow.name, "run_id": run_log.run_id},
+            )
+
+        # 2. Evaluate Policies
+        self._evaluate_policies(workflow, run_log.input_data, run_log)
+
+        # Evaluation stops at the first 'deny', which is always last
+        if run_log.decisions and run_log.decisions[-1].decision == DecisionKind.DENY:
+            raise PermissionError("Workflow execution denied by policy.")
+
+        # 3. Orchestrate Actions
+        self._orchestrate_actions(workflow, run_log.input_data, run_log)
+
+    def _write(self, run_log: RunLog, result: Any, error: Optional[BaseException]) -> None:
+        # 4. Record (RunCore has set the final status)
+        self.run_log_writer.write_log(run_log)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="workflow",
+            )
+        return self._executor
+
+    async def arun(
+        self,
+        workflow: Workflow,
+        trigger_data: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> RunLog:
+        """
+        Runs `run` on the engine's thread pool without blocking the event loop.
+
+        Runs longer than `timeout` (default `run_timeout_s`) are recorded
+        as FAILED with whatever they had done by then. A timed-out run
+        cannot be interrupted; its thread finishes in the background and
+        its outcome is discarded.
+        """
+        import asyncio  # already loaded by the running event loop
+
+        timeout = self.run_timeout_s if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        if timeout is None:
+            return await loop.run_in_executor(
+                executor, functools.partial(self.run, workflow, trigger_data)
+            )
+
+        with tracer.run() as timings, tracer.span("run"):
+            run_log = self.core.start(workflow.name, trigger_data, timings=timings)
+            context = contextvars.copy_context()
+            error = None
+            try:
+                worker_timings, error = await asyncio.wait_for(
+                    loop.run_in_executor(
+                        executor, functools.partial(context.run, self._execute_apart, workflow, run_log)
+                    ),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                error = TimeoutError(f"Workflow {workflow.name} timed out after {timeout}s")
+                # The abandoned thread keeps writing to the original record
+                # (but not to these timings, see _execute_apart).
+                run_log = dataclasses.replace(
+                    run_log,
+                    input_data=dict(run_log.input_data),
+                    decisions=list(run_log.decisions),
+                    step_results=dict(run_log.step_results),
+                    timings=dict(timings),
+                )
+            except Exception as exc:
+                error = exc
+            else:
+                for key, seconds in worker_timings.items():
+                    timings[key] = timings.get(key, 0.0) + seconds
+            # write_log only queues, so this needn't wait for a free worker.
+            self.core.finish(run_log, error=error)
+        self._report(workflow, run_log)
+        return run_log
+
+    def _execute_apart(
+        self, workflow: Workflow, run_log: RunLog
+    ) -> Tuple[Dict[str, float], Optional[Exception]]:
+        # The worker's spans go to a dict of its own, which `arun` merges
+        # only if the run finished in time.
+        with tracer.run() as timings:
+            try:
+                self._execute(workflow, run_log)
+            except Exception as exc:
+                return timings, exc
+        return timings, None
+
+    async def run_many(
+        self,
+        runs: Iterable[Tuple[Workflow, Dict[str, Any]]],
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[RunLog]:
+        """
+        Runs a batch of (workflow, trigger_data) pairs concurrently.
+
+        At most `max_concurrency` (default: the engine's) runs are in
+        flight at once, each limited to `timeout` (see `arun`). RunLogs
+        are returned in input order.
         """
-        run_id = str(uuid.uuid4())
-        run_log = RunLog(
-            run_id=run_id,
-            workflow_name=workflow.name,
-            status="started",
-            start_time=datetime.utcnow(),
-            input_data=trigger_data
+        return await gather_bounded(
+            (
+                functools.partial(self.arun, workflow, trigger_data, timeout)
+                for workflow, trigger_data in runs
+            ),
+            max_concurrency or self.max_concurrency,
         )
 
-        try:
-            # 1. Detect (assumed to have happened to trigger this run)
-            print(f"INFO: Workflow '{workflow.name}' triggered for run_id: {run_id}")
-
-            # 2. Evaluate Policies
-            decisions = self._evaluate_policies(workflow, trigger_data)
-            run_log.decisions = decisions
-
-            # Check for any 'deny' decisions
-            if any(d.decision == 'deny' for d in decisions):
-                raise PermissionError("Workflow execution denied by policy.")
-
-            # 3. Orchestrate Actions
-            self._orchestrate_actions(workflow)
-
-            # 4. Record final status
-            run_log.status = "completed"
-
-        except Exception as e:
-            print(f"ERROR: Workflow '{workflow.name}' failed: {e}")
-            run_log.status = "failed"
-            run_log.errors.append(str(e))
-
-        finally:
-            run_log.end_time = datetime.utcnow()
-            self.run_log_writer.write_log(run_log)
-            print(f"INFO: Workflow '{workflow.name}' finished with status: {run_log.status}")
-
-    def _evaluate_policies(self, workflow: Workflow, data: Dict[str, Any]):
-        """Stub for policy evaluation step."""
-        print("INFO: Evaluating policies...")
-        decisions = []
-        for policy_id in workflow.policies:
-            policy = self.policy_registry.get(policy_id)
-            if not policy:
-                raise ValueError(f"Policy '{policy_id}' not found in registry.")
-            
-            decision = self.policy_engine.evaluate(policy, data)
-            decisions.append(decision)
-        return decisions
-
-    def _orchestrate_actions(self, workflow: Workflow):
-        """Stub for the orchestration step."""
-        print("INFO: Orchestrating actions...")
-        for step in workflow.steps:
-            print(f"  - Executing step: {step['name']} (type: {step['type']})")
-            # In a real engine, this would call connectors or other services.
-        print("INFO: Action orchestration complete.")
+    def _evaluate_policies(self, workflow: Workflow, data: Dict[str, Any], run_log: RunLog):
+        """
+        Evaluates the workflow's policies that apply to the data.
+
+        Policies that would allow whatever the data holds for their
+        missing fields are skipped (see PolicyIndex), and evaluation
+        stops at the first 'deny'. Decisions go on the run log, along
+        with how many policies were evaluated, skipped as not applicable
+        and left unevaluated after a deny.
+        """
+        log.debug("Evaluating policies for workflow '%s'", workflow.name)
+        index = self.policy_index  # one consistent registry for the whole run
+        planned, run_log.policies_skipped = index.plan_with_skipped(workflow, data)
+        for position, policy_id in enumerate(planned):
+            decision = self.policy_engine.evaluate(index.policy_registry[policy_id], data)
+            run_log.decisions.append(decision)
+            run_log.policies_evaluated += 1
+            if decision.decision == DecisionKind.DENY:
+                run_log.policies_short_circuited = len(planned) - position - 1
+                break
+
+    def _orchestrate_actions(self, workflow: Workflow, data: Dict[str, Any], run_log: RunLog):
+        """
+        Executes the workflow's steps as a DAG (see StepScheduler).
+
+        Step results go on the run log. If any step fails the run fails,
+        after every step not downstream of the failure has finished.
+        """
+        log.debug("Orchestrating actions for workflow '%s'", workflow.name)
+
+        def execute(step: Dict[str, Any], inputs: Dict[str, Any]) -> Any:
+            log.debug("Executing step: %s (type: %s)", step["name"], step["type"])
+            handler = self.step_handlers.get(step["type"])
+            if handler is None:
+                return None
+            if not tracer.enabled:
+                return handler(step=step, inputs=inputs, trigger_data=data)
+            with tracer.span("step", step["name"]):
+                return handler(step=step, inputs=inputs, trigger_data=data)
 
+        run_log.step_results = self.step_scheduler.run(workflow.steps, execute)
+        failed = [name for name, r in run_log.step_results.items() if r.status == "failed"]
+        if failed:
+            raise RuntimeError(f"Workflow steps failed: {', '.join(failed)}")
+        log.debug("Action orchestration complete for workflow '%s'", workflow.name)
@@ -1,83 +1,363 @@
-from dataclasses import dataclass
-from typing import Dict, Any, Callable, List
-
-from .observability import RunLogger
-from .policies import PolicyEngine
-from .utils import generate_run_id
-
-
-@dataclass
-class Workflow:
-    """
-    A Workflow defines a high-level orchestration pattern.
-
-    Example:
-        - Atlas checks drift
-        - Policy engine decides whether to act
-        - If yes: trigger retraining + call Intelligence Agent + notify Slack
-    """
-    name: str
-    description: str
-    handler: Callable[..., Dict[str, Any]]
-
-
-class WorkflowEngine:
-    """
-    Executes workflows and logs their runs.
-    """
-
-    def __init__(
-        self,
-        logger: RunLogger,
-        policy_engine: PolicyEngine,
-    ):
-        self.logger = logger
-        self.policy_engine = policy_engine
-        self.workflows: Dict[str, Workflow] = {}
-
-    def register_workflow(
-        self,
-        name: str,
-        description: str,
-        handler: Callable[..., Dict[str, Any]]
-    ) -> None:
-        self.workflows[name] = Workflow(
-            name=name,
-            description=description,
-            handler=handler,
-        )
-
-    def run_workflow(
-        self,
-        name: str,
-        context: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        workflow = self.workflows.get(name)
-        if not workflow:
-            raise ValueError(f"Unknown workflow: {name}")
-
-        run_id = generate_run_id(prefix=name)
-        self.logger.log_start(run_id, name, context)
-
-        try:
-            result = workflow.handler(
-                context=context,
-                policy_engine=self.policy_engine,
-                logger=self.logger,
-                run_id=run_id,
-            )
-            self.logger.log_success(run_id, result)
-            return {
-                "run_id": run_id,
-                "workflow": name,
-                "status": "SUCCESS",
-                "result": result,
-            }
-        except Exception as exc:
-            self.logger.log_failure(run_id, exc)
-            return {
-                "run_id": run_id,
-                "workflow": name,
-                "status": "FAILED",
-                "error": str(exc),
-            }
+import contextvars
+import functools
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, Hashable, Iterable, List, Optional, Tuple
+
+from .cache import TTLCache
+from .core import RunCore
+from .models import RunLog, RunStatus
+from .observability import RunLogger
+from .policies import PolicyEngine
+from .timing import tracer
+from .utils import gather_bounded, generate_run_id
+
+
+@dataclass
+class Workflow:
+    """
+    A Workflow defines a high-level orchestration pattern.
+
+    Example:
+        - Atlas checks drift
+        - Policy engine decides whether to act
+        - If yes: trigger retraining + call Intelligence Agent + notify Slack
+    """
+    name: str
+    description: str
+    handler: Callable[..., Dict[str, Any]]
+
+
+class WorkflowEngine:
+    """
+    Executes workflows and logs their runs.
+
+    `run_workflow` runs a workflow in the caller's thread. `arun_workflow`
+    and `run_many` run workflows on an asyncio event loop: async handlers
+    are awaited directly, sync handlers (and logger calls) are offloaded to
+    a thread pool of `max_concurrency` workers, and `run_many` keeps at
+    most `max_concurrency` runs in flight.
+
+    With `dedup_window_s`, runs are idempotent within that window: a run
+    is identified by the caller's `idempotency_key`, or else by the
+    workflow name and its context (ignoring `dedup_ignore_keys`, e.g. an
+    alert id or timestamp). A duplicate of an in-flight run waits for it
+    and a duplicate of a successful run returns its result; either way
+    the outcome carries the original run_id and "deduplicated": True.
+    Failed runs are not remembered, so a repeated trigger retries them.
+    Sync and async callers share completed runs but coalesce in-flight
+    runs separately.
+    """
+
+    def __init__(
+        self,
+        logger: RunLogger,
+        policy_engine: PolicyEngine,
+        max_concurrency: int = 8,
+        run_timeout_s: Optional[float] = None,
+        dedup_window_s: Optional[float] = None,
+        dedup_maxsize: int = 1024,
+        dedup_ignore_keys: Iterable[str] = (),
+    ):
+        self.logger = logger
+        self.policy_engine = policy_engine
+        self.workflows: Dict[str, Workflow] = {}
+        self.max_concurrency = max_concurrency
+        self.run_timeout_s = run_timeout_s
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.dedup_ignore_keys = frozenset(dedup_ignore_keys)
+        self._dedup: Optional[TTLCache] = None
+        if dedup_window_s is not None:
+            self._dedup = TTLCache(maxsize=dedup_maxsize, ttl_s=dedup_window_s)
+        self._inflight_async: Dict[Hashable, Any] = {}  # key -> asyncio.Future
+        self.core = RunCore(on_start=self._log_start, on_finish=self._log_finish)
+
+    def register_workflow(
+        self,
+        name: str,
+        description: str,
+        handler: Callable[..., Dict[str, Any]]
+    ) -> None:
+        self.workflows[name] = Workflow(
+            name=name,
+            description=description,
+            handler=handler,
+        )
+
+    def _get_workflow(self, name: str) -> Workflow:
+        workflow = self.workflows.get(name)
+        if not workflow:
+            raise ValueError(f"Unknown workflow: {name}")
+        return workflow
+
+    def _success(self, run_id: str, name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "run_id": run_id,
+            "workflow": name,
+            "status": "SUCCESS",
+            "result": result,
+        }
+
+    def _failure(self, run_id: str, name: str, error: str) -> Dict[str, Any]:
+        return {
+            "run_id": run_id,
+            "workflow": name,
+            "status": "FAILED",
+            "error": error,
+        }
+
+    def dedup_key(
+        self,
+        name: str,
+        context: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+    ) -> Hashable:
+        """The key identifying duplicate runs of `name` with `context`."""
+        if idempotency_key is not None:
+            return (name, idempotency_key)
+        normalized = json.dumps(
+            {k: v for k, v in context.items() if k not in self.dedup_ignore_keys},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return (name, hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest())
+
+    def run_workflow(
+        self,
+        name: str,
+        context: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        workflow = self._get_workflow(name)
+
+        with tracer.run() as timings:
+            with tracer.span("run"):
+                if self._dedup is None:
+                    outcome = self._run_workflow(workflow, name, context)
+                else:
+                    outcome = self._run_deduplicated(workflow, name, context, idempotency_key)
+        outcome["timings"] = timings
+        return outcome
+
+    def _run_deduplicated(
+        self,
+        workflow: Workflow,
+        name: str,
+        context: Dict[str, Any],
+        idempotency_key: Optional[str],
+    ) -> Dict[str, Any]:
+        ran = False
+
+        def compute() -> Dict[str, Any]:
+            nonlocal ran
+            ran = True
+            outcome = self._run_workflow(workflow, name, context)
+            if outcome["status"] != "SUCCESS":
+                raise _Unremembered(outcome)  # shared with waiters, never cached
+            return outcome
+
+        key = self.dedup_key(name, context, idempotency_key)
+        try:
+            outcome, _ = self._dedup.get_or_compute(key, compute)
+        except _Unremembered as failed:
+            outcome = failed.outcome
+        # A copy: each caller gets its own "timings".
+        return dict(outcome, deduplicated=not ran)
+
+    def _run_workflow(
+        self,
+        workflow: Workflow,
+        name: str,
+        context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        result = None
+
+        def handle(run_log: RunLog) -> None:
+            nonlocal result
+            result = workflow.handler(
+                context=context,
+                policy_engine=self.policy_engine,
+                logger=self.logger,
+                run_id=run_log.run_id,
+            )
+
+        run_log = self.core.execute(name, context, handle, run_id=generate_run_id(prefix=name))
+        return self._outcome(run_log, result)
+
+    def _outcome(self, run_log: RunLog, result: Any) -> Dict[str, Any]:
+        if run_log.status == RunStatus.COMPLETED:
+            return self._success(run_log.run_id, run_log.workflow_name, result)
+        return self._failure(run_log.run_id, run_log.workflow_name, run_log.errors[-1])
+
+    def _log_start(self, run_log: RunLog) -> None:
+        self.logger.log_start(run_log.run_id, run_log.workflow_name, run_log.input_data)
+
+    def _log_finish(self, run_log: RunLog, result: Any, error: Optional[BaseException]) -> None:
+        if error is None:
+            try:
+                self.logger.log_success(run_log.run_id, result)
+                return
+            except Exception as exc:
+                # A run whose success can't be logged is reported as failed.
+                run_log.status = RunStatus.FAILED
+                run_log.errors.append(str(exc))
+                error = exc
+        self.logger.log_failure(run_log.run_id, error)
+
+    # ------------------------------------------------------------------
+    # Asyncio execution
+    # ------------------------------------------------------------------
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="workflow",
+            )
+        return self._executor
+
+    async def _offload(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        # asyncio is already loaded whenever a coroutine runs; importing it
+        # here keeps it out of `import control_plane.workflows`.
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        # Carry context variables (e.g. the run's timings) onto the worker.
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._get_executor(), functools.partial(context.run, fn, *args, **kwargs)
+        )
+
+    async def arun_workflow(
+        self,
+        name: str,
+        context: Dict[str, Any],
+        timeout: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async counterpart of `run_workflow`.
+
+        Runs longer than `timeout` (default `run_timeout_s`) are logged and
+        returned as FAILED. A timed-out sync handler cannot be interrupted;
+        its thread finishes in the background and its result is discarded.
+        """
+        workflow = self._get_workflow(name)
+        timeout = self.run_timeout_s if timeout is None else timeout
+
+        with tracer.run() as timings:
+            with tracer.span("run"):
+                if self._dedup is None:
+                    outcome = await self._arun_workflow(workflow, name, context, timeout)
+                else:
+                    outcome = await self._arun_deduplicated(
+                        workflow, name, context, timeout, idempotency_key
+                    )
+        outcome["timings"] = timings
+        return outcome
+
+    async def _arun_deduplicated(
+        self,
+        workflow: Workflow,
+        name: str,
+        context: Dict[str, Any],
+        timeout: Optional[float],
+        idempotency_key: Optional[str],
+    ) -> Dict[str, Any]:
+        import asyncio
+
+        key = self.dedup_key(name, context, idempotency_key)
+        outcome = self._dedup.get(key)
+        if outcome is not None:
+            return dict(outcome, deduplicated=True)
+        pending = self._inflight_async.get(key)
+        if pending is not None:
+            # shield: a cancelled duplicate must not cancel the original run.
+            return dict(await asyncio.shield(pending), deduplicated=True)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_async[key] = future
+        try:
+            outcome = await self._arun_workflow(workflow, name, context, timeout)
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # retrieved: no "never retrieved" warning without waiters
+            raise
+        finally:
+            del self._inflight_async[key]
+        if outcome["status"] == "SUCCESS":
+            self._dedup.set(key, outcome)
+        future.set_result(outcome)
+        return dict(outcome, deduplicated=False)
+
+    async def _arun_workflow(
+        self,
+        workflow: Workflow,
+        name: str,
+        context: Dict[str, Any],
+        timeout: Optional[float],
+    ) -> Dict[str, Any]:
+        import asyncio
+        import inspect
+
+        run_log = await self._offload(
+            self.core.start, name, context, run_id=generate_run_id(prefix=name)
+        )
+        kwargs = dict(
+            context=context,
+            policy_engine=self.policy_engine,
+            logger=self.logger,
+            run_id=run_log.run_id,
+        )
+        if inspect.iscoroutinefunction(workflow.handler):
+            pending = workflow.handler(**kwargs)
+        else:
+            pending = self._offload(workflow.handler, **kwargs)
+
+        result, error = None, None
+        try:
+            result = await asyncio.wait_for(pending, timeout)
+        except asyncio.TimeoutError:
+            error = TimeoutError(f"Workflow {name} timed out after {timeout}s")
+        except Exception as exc:
+            error = exc
+        await self._offload(self.core.finish, run_log, result, error)
+        return self._outcome(run_log, result)
+
+    async def run_many(
+        self,
+        runs: Iterable[Tuple[str, Dict[str, Any]]],
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Runs a batch of (workflow name, context) pairs concurrently.
+
+        At most `max_concurrency` (default: the engine's) runs are in
+        flight at once. Results are returned in input order.
+        """
+        limit = max_concurrency or self.max_concurrency
+        return await gather_bounded(
+            (
+                functools.partial(self.arun_workflow, name, context, timeout)
+                for name, context in runs
+            ),
+            limit,
+        )
+
+    def shutdown(self) -> None:
+        """Releases the thread pool used by the async execution mode."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class _Unremembered(Exception):
+    """Carries a failed run's outcome out of `TTLCache.get_or_compute`."""
+
+    def __init__(self, outcome: Dict[str, Any]):
+        super().__init__(outcome.get("error"))
+        self.outcome = outcome
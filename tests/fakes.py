@@ -0,0 +1,219 @@
+"""
+Fakes of Snowflake, agents and Atlas for the tests and benchmarks.
+
+Benchmarks put this directory on `sys.path` and import it as `fakes`.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class FakeRow(tuple):
+    """A Snowpark Row: a tuple of the record's values with `as_dict()`."""
+
+    def __new__(cls, record: Dict[str, Any]):
+        row = super().__new__(cls, record.values())
+        row._record = dict(record)
+        return row
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(self._record)
+
+
+class FakeSession:
+    """
+    Stands in for a Snowpark session.
+
+    Every `sql(query, params).collect()` counts one statement in
+    `statements`, sleeps `latency_s` and returns `rows(query, params)`
+    (no rows by default). With `serial`, statements wait for each other
+    like on one real session. With `record`, `(query, params)` pairs are
+    kept in `executed`. While `failing` is set, collect() raises.
+    """
+
+    def __init__(
+        self,
+        latency_s: float = 0.0,
+        rows: Optional[Callable[[str, Optional[Sequence[Any]]], List[Any]]] = None,
+        serial: bool = False,
+        record: bool = False,
+    ):
+        self.latency_s = latency_s
+        self.rows = rows
+        self.serial = serial
+        self.executed: Optional[List[Tuple[str, Optional[Sequence[Any]]]]] = [] if record else None
+        self.failing = False
+        self.statements = 0
+        self._lock = threading.Lock()
+        self._serial_lock = threading.Lock()
+
+    def sql(self, query: str, params: Optional[Sequence[Any]] = None) -> "_FakeQuery":
+        return _FakeQuery(self, query, params)
+
+    def _collect(self, query: str, params: Optional[Sequence[Any]]) -> List[Any]:
+        with self._lock:
+            self.statements += 1
+            if self.executed is not None:
+                self.executed.append((query, params))
+        if self.serial:
+            with self._serial_lock:
+                self._wait()
+        else:
+            self._wait()
+        if self.failing:
+            raise RuntimeError("Injected session failure.")
+        return self.rows(query, params) if self.rows is not None else []
+
+    def _wait(self) -> None:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+
+class _FakeQuery:
+    __slots__ = ("_session", "_query", "_params")
+
+    def __init__(self, session: FakeSession, query: str, params: Optional[Sequence[Any]]):
+        self._session = session
+        self._query = query
+        self._params = params
+
+    def collect(self) -> List[Any]:
+        return self._session._collect(self._query, self._params)
+
+
+class FakeConnection:
+    """
+    A DB-API connection whose executemany() costs one round-trip.
+
+    With `record`, the rows of every successful executemany() are kept in
+    `rows`. While `failing` is set, executemany() raises.
+    """
+
+    def __init__(self, latency_s: float = 0.0, record: bool = False):
+        self.latency_s = latency_s
+        self.failing = False
+        self.statements = 0
+        self.commits = 0
+        self.rows: Optional[List[Any]] = [] if record else None
+
+    def cursor(self) -> "FakeConnection":
+        return self
+
+    def executemany(self, sql, rows) -> None:
+        self.statements += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        if self.failing:
+            raise RuntimeError("Injected connection failure.")
+        if self.rows is not None:
+            self.rows.extend(rows)
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class FakeAgentImpl:
+    """
+    Stand-in for an agent implementation.
+
+    `run(**kwargs)` sleeps `latency_s` plus up to `jitter_s` and echoes its
+    arguments. It fails with probability `error_rate`, and always while
+    `failing` is set. With `capacity`, each call beyond that many in
+    flight adds another `latency_s`, like an overloaded warehouse.
+    """
+
+    def __init__(
+        self,
+        latency_s: float = 0.0,
+        jitter_s: float = 0.0,
+        error_rate: float = 0.0,
+        capacity: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.error_rate = error_rate
+        self.capacity = capacity
+        self.failing = False
+        self.calls = 0
+        self._in_flight = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def run(self, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            self.calls += 1
+            self._in_flight += 1
+            overload = max(0, self._in_flight - self.capacity) if self.capacity else 0
+            delay = self.latency_s * (1 + overload) + self._rng.uniform(0, self.jitter_s)
+            fail = self.failing or self._rng.random() < self.error_rate
+        try:
+            if delay:
+                time.sleep(delay)
+            if fail:
+                raise RuntimeError("Injected agent failure.")
+            return dict(kwargs)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+class InMemoryAtlasConnector:
+    """
+    A local fake of `AtlasConnector` backed by an in-memory lineage graph.
+
+    `edges` are (input_guid, output_guid) pairs and `tags` maps a guid to
+    its classification tags. Each call sleeps `latency_s` and is counted
+    in `calls`, so caching and batching can be exercised without Atlas.
+    """
+
+    def __init__(
+        self,
+        edges: Iterable[Tuple[str, str]] = (),
+        tags: Optional[Dict[str, Iterable[str]]] = None,
+        latency_s: float = 0.0,
+    ):
+        self.inputs: Dict[str, List[str]] = {}
+        self.outputs: Dict[str, List[str]] = {}
+        for source, target in edges:
+            self.outputs.setdefault(source, []).append(target)
+            self.inputs.setdefault(target, []).append(source)
+        self.tags = {guid: list(values) for guid, values in (tags or {}).items()}
+        self.latency_s = latency_s
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _count(self) -> None:
+        with self._lock:
+            self.calls += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+    def get_asset_lineage(self, asset_id: str) -> Dict[str, Any]:
+        self._count()
+        return {
+            "asset_id": asset_id,
+            "inputs": [_entity(guid) for guid in self.inputs.get(asset_id, [])],
+            "outputs": [_entity(guid) for guid in self.outputs.get(asset_id, [])],
+        }
+
+    def get_asset_metadata(self, asset_id: str) -> Dict[str, Any]:
+        self._count()
+        return {
+            "asset_id": asset_id,
+            "name": asset_id,
+            "qualifiedName": f"db.schema.{asset_id}",
+            "tags": list(self.tags.get(asset_id, [])),
+        }
+
+
+def _entity(guid: str) -> Dict[str, Any]:
+    return {"guid": guid, "typeName": "SnowflakeTable", "qualifiedName": f"db.schema.{guid}"}
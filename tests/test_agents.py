@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from control_plane.agents import AtlasAgent
+from fakes import FakeRow, FakeSession
+
+
+def atlas_agent(session: FakeSession) -> AtlasAgent:
+    return AtlasAgent("atlas", "", session, retrain_cooldown_s=60)
+
+
+def test_trigger_retrain_is_deduplicated_per_model():
+    session = FakeSession(rows=lambda query, params: [FakeRow({"STATUS": "queued"})])
+    agent = atlas_agent(session)
+
+    first = agent.run("trigger_retrain", model="fraud")
+    again = agent.run("trigger_retrain", model="fraud")
+    other = agent.run("trigger_retrain", model="churn")
+
+    assert first["result"] == [{"STATUS": "queued"}]
+    assert (first["deduplicated"], again["deduplicated"], other["deduplicated"]) == (False, True, False)
+    assert session.statements == 2
+
+
+def test_trigger_retrain_without_a_model_always_calls():
+    session = FakeSession(rows=lambda query, params: [])
+    agent = atlas_agent(session)
+
+    results = [agent.run("trigger_retrain") for _ in range(3)]
+
+    assert [result["deduplicated"] for result in results] == [False, False, False]
+    assert session.statements == 3
+
+
+def drift_rows(query, params):
+    return [FakeRow({"MODEL": "fraud", "DRIFT": 0.2}), FakeRow({"MODEL": "churn", "DRIFT": 0.05})]
+
+
+def test_check_drift_result_still_reads_like_a_list_of_rows():
+    agent = AtlasAgent("atlas", "", FakeSession(rows=drift_rows))
+    result = agent.run("check_drift")["result"]
+
+    assert result[0]["DRIFT"] == 0.2
+    assert result[-1] == {"MODEL": "churn", "DRIFT": 0.05}
+    assert result[:1] == [{"MODEL": "fraud", "DRIFT": 0.2}]
+    assert len(result) == 2 and list(result) == result.to_rows()
+    assert result == [row.as_dict() for row in drift_rows(None, None)]
+    assert result.column("DRIFT") == (0.2, 0.05)
+    with pytest.raises(IndexError):
+        result[2]
+
+
+def test_concurrent_check_drift_callers_share_one_call():
+    session = FakeSession(latency_s=0.05, rows=drift_rows)
+    agent = AtlasAgent("atlas", "", session, drift_freshness_s=60)
+    barrier = threading.Barrier(8)
+    outputs = []
+
+    def check():
+        barrier.wait()
+        outputs.append(agent.run("check_drift"))
+
+    threads = [threading.Thread(target=check) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert session.statements == 1
+    assert sorted(output["cached"] for output in outputs) == [False] + [True] * 7
+    assert len({id(output["result"]) for output in outputs}) == 1
+
+    agent.run("check_drift")  # still fresh
+    assert session.statements == 1
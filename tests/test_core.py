@@ -0,0 +1,94 @@
+import pytest
+
+from control_plane.core import RunCore
+from control_plane.models import RunStatus
+from control_plane.observability import RunLogger
+from control_plane.policies import PolicyEngine
+from control_plane.timing import tracer
+from control_plane.workflows import WorkflowEngine
+from fakes import FakeSession
+
+
+class Hooks:
+    def __init__(self):
+        self.events = []
+
+    def on_start(self, run_log):
+        self.events.append(("start", run_log.run_id, run_log.status))
+
+    def on_finish(self, run_log, result, error):
+        self.events.append(("finish", run_log.run_id, run_log.status, result, error))
+
+
+def test_start_creates_the_record_and_calls_on_start():
+    hooks = Hooks()
+    core = RunCore(on_start=hooks.on_start, on_finish=hooks.on_finish)
+    timings = {}
+
+    run_log = core.start("fraud_drift", {"drift": 0.2}, run_id="run_1", timings=timings)
+
+    assert (run_log.run_id, run_log.workflow_name, run_log.status) == ("run_1", "fraud_drift", RunStatus.STARTED)
+    assert run_log.input_data == {"drift": 0.2}
+    assert run_log.timings is timings
+    assert run_log.end_time is None
+    assert hooks.events == [("start", "run_1", RunStatus.STARTED)]
+    assert core.start("fraud_drift", {}).run_id != core.start("fraud_drift", {}).run_id
+
+
+def test_finish_sets_status_end_time_and_errors():
+    hooks = Hooks()
+    core = RunCore(on_finish=hooks.on_finish)
+    error = RuntimeError("boom")
+
+    completed = core.finish(core.start("a", {}, run_id="ok"), result={"n": 1})
+    failed = core.finish(core.start("a", {}, run_id="bad"), error=error)
+
+    assert completed.status == RunStatus.COMPLETED and completed.errors == []
+    assert failed.status == RunStatus.FAILED and failed.errors == ["boom"]
+    assert completed.end_time >= completed.start_time
+    assert hooks.events == [
+        ("finish", "ok", RunStatus.COMPLETED, {"n": 1}, None),
+        ("finish", "bad", RunStatus.FAILED, None, error),
+    ]
+
+
+def test_execute_records_body_errors_but_raises_hook_errors():
+    core = RunCore()
+
+    completed = core.execute("a", {}, lambda run_log: run_log.errors.append("note") or "done")
+    failed = core.execute("a", {}, lambda run_log: 1 / 0)
+
+    assert completed.status == RunStatus.COMPLETED and completed.errors == ["note"]
+    assert failed.status == RunStatus.FAILED and "division by zero" in failed.errors[-1]
+
+    def broken_hook(run_log):
+        raise ConnectionError("log store down")
+
+    with pytest.raises(ConnectionError):
+        RunCore(on_start=broken_hook).execute("a", {}, lambda run_log: None)
+
+
+def test_hooks_are_timed_as_log_write():
+    core = RunCore(on_start=lambda run_log: None, on_finish=lambda *args: None)
+
+    with tracer.run() as timings:
+        core.execute("a", {}, lambda run_log: None, timings=timings)
+
+    assert "log_write" in timings
+
+
+class SuccessNotLogged(RunLogger):
+    def log_success(self, run_id, result):
+        raise ConnectionError("run log table unavailable")
+
+
+def test_success_that_cannot_be_logged_is_reported_as_failed():
+    session = FakeSession(record=True)
+    engine = WorkflowEngine(SuccessNotLogged(session=session, run_log_table="RUN_LOG"), PolicyEngine({}))
+    engine.register_workflow("retrain", "", lambda **kwargs: {"ok": True})
+
+    outcome = engine.run_workflow("retrain", {})
+
+    assert outcome["status"] == "FAILED"
+    assert outcome["error"] == "run log table unavailable"
+    assert [params[2] for _, params in session.executed] == ["START", "FAILED"]
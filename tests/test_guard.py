@@ -0,0 +1,266 @@
+import threading
+
+import pytest
+
+from control_plane.agents import IntelligenceAgent
+from control_plane.cache import TTLCache
+from control_plane.guard import (
+    CLOSED, HALF_OPEN, OPEN, AdaptiveLimit, CircuitBreaker, CircuitOpenError, Guard,
+    GuardedConnector, OverloadedError,
+)
+from fakes import FakeAgentImpl, InMemoryAtlasConnector
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Flaky:
+    """Fails the first `failures` calls, then echoes its argument."""
+
+    def __init__(self, failures: int, error: type = RuntimeError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, value):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("boom")
+        return value
+
+
+def make_guard(**kwargs) -> Guard:
+    kwargs.setdefault("sleep", lambda seconds: None)
+    return Guard("test", **kwargs)
+
+
+# ----------------------------------------------------------------------
+# AdaptiveLimit
+# ----------------------------------------------------------------------
+
+def test_limit_grows_additively_on_fast_successes():
+    clock = Clock()
+    limit = AdaptiveLimit(initial=4, max_limit=6, target_latency_s=1.0, clock=clock)
+    for _ in range(4):
+        limit.release(limit.acquire(), ok=True)
+    assert limit.limit == 4  # 4 + 4 * 1/limit stays just below 5
+
+    for _ in range(100):
+        limit.release(limit.acquire(), ok=True)
+    assert limit.limit == 6
+
+
+def test_limit_halves_once_per_round_trip():
+    clock = Clock()
+    limit = AdaptiveLimit(initial=16, target_latency_s=1.0, clock=clock)
+    starts = [limit.acquire() for _ in range(3)]
+    clock.now = 5.0  # every call was slow
+    for started in starts:
+        limit.release(started, ok=False)
+    assert limit.limit == 8
+
+    limit.release(limit.acquire(), ok=False)  # started after the cut
+    assert limit.limit == 4
+
+
+def test_limit_ignores_calls_without_a_verdict_and_respects_the_floor():
+    limit = AdaptiveLimit(initial=2, min_limit=2, clock=Clock())
+    limit.release(limit.acquire(), ok=None)
+    assert limit.limit == 2
+    limit.release(limit.acquire(), ok=False)
+    assert limit.limit == 2
+    assert limit.in_flight == 0
+
+
+def test_limit_sheds_callers_beyond_it():
+    limit = AdaptiveLimit(initial=1)
+    started = limit.acquire()
+    with pytest.raises(OverloadedError):
+        limit.acquire(timeout=0.01)
+
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(limit.acquire(timeout=5)))
+    waiter.start()
+    limit.release(started, ok=True)
+    waiter.join()
+    assert len(acquired) == 1
+
+
+def test_limit_rejects_bad_bounds():
+    with pytest.raises(ValueError):
+        AdaptiveLimit(initial=0)
+    with pytest.raises(ValueError):
+        AdaptiveLimit(decrease=1.0)
+
+
+# ----------------------------------------------------------------------
+# CircuitBreaker
+# ----------------------------------------------------------------------
+
+def test_breaker_opens_then_lets_one_trial_through():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout_s=10, clock=clock)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial at a time
+
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_failed_trial_reopens_the_circuit():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    clock.now = 19
+    assert not breaker.allow()
+    clock.now = 20
+    assert breaker.allow()
+
+
+def test_released_trial_frees_the_slot():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=1, clock=clock)
+    breaker.record_failure()
+    clock.now = 1
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, clock=Clock())
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+# ----------------------------------------------------------------------
+# Guard
+# ----------------------------------------------------------------------
+
+def test_guard_retries_with_capped_backoff():
+    sleeps = []
+    guard = make_guard(retries=3, backoff_s=1.0, max_backoff_s=3.0, sleep=sleeps.append)
+    guard._rng.uniform = lambda low, high: high
+    fn = Flaky(failures=3)
+
+    value, info = guard.call(fn, "ok")
+
+    assert value == "ok" and fn.calls == 4
+    assert sleeps == [1.0, 2.0, 3.0]
+    # each failed attempt started after the previous cut: 8 -> 1, then +1
+    assert info == {"guard": "test", "state": CLOSED, "limit": 2, "attempts": 4, "fallback": False}
+    assert guard.stats["retries"] == 3 and guard.stats["succeeded"] == 1
+
+
+def test_guard_raises_after_the_last_retry():
+    guard = make_guard(retries=1)
+    fn = Flaky(failures=5)
+    with pytest.raises(RuntimeError):
+        guard.call(fn, "ok")
+    assert fn.calls == 2
+    assert guard.stats["failed"] == 1
+
+
+def test_guard_never_retries_non_idempotent_calls():
+    guard = make_guard(retries=3)
+    fn = Flaky(failures=1)
+    with pytest.raises(RuntimeError):
+        guard.call(fn, "ok", idempotent=False)
+    assert fn.calls == 1
+
+
+def test_guard_only_retries_retry_on_errors():
+    guard = make_guard(retries=3, retry_on=(TimeoutError,))
+    fn = Flaky(failures=1, error=KeyError)
+    with pytest.raises(KeyError):
+        guard.call(fn, "ok")
+    assert fn.calls == 1
+    assert guard.breaker.state == CLOSED and guard.limit.in_flight == 0
+
+
+def test_guard_serves_the_fallback_while_the_circuit_is_open():
+    guard = make_guard(
+        retries=0,
+        breaker=CircuitBreaker(failure_threshold=1, reset_timeout_s=60),
+        fallback=TTLCache(maxsize=8, ttl_s=60),
+    )
+    assert guard.call(lambda: "fresh", cache_key="q")[0] == "fresh"
+
+    value, info = guard.call(Flaky(failures=1), "ignored", cache_key="q")
+    assert value == "fresh" and info["fallback"] and info["state"] == OPEN
+
+    fn = Flaky(failures=0)
+    value, info = guard.call(fn, "ignored", cache_key="q")
+    assert value == "fresh" and fn.calls == 0
+    with pytest.raises(CircuitOpenError):
+        guard.call(fn, "x", cache_key="unknown")
+    assert guard.stats["rejected"] == 2 and guard.stats["fallbacks"] == 2
+
+
+def test_guard_snapshot():
+    guard = make_guard()
+    guard.call(lambda: None)
+    snapshot = guard.snapshot()
+    assert snapshot["calls"] == 1 and snapshot["succeeded"] == 1
+    assert snapshot["state"] == CLOSED and snapshot["in_flight"] == 0
+
+
+def test_guarded_connector_falls_back_per_call():
+    connector = InMemoryAtlasConnector([("raw", "clean")])
+    guard = make_guard(retries=0, fallback=TTLCache(maxsize=8, ttl_s=60))
+    guarded = GuardedConnector(connector, guard)
+    lineage = guarded.get_asset_lineage("clean")
+
+    connector.get_asset_lineage = Flaky(failures=1)
+    assert guarded.get_asset_lineage("clean") == lineage
+    assert guarded.latency_s == 0.0
+
+
+# ----------------------------------------------------------------------
+# IntelligenceAgent with a guard
+# ----------------------------------------------------------------------
+
+def test_agent_results_carry_guard_info():
+    impl = FakeAgentImpl()
+    agent = IntelligenceAgent("intelligence", "", None, impl, guard=make_guard())
+    output = agent.run("how many runs?")
+    assert output["result"] == {"query": "how many runs?"}
+    assert output["guard"]["attempts"] == 1 and not output["guard"]["fallback"]
+
+
+def test_agent_fallback_is_not_cached_as_fresh():
+    impl = FakeAgentImpl()
+    guard = make_guard(retries=0, fallback=TTLCache(maxsize=8, ttl_s=60))
+    cache = TTLCache(maxsize=8, ttl_s=60)
+    agent = IntelligenceAgent("intelligence", "", None, impl, cache=cache, guard=guard)
+    agent.run("drift?")
+    cache.invalidate()
+
+    impl.failing = True
+    output = agent.run("drift?")
+    assert output["result"] == {"query": "drift?"} and output["guard"]["fallback"]
+
+    impl.failing = False
+    output = agent.run("drift?")
+    assert not output["cached"] and not output["guard"]["fallback"]
+    assert impl.calls == 3
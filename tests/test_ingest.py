@@ -0,0 +1,169 @@
+import json
+import queue
+import threading
+import time
+
+from control_plane.ingest import JsonlFileSource, QueueSource, TriggerPipeline
+from control_plane.registry import ControlPlaneRegistry
+
+
+def registry_with(**entrypoints) -> ControlPlaneRegistry:
+    registry = ControlPlaneRegistry()
+    for name, entrypoint in entrypoints.items():
+        registry.register_workflow(name, "", entrypoint)
+    return registry
+
+
+def write_events(path, events, mode="w") -> None:
+    with open(path, mode) as f:
+        for event in events:
+            f.write(event if isinstance(event, str) else json.dumps(event) + "\n")
+
+
+def wait_until(predicate, timeout=5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_last_line_without_newline_is_read_when_not_following(tmp_path):
+    path = tmp_path / "events.jsonl"
+    write_events(path, [{"n": 1}, '{"n": 2}'])
+    items = list(JsonlFileSource(str(path)))
+    assert items == [(9, {"n": 1}), (path.stat().st_size, {"n": 2})]
+
+
+def test_following_waits_for_the_rest_of_a_line(tmp_path):
+    path = tmp_path / "events.jsonl"
+    write_events(path, [{"n": 1}, '{"n": '])
+    source = JsonlFileSource(str(path), follow=True, poll_interval_s=0.01)
+    items = iter(source)
+    assert next(items)[1] == {"n": 1}
+
+    threading.Timer(0.05, write_events, (path, ["2}\n"], "a")).start()
+    assert next(items)[1] == {"n": 2}
+    source.stop()
+
+
+def test_invalid_and_unroutable_events_are_counted_and_committed(tmp_path):
+    path = tmp_path / "events.jsonl"
+    write_events(path, [
+        {"workflow": "drift", "context": {"model": "fraud"}},
+        "not json\n",
+        "[1, 2]\n",
+        {"workflow": "unknown"},
+        {"type": "drift_alert"},
+        "x" * 100 + "\n",
+        {"workflow": "drift"},
+    ])
+    contexts = []
+    pipeline = TriggerPipeline(
+        JsonlFileSource(str(path), max_line_bytes=64),
+        registry_with(drift=contexts.append),
+        routes={"drift_alert": "drift"},
+    )
+    stats = pipeline.run()
+
+    assert stats == {"routed": 3, "succeeded": 3, "failed": 0, "unroutable": 1, "invalid": 3}
+    assert contexts[0] == {"model": "fraud"}
+    assert contexts[1] == {"type": "drift_alert"}
+    assert pipeline.committed_offset == path.stat().st_size
+
+
+def test_failed_status_counts_as_failed():
+    events = queue.Queue()
+    for event in ({"workflow": "ok"}, {"workflow": "bad"}, {"workflow": "boom"}, None):
+        events.put(event)
+
+    def boom(context):
+        raise RuntimeError("boom")
+
+    pipeline = TriggerPipeline(
+        QueueSource(events, poll_interval_s=0.01),
+        registry_with(
+            ok=lambda context: {"status": "SUCCESS"},
+            bad=lambda context: {"status": "FAILED", "error": "no model"},
+            boom=boom,
+        ),
+    )
+    stats = pipeline.run()
+    assert (stats["succeeded"], stats["failed"]) == (1, 2)
+
+
+def test_reader_blocks_when_max_in_flight_events_are_running():
+    events = queue.Queue()
+    for _ in range(10):
+        events.put({"workflow": "slow"})
+    events.put(None)
+    release = threading.Event()
+    running = []
+
+    def slow(context):
+        running.append(1)
+        release.wait(5)
+
+    pipeline = TriggerPipeline(
+        QueueSource(events, poll_interval_s=0.01),
+        registry_with(slow=slow),
+        workers=4,
+        max_in_flight=2,
+    )
+    pipeline.start()
+    assert wait_until(lambda: len(running) == 2)
+    time.sleep(0.05)
+    assert len(running) == 2
+    assert events.qsize() >= 11 - 3  # two running, at most one read and waiting
+
+    release.set()
+    assert wait_until(lambda: pipeline.committed_offset == 10)
+    pipeline.stop()
+    assert pipeline.stats["succeeded"] == 10
+
+
+def test_watermark_waits_for_earlier_events_finishing_out_of_order():
+    events = queue.Queue()
+    gates = {"first": threading.Event(), "second": threading.Event()}
+    finished = []
+
+    def run(context):
+        gates[context["name"]].wait(5)
+        finished.append(context["name"])
+
+    pipeline = TriggerPipeline(
+        QueueSource(events, poll_interval_s=0.01), registry_with(run=run), workers=2
+    )
+    pipeline.start()
+    events.put({"workflow": "run", "context": {"name": "first"}})
+    events.put({"workflow": "run", "context": {"name": "second"}})
+
+    gates["second"].set()
+    assert wait_until(lambda: finished == ["second"])
+    assert pipeline.committed_offset == 0
+
+    gates["first"].set()
+    assert wait_until(lambda: pipeline.committed_offset == 2)
+    events.put(None)
+    pipeline.stop()
+
+
+def test_restart_resumes_from_the_checkpoint(tmp_path):
+    path = tmp_path / "events.jsonl"
+    checkpoint = tmp_path / "checkpoint.json"
+    write_events(path, [{"workflow": "count", "context": {"n": n}} for n in range(5)])
+    seen = []
+    registry = registry_with(count=lambda context: seen.append(context["n"]))
+
+    TriggerPipeline(JsonlFileSource(str(path)), registry, checkpoint_path=str(checkpoint)).run()
+    assert json.loads(checkpoint.read_text()) == {"offset": path.stat().st_size}
+
+    write_events(path, [{"workflow": "count", "context": {"n": n}} for n in (5, 6)], mode="a")
+    stats = TriggerPipeline(
+        JsonlFileSource(str(path)), registry, checkpoint_path=str(checkpoint), checkpoint_every=1
+    ).run()
+
+    assert stats["succeeded"] == 2
+    assert sorted(seen) == list(range(7))
+    assert json.loads(checkpoint.read_text()) == {"offset": path.stat().st_size}
@@ -0,0 +1,107 @@
+import threading
+
+from control_plane.connectors.lineage_cache import LineageCache
+from fakes import InMemoryAtlasConnector
+
+# raw -> staged -> clean -> report, with a second source feeding clean
+EDGES = [("raw", "staged"), ("staged", "clean"), ("lookup", "clean"), ("clean", "report")]
+TAGS = {"raw": ["PII"], "lookup": ["Finance"], "report": ["Gold"]}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(**kwargs):
+    connector = InMemoryAtlasConnector(EDGES, TAGS)
+    return connector, LineageCache(connector, **kwargs)
+
+
+def test_transitive_upstream_and_downstream_nearest_first():
+    _, cache = make_cache()
+    assert cache.upstream("report") == ["clean", "staged", "lookup", "raw"]
+    assert cache.upstream("report", max_depth=1) == ["clean"]
+    assert cache.downstream("raw") == ["staged", "clean", "report"]
+    assert cache.downstream("report") == []
+    assert cache.lineage("clean") == (("staged", "lookup"), ("report",))
+
+
+def test_tags_propagate_from_upstream_assets():
+    _, cache = make_cache()
+    assert cache.tags("raw") == frozenset({"PII"})
+    assert cache.upstream_tags("report") == {"Gold": ["report"], "Finance": ["lookup"], "PII": ["raw"]}
+    assert cache.upstream_with_tag("report", "PII") == ["raw"]
+    assert cache.upstream_with_tag("report", "PII", max_depth=2) == []
+    assert cache.upstream_with_tag("lookup", "PII") == []
+
+
+def test_warm_cache_makes_no_calls():
+    connector, cache = make_cache()
+    cache.upstream_tags("report")
+    calls = connector.calls
+    assert calls == 5 + 5  # lineage and metadata of every asset in the walk
+
+    assert cache.upstream_with_tag("report", "PII") == ["raw"]
+    assert cache.downstream("staged") == ["clean", "report"]
+    assert connector.calls == calls
+
+
+def test_each_level_is_fetched_once_as_a_batch():
+    connector, cache = make_cache(max_workers=4)
+    cache.prefetch(["raw", "staged", "raw", "lookup"], metadata=False)
+    assert connector.calls == 3  # duplicates are fetched once
+
+    cache.prefetch(["raw", "clean"])
+    assert connector.calls == 3 + 1 + 2  # clean's lineage, then both metadata
+    cache.shutdown()
+
+
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    connector, cache = make_cache(ttl_s=10, clock=clock)
+    cache.upstream("clean")
+    calls = connector.calls
+
+    clock.now = 9
+    cache.upstream("clean")
+    assert connector.calls == calls
+
+    clock.now = 11
+    cache.upstream("clean")
+    assert connector.calls == 2 * calls
+
+
+def test_invalidate_refetches_changed_lineage():
+    connector, cache = make_cache()
+    assert cache.upstream("report") == ["clean", "staged", "lookup", "raw"]
+
+    connector.inputs["report"].append("manual")
+    assert cache.upstream("report", max_depth=1) == ["clean"]
+    cache.invalidate("report")
+    assert cache.upstream("report", max_depth=1) == ["clean", "manual"]
+    assert cache.stats()["lineage"]["hits"] > 0
+
+
+def test_concurrent_misses_share_one_connector_call():
+    connector = InMemoryAtlasConnector(EDGES, TAGS, latency_s=0.05)
+    cache = LineageCache(connector)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def lookup():
+        barrier.wait()
+        results.append(cache.lineage("clean"))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [(("staged", "lookup"), ("report",))] * 8
+    assert connector.calls == 1
+    assert cache.stats()["lineage"]["coalesced"] == 7
@@ -0,0 +1,59 @@
+import io
+import json
+import logging
+import queue
+
+from control_plane import logs
+
+
+def test_json_lines_carry_message_and_extra_fields():
+    stream = io.StringIO()
+    logs.configure_logging(stream=stream)
+    try:
+        logging.getLogger("control_plane.test").info(
+            "Workflow %s started", "fraud", extra={"run_id": "run_1"}
+        )
+    finally:
+        logs.shutdown_logging()
+    event = json.loads(stream.getvalue())
+    assert event["message"] == "Workflow fraud started"
+    assert event["run_id"] == "run_1" and event["level"] == "INFO"
+
+
+def test_mutable_args_are_logged_as_they_were_at_the_call():
+    handler = logs._DeferredQueueHandler(queue.Queue())
+    context = {"observed_drift": 0.1}
+    steps = ["check"]
+    record = logging.LogRecord(
+        "control_plane.test", logging.INFO, __file__, 1, "context %s steps %s", (context, steps), None
+    )
+    handler.handle(record)
+
+    context["observed_drift"] = 0.9
+    context["model"] = "fraud"
+    steps.append("retrain")
+    queued = handler.queue.get_nowait()
+    assert queued.getMessage() == "context {'observed_drift': 0.1} steps ['check']"
+
+
+def test_mutable_extra_fields_are_copied():
+    handler = logs._DeferredQueueHandler(queue.Queue())
+    result = {"status": "started"}
+    logger = logging.getLogger("control_plane.test.extra")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        logger.warning("run finished", extra={"result": result})
+    finally:
+        logger.removeHandler(handler)
+    result["status"] = "failed"
+    result["late"] = True
+    assert handler.queue.get_nowait().result == {"status": "started"}
+
+
+def test_full_queue_drops_and_counts():
+    handler = logs._DeferredQueueHandler(queue.Queue(maxsize=1))
+    before = logs._DeferredQueueHandler.dropped
+    for _ in range(3):
+        handler.handle(logging.LogRecord("control_plane", logging.INFO, __file__, 1, "x", None, None))
+    assert logs._DeferredQueueHandler.dropped - before == 2
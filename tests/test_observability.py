@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from control_plane.history import RecentRuns
+from control_plane.observability import RunLogger
+from fakes import FakeSession
+
+
+def _rows(params):
+    """A MERGE's bind values as (RUN_ID, WORKFLOW, STATUS, DETAILS) rows."""
+    return [tuple(params[i:i + 4]) for i in range(0, len(params), 4)]
+
+
+def test_direct_mode_merges_each_event_with_binds():
+    session = FakeSession(record=True)
+    logger = RunLogger(session=session, run_log_table="RUN_LOG")
+
+    logger.log_start("run_1", "fraud", {"observed_drift": 0.2})
+    logger.log_success("run_1", {"should_act": True})
+
+    assert session.statements == 2
+    (start_sql, start_params), (success_sql, success_params) = session.executed
+    assert start_sql == success_sql  # one statement text, reused
+    assert "run_1" not in start_sql and "0.2" not in start_sql
+    assert _rows(start_params) == [("run_1", "fraud", "START", '{"observed_drift":0.2}')]
+    assert _rows(success_params) == [("run_1", None, "SUCCESS", '{"should_act":true}')]
+
+
+def test_buffered_mode_coalesces_runs_into_one_merge():
+    session = FakeSession(record=True)
+    logger = RunLogger(session=session, run_log_table="RUN_LOG", buffered=True, flush_interval_s=60)
+    try:
+        for i in range(3):
+            logger.log_start(f"run_{i}", "fraud", {"i": i})
+        logger.log_success("run_0", {"ok": True})
+        logger.log_failure("run_1", ValueError("boom"))
+        assert session.statements == 0
+        assert logger.pending() == 3
+
+        assert logger.flush() == 3
+    finally:
+        logger.close()
+
+    assert session.statements == 1
+    rows = _rows(session.executed[0][1])
+    assert [row[:3] for row in rows] == [
+        ("run_0", "fraud", "SUCCESS"),
+        ("run_1", "fraud", "FAILED"),
+        ("run_2", "fraud", "START"),
+    ]
+    assert json.loads(rows[1][3]) == {"error": "boom"}
+
+
+def test_buffered_mode_flushes_on_size_and_close():
+    session = FakeSession()
+    logger = RunLogger(
+        session=session, run_log_table="RUN_LOG", buffered=True,
+        max_batch_size=2, flush_interval_s=60,
+    )
+    logger.log_start("run_1", "fraud", {})
+    logger.log_start("run_2", "fraud", {})  # fills a batch: wakes the flusher
+    logger.log_start("run_3", "fraud", {})
+    logger.close()
+
+    assert logger.pending() == 0
+    assert session.statements >= 2
+
+
+def test_failed_flush_requeues_rows_for_redelivery():
+    session = FakeSession(record=True)
+    logger = RunLogger(session=session, run_log_table="RUN_LOG", buffered=True, flush_interval_s=60)
+    try:
+        logger.log_start("run_1", "fraud", {})
+        session.failing = True
+        with pytest.raises(RuntimeError):
+            logger.flush()
+        assert logger.pending() == 1
+
+        logger.log_success("run_1", {"ok": True})
+        session.failing = False
+        assert logger.flush() == 1
+    finally:
+        logger.close()
+
+    rows = _rows(session.executed[-1][1])
+    assert [row[:3] for row in rows] == [("run_1", "fraud", "SUCCESS")]
+
+
+def test_finished_runs_are_recorded_in_history():
+    history = RecentRuns()
+    logger = RunLogger(session=None, run_log_table="RUN_LOG", history=history)
+
+    logger.log_start("run_1", "fraud", {})
+    logger.log_failure("run_1", RuntimeError("down"))
+
+    [run] = history.runs(workflow="fraud")
+    assert (run.run_id, run.status, run.errors) == ("run_1", "failed", ["down"])
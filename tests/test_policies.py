@@ -0,0 +1,78 @@
+import math
+from datetime import datetime
+
+import pytest
+
+from control_plane.history import RecentRuns
+from control_plane.models import RunLog, RunStatus
+from control_plane.policies import Policy, PolicyEngine
+
+np = pytest.importorskip("numpy")
+
+POLICIES = {
+    "drift": Policy("drift", "", {"max_drift": 0.15}, ["trigger_retrain"]),
+    "rate": Policy("rate", "", {"max_runs": 2, "window_s": 600}, ["throttle"]),
+    "both": Policy("both", "", {"max_drift": 0.3, "max_runs": 3}, ["page"]),
+    "other": Policy("other", "", {"risk_level": "high"}, ["review"]),
+    "none": Policy("none", "", {}, ["noop"]),
+}
+
+CONTEXTS = [
+    {"observed_drift": 0.2},
+    {"observed_drift": 0.1},
+    {"observed_drift": 1},
+    {"observed_drift": float("nan")},
+    {"observed_drift": None},
+    {},
+    {"workflow": "busy"},
+    {"workflow": "quiet"},
+    {"workflow": "busy", "observed_drift": 0.05},
+    {"workflow": "busy", "observed_drift": float("nan")},
+    {"workflow": "quiet", "observed_drift": None},
+]
+
+
+@pytest.fixture
+def engine():
+    history = RecentRuns()
+    now = datetime.utcnow()
+    for i in range(3):
+        history.record(RunLog(f"run_{i}", "busy", RunStatus.COMPLETED, now, now))
+    history.record(RunLog("run_q", "quiet", RunStatus.COMPLETED, now, now))
+    return PolicyEngine(POLICIES, history=history)
+
+
+def _columnar(contexts):
+    keys = {key for context in contexts for key in context}
+    return {key: [context.get(key) for context in contexts] for key in keys}
+
+
+@pytest.mark.parametrize("name", list(POLICIES) + ["missing"])
+@pytest.mark.parametrize("layout", ["rows", "columns"])
+def test_batch_matches_evaluate_row_for_row(engine, name, layout):
+    contexts = CONTEXTS if layout == "rows" else _columnar(CONTEXTS)
+    batch = engine.evaluate_batch(name, contexts, reasons="all")
+
+    for row, context in enumerate(CONTEXTS):
+        expected = engine.evaluate(name, context)
+        assert batch["should_act"][row] == expected["should_act"], (row, context)
+        assert tuple(batch["actions"][row]) == tuple(expected["actions"]), (row, context)
+        assert batch["reason"][row] == expected["reason"], (row, context)
+
+
+def test_nan_drift_is_within_threshold(engine):
+    batch = engine.evaluate_batch("drift", {"observed_drift": np.array([math.nan, 0.5])}, reasons="all")
+
+    assert batch["should_act"].tolist() == [False, True]
+    assert batch["reason"][0] == "Observed drift nan is within threshold 0.15."
+
+
+def test_policy_key_is_a_deprecated_alias_for_the_policy(engine):
+    result = engine.evaluate("drift", {"observed_drift": 0.5})
+
+    with pytest.warns(DeprecationWarning, match="policy_name"):
+        assert result["policy"] is engine.get_policy("drift")
+    with pytest.warns(DeprecationWarning):
+        assert engine.evaluate("missing", {})["policy"] is None
+    assert "policy" not in result
+    assert list(result) == ["policy_name", "should_act", "actions", "reason"]
@@ -0,0 +1,53 @@
+from control_plane.models import Policy, Workflow
+from control_plane.policy_engine import PolicyEngine
+from control_plane.policy_index import PolicyIndex
+
+
+def policy(policy_id, *rules):
+    return Policy(policy_id, policy_id, "", list(rules))
+
+
+REGISTRY = {
+    "drift_cap": policy("drift_cap", {"field": "drift", "op": "le", "value": 0.3}),
+    "no_pii": policy("no_pii", {"not": {"field": "pii", "op": "exists"}}),
+    "owner_set": policy("owner_set", {"field": "owner", "op": "exists"}),
+    "always": policy("always"),
+}
+
+WORKFLOW = Workflow(
+    workflow_id="wf_1",
+    name="fraud_drift",
+    description="",
+    steps=[],
+    policies=["always", "no_pii", "drift_cap", "owner_set", "drift_cap"],
+)
+
+
+def test_policy_whose_fields_are_absent_and_allows_empty_data_is_skipped():
+    index = PolicyIndex(PolicyEngine(), REGISTRY)
+
+    planned, skipped = index.plan_with_skipped(WORKFLOW, {"drift": 0.1})
+
+    # no_pii allows {} and reads only "pii": nothing to evaluate.
+    assert "no_pii" not in planned
+    assert skipped == 1
+
+
+def test_policy_that_acts_on_empty_data_is_not_skipped():
+    index = PolicyIndex(PolicyEngine(), REGISTRY)
+
+    planned, skipped = index.plan_with_skipped(WORKFLOW, {})
+
+    # drift_cap and owner_set deny {}; skipping them would turn a deny into an allow.
+    assert planned == ["always", "drift_cap", "owner_set"]
+    assert skipped == 1
+
+
+def test_present_field_makes_policy_a_candidate_in_workflow_order():
+    index = PolicyIndex(PolicyEngine(), REGISTRY)
+
+    planned, skipped = index.plan_with_skipped(WORKFLOW, {"pii": True, "owner": "ml", "drift": 0.1})
+
+    assert planned == ["always", "no_pii", "drift_cap", "owner_set"]
+    assert skipped == 0
+    assert index.plan(WORKFLOW, {"pii": True}) == ["always", "no_pii", "drift_cap", "owner_set"]
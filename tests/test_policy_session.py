@@ -0,0 +1,84 @@
+from control_plane.policies import Policy, PolicyEngine
+
+
+def drift_policies(limits, **extra):
+    policies = {
+        f"drift_{limit}": Policy(f"drift_{limit}", "", {"max_drift": limit}, ["retrain"])
+        for limit in limits
+    }
+    policies.update(extra)
+    return policies
+
+
+class CountingEngine(PolicyEngine):
+    """Records which policies the session re-evaluates."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.evaluated = []
+
+    def evaluate_untraced(self, policy_name, context):
+        self.evaluated.append(policy_name)
+        return super().evaluate_untraced(policy_name, context)
+
+
+def test_public_hooks_describe_policy_inputs():
+    engine = PolicyEngine({
+        "drift": Policy("drift", "", {"max_drift": 0.2}, []),
+        "rate": Policy("rate", "", {"max_runs": 3, "window_s": 60}, []),
+        "both": Policy("both", "", {"max_drift": 0.2, "max_runs": 3}, []),
+    })
+
+    assert engine.condition_keys("drift") == {"max_drift": "observed_drift"}
+    assert engine.condition_keys("rate") == {"max_runs": "workflow"}
+    assert engine.condition_keys("missing") == {}
+    assert engine.threshold("drift") == ("observed_drift", 0.2)
+    assert engine.threshold("rate") is None
+    assert engine.threshold("both") is None
+    assert engine.evaluate_untraced("drift", {"observed_drift": 0.3}) == engine.evaluate("drift", {"observed_drift": 0.3})
+
+
+def test_delta_reevaluates_only_policies_between_old_and_new_value():
+    limits = [0.1, 0.2, 0.3, 0.4, 0.5]
+    engine = CountingEngine(drift_policies(limits))
+    session = engine.session({"observed_drift": 0.15})
+    engine.evaluated.clear()
+
+    changes = session.update({"observed_drift": 0.35})
+
+    assert sorted(engine.evaluated) == ["drift_0.2", "drift_0.3"]
+    assert [(c.policy_name, c.should_act) for c in changes] == [("drift_0.2", True), ("drift_0.3", True)]
+    assert session.acting() == ["drift_0.1", "drift_0.2", "drift_0.3"]
+
+
+def test_unrelated_key_reevaluates_only_dependents():
+    engine = CountingEngine(drift_policies(
+        [0.2],
+        rate=Policy("rate", "", {"max_runs": 3}, ["page"]),
+        mixed=Policy("mixed", "", {"max_drift": 0.5, "max_runs": 3}, ["page"]),
+    ))
+    session = engine.session({"observed_drift": 0.1})
+    engine.evaluated.clear()
+
+    assert session.update({"workflow": "retrain"}) == []
+    assert sorted(engine.evaluated) == ["mixed", "rate"]
+
+    engine.evaluated.clear()
+    assert session.update({"owner": "ml-platform"}) == []
+    assert engine.evaluated == []
+
+
+def test_events_only_when_decision_flips():
+    engine = PolicyEngine(drift_policies([0.2]))
+    session = engine.session({"observed_drift": 0.1})
+    events = []
+    session.subscribe(events.append)
+
+    session.update({"observed_drift": 0.15})  # still within
+    session.update({"observed_drift": 0.25})  # flips to acting
+    session.update({"observed_drift": 0.3})   # still acting
+    session.update({"observed_drift": 0.3})   # unchanged
+    session.update({"observed_drift": 0.05})  # flips back
+
+    assert [(e.policy_name, e.should_act) for e in events] == [("drift_0.2", True), ("drift_0.2", False)]
+    assert events[0].result["actions"] == ["retrain"]
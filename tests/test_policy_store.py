@@ -0,0 +1,142 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from control_plane.policies import PolicyEngine
+from control_plane.policy_store import PolicyStore
+from fakes import FakeRow, FakeSession
+
+
+class PoliciesTable:
+    """A POLICIES table served through `FakeSession(rows=...)`."""
+
+    def __init__(self):
+        self.clock = datetime(2026, 1, 1)
+        self.rows = {}
+        self.lock = threading.Lock()
+
+    def upsert(self, name, max_drift, deleted=False, rules=None):
+        with self.lock:
+            self.clock += timedelta(seconds=1)
+            self.rows[name] = {
+                "POLICY_NAME": name,
+                "DESCRIPTION": f"{name} policy",
+                "CONDITIONS": f'{{"max_drift": {max_drift}}}',
+                "ACTIONS": '["trigger_retrain"]',
+                "RULES": rules,
+                "UPDATED_AT": self.clock,
+                "IS_DELETED": deleted,
+            }
+
+    def select(self, query, params):
+        since = params[0] if params else None
+        with self.lock:
+            return [
+                FakeRow(row) for row in self.rows.values()
+                if since is None or row["UPDATED_AT"] >= since
+            ]
+
+
+def make_store(table, **kwargs):
+    session = FakeSession(rows=table.select, record=True)
+    return session, PolicyStore(session, **kwargs)
+
+
+def test_load_reads_the_whole_table():
+    table = PoliciesTable()
+    table.upsert("fraud", 0.1)
+    table.upsert("churn", 0.2, rules='[{"field": "drift", "operator": "<", "value": 0.3}]')
+    session, store = make_store(table)
+
+    snapshot = store.load()
+
+    assert snapshot.version == 1
+    assert snapshot.watermark == table.rows["churn"]["UPDATED_AT"]
+    assert snapshot.policies["fraud"].conditions == {"max_drift": 0.1}
+    assert snapshot.policies["fraud"].actions == ["trigger_retrain"]
+    assert snapshot.rule_policies["churn"].rules == [{"field": "drift", "operator": "<", "value": 0.3}]
+    assert snapshot.rule_policies["fraud"].rules == []
+    assert session.executed[0][1] is None
+
+
+def test_refresh_reads_only_rows_at_or_after_the_watermark():
+    table = PoliciesTable()
+    table.upsert("fraud", 0.1)
+    table.upsert("churn", 0.2)
+    session, store = make_store(table)
+    first = store.load()
+
+    table.upsert("churn", 0.25)
+    second = store.refresh()
+
+    query, params = session.executed[-1]
+    assert "UPDATED_AT >= ?" in query and params == [first.watermark]
+    assert second.version == 2
+    assert second.policies["churn"].conditions == {"max_drift": 0.25}
+    # unchanged policies keep their objects, so compiled caches stay warm
+    assert second.policies["fraud"] is first.policies["fraud"]
+    assert second.watermark == table.rows["churn"]["UPDATED_AT"]
+
+
+def test_refresh_without_changes_keeps_the_version():
+    table = PoliciesTable()
+    table.upsert("fraud", 0.1)
+    _, store = make_store(table)
+    first = store.load()
+
+    assert store.refresh() is first  # the watermark row is re-read but unchanged
+    assert store.snapshot.version == 1
+
+
+def test_deleted_rows_drop_out():
+    table = PoliciesTable()
+    table.upsert("fraud", 0.1)
+    table.upsert("churn", 0.2)
+    _, store = make_store(table)
+    store.load()
+
+    table.upsert("churn", 0.2, deleted=True)
+    snapshot = store.refresh()
+
+    assert snapshot.version == 2
+    assert set(snapshot.policies) == {"fraud"}
+    assert set(snapshot.rule_policies) == {"fraud"}
+
+
+def test_readers_keep_their_snapshot_across_a_swap():
+    table = PoliciesTable()
+    table.upsert("fraud", 0.1)
+    _, store = make_store(table)
+    store.load()
+    live = store.policies()
+    engine = PolicyEngine(live)
+    published = []
+    store.subscribe(published.append)
+
+    held = store.snapshot
+    table.upsert("fraud", 0.3)
+    table.upsert("churn", 0.2)
+    store.refresh()
+
+    assert held.version == 1
+    assert held.policies["fraud"].conditions == {"max_drift": 0.1}
+    assert "churn" not in held.policies
+    assert [snapshot.version for snapshot in published] == [2]
+    assert set(live) == {"fraud", "churn"}
+    assert not engine.evaluate("fraud", {"observed_drift": 0.2})["should_act"]
+
+
+def test_background_refresh_picks_up_changes():
+    table = PoliciesTable()
+    table.upsert("fraud", 0.1)
+    _, store = make_store(table, refresh_interval_s=0.01)
+    store.start()
+    try:
+        assert store.snapshot.version == 1
+        table.upsert("churn", 0.2)
+        deadline = time.monotonic() + 5
+        while "churn" not in store.snapshot.policies and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.snapshot.version == 2
+    finally:
+        store.stop()
@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from control_plane.registry import ControlPlaneRegistry, Lazy, RegisteredAgent
+
+
+def test_agent_factory_runs_on_first_use_only():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return lambda **kwargs: kwargs
+
+    registry = ControlPlaneRegistry()
+    registry.register_agent("intelligence", "answers questions", factory=factory)
+    agent = registry.get_agent("intelligence")
+    assert not agent.loaded and calls == []
+
+    assert agent.handler(query="q") == {"query": "q"}
+    assert agent.handler is agent.handler
+    assert agent.loaded and calls == [1]
+
+
+def test_agent_handler_is_loaded_immediately():
+    handler = object()
+    registry = ControlPlaneRegistry()
+    registry.register_agent("governance", "", handler=handler)
+    agent = registry.get_agent("governance")
+    assert agent.loaded and agent.handler is handler
+
+
+def test_register_agent_needs_exactly_one_of_handler_or_factory():
+    registry = ControlPlaneRegistry()
+    with pytest.raises(ValueError):
+        registry.register_agent("a", "")
+    with pytest.raises(ValueError):
+        registry.register_agent("a", "", handler=object(), factory=object)
+    assert registry.get_agent("a") is None
+
+
+def test_connector_is_built_lazily():
+    registry = ControlPlaneRegistry()
+    registry.register_connector("atlas", "lineage", factory=dict)
+    connector = registry.get_connector("atlas")
+    assert not connector.loaded
+    assert connector.connector == {}
+    assert connector.loaded and connector.connector is connector.connector
+    assert registry.get_connector("missing") is None
+
+
+def test_failed_factory_is_retried_on_next_use():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("Atlas is down")
+        return "connector"
+
+    lazy = Lazy(factory)
+    with pytest.raises(ConnectionError):
+        lazy.get()
+    assert not lazy.loaded
+    assert lazy.get() == "connector" and len(attempts) == 2
+
+
+def test_concurrent_first_use_builds_once():
+    calls = []
+    gate = threading.Event()
+
+    def factory():
+        gate.wait(5)
+        calls.append(1)
+        return object()
+
+    lazy = Lazy(factory)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(lazy.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    gate.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(set(map(id, results))) == 1
+
+
+def test_registered_agent_takes_a_handler_positionally():
+    def handler(**kwargs):
+        return "ok"
+
+    agent = RegisteredAgent("atlas", "drift checks", handler)
+
+    assert agent.loaded
+    assert agent.handler is handler
+    assert RegisteredAgent("atlas", "drift checks", handler=handler).handler is handler
+
+    agent.handler = len
+    assert agent.handler is len
+
+
+def test_registered_agent_takes_a_factory_or_lazy():
+    built = []
+
+    def factory():
+        built.append(1)
+        return "handler"
+
+    from_factory = RegisteredAgent("atlas", "", factory=factory)
+    from_lazy = RegisteredAgent("atlas", "", Lazy(factory))
+
+    assert not from_factory.loaded and not from_lazy.loaded
+    assert from_factory.handler == from_lazy.handler == "handler"
+    assert len(built) == 2
+    with pytest.raises(ValueError):
+        RegisteredAgent("atlas", "")
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from control_plane.models import Policy
+from control_plane.policy_engine import PolicyEngine
+from control_plane.rules import compile_rules, interpret_rules
+
+FIELDS = ["role", "drift", "region", "tags", "request.owner", "request.size"]
+VALUES = [None, 0, 1, 2.5, -3, "admin", "eu", "us", "PII", True, [], ["PII", "eu"], {"x": 1}]
+OPS = ["eq", "ne", "lt", "le", "gt", "ge", "==", "!=", "<", "<=", ">", ">=",
+       "in", "not_in", "contains", "between", "exists"]
+
+
+def random_leaf(rng):
+    op = rng.choice(OPS)
+    rule = {"field": rng.choice(FIELDS), "op": op}
+    if op in ("in", "not_in"):
+        rule["value"] = rng.sample(VALUES, rng.randint(0, 4))
+    elif op == "between":
+        rule["value"] = sorted(rng.sample([-1, 0, 1, 2, 3], 2))
+    elif op != "exists":
+        rule["value"] = rng.choice(VALUES)
+    return rule
+
+
+def random_rule(rng, depth=0):
+    kind = rng.random()
+    if depth >= 3 or kind < 0.55:
+        return random_leaf(rng)
+    if kind < 0.7:
+        return {"not": random_rule(rng, depth + 1)}
+    key = "all" if kind < 0.85 else "any"
+    return {key: [random_rule(rng, depth + 1) for _ in range(rng.randint(1, 3))]}
+
+
+def random_context(rng):
+    context = {}
+    for field in FIELDS:
+        if rng.random() < 0.3:
+            continue  # missing
+        head, _, tail = field.partition(".")
+        if tail:
+            request = context.setdefault(head, {}) if rng.random() < 0.9 else context.setdefault(head, "n/a")
+            if isinstance(request, dict):
+                request[tail] = rng.choice(VALUES)
+        else:
+            context[field] = rng.choice(VALUES)
+    return context
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_compiled_rules_match_interpreted_rules(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        rules = [random_rule(rng) for _ in range(rng.randint(0, 3))]
+        compiled = compile_rules("p", rules)
+        for _ in range(20):
+            context = random_context(rng)
+            expected = interpret_rules(rules, context)
+            assert compiled(context) == expected, (rules, context)
+            assert (compiled.first_failure(context) is None) == expected, (rules, context)
+
+
+def test_replacing_rules_recompiles_and_invalidate_picks_up_in_place_edits():
+    engine = PolicyEngine()
+    policy = Policy("p", "cap", "", [{"field": "drift", "op": "le", "value": 0.3}])
+    assert engine.evaluate(policy, {"drift": 0.2}).decision == "allow"
+
+    policy.rules = [{"field": "drift", "op": "le", "value": 0.1}]
+    assert engine.evaluate(policy, {"drift": 0.2}).decision == "deny"
+
+    policy.rules[0]["value"] = 0.5  # in place: the cached compilation still applies
+    assert engine.evaluate(policy, {"drift": 0.2}).decision == "deny"
+    engine.invalidate("p")
+    assert engine.evaluate(policy, {"drift": 0.2}).decision == "allow"
@@ -0,0 +1,180 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from control_plane.models import Decision, DecisionKind, RunLog, RunStatus
+from control_plane.run_log import RunLogWriter
+from fakes import FakeConnection
+
+SCHEMA = """
+CREATE TABLE workflow_run_log (
+    run_id, workflow_name, status, start_time, end_time, input_data, errors,
+    policies_evaluated, policies_skipped, policies_short_circuited
+);
+CREATE TABLE workflow_run_decision (run_id, seq, policy_id, decision, details, decided_at);
+"""
+
+
+@pytest.fixture
+def db():
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    connection.executescript(SCHEMA)
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def writers():
+    created = []
+
+    def make(connection, **kwargs):
+        kwargs.setdefault("paramstyle", "qmark")
+        kwargs.setdefault("flush_interval_s", 60)
+        writer = RunLogWriter(connection, **kwargs)
+        created.append(writer)
+        return writer
+
+    yield make
+    for writer in created:
+        writer.close()
+
+
+def run_log(i: int, decisions: int = 0) -> RunLog:
+    now = datetime(2026, 1, 1, 12) + timedelta(seconds=i)
+    return RunLog(
+        run_id=f"run_{i}",
+        workflow_name="fraud",
+        status=RunStatus.COMPLETED,
+        start_time=now,
+        end_time=now,
+        input_data={"observed_drift": 0.2},
+        decisions=[
+            Decision(f"policy_{d}", DecisionKind.ALLOW, {"message": "ok"}, now)
+            for d in range(decisions)
+        ],
+        policies_evaluated=decisions,
+    )
+
+
+def run_ids(connection):
+    return [row[0] for row in connection.execute("SELECT run_id FROM workflow_run_log ORDER BY rowid")]
+
+
+def test_writes_runs_and_decisions(db, writers):
+    writer = writers(db)
+    writer.write_log(run_log(1, decisions=2))
+    assert writer.flush() == 1
+
+    row = db.execute("SELECT * FROM workflow_run_log").fetchone()
+    assert row == (
+        "run_1", "fraud", "completed", "2026-01-01T12:00:01", "2026-01-01T12:00:01",
+        '{"observed_drift":0.2}', "[]", 2, 0, 0,
+    )
+    decisions = db.execute("SELECT run_id, seq, policy_id, decision FROM workflow_run_decision").fetchall()
+    assert decisions == [("run_1", 0, "policy_0", "allow"), ("run_1", 1, "policy_1", "allow")]
+
+
+def test_flushes_in_the_background_on_size_and_timer(db, writers):
+    sized = writers(db, batch_size=2)
+    sized.write_log(run_log(1))
+    sized.write_log(run_log(2))
+    timed = writers(db, batch_size=100, flush_interval_s=0.01)
+    timed.write_log(run_log(3))
+
+    deadline = time.monotonic() + 5
+    while len(run_ids(db)) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sorted(run_ids(db)) == ["run_1", "run_2", "run_3"]
+
+
+def test_write_log_does_not_wait_for_a_slow_database(writers):
+    connection = FakeConnection(latency_s=0.5)
+    writer = writers(connection, batch_size=1)
+    writer.write_log(run_log(1))  # starts a slow write in the background
+    time.sleep(0.05)
+
+    started = time.monotonic()
+    for i in range(2, 20):
+        writer.write_log(run_log(i))
+    assert time.monotonic() - started < 0.2
+
+
+def test_failed_writes_are_spooled_and_replayed_in_order(db, writers, tmp_path):
+    spool = tmp_path / "run_log.spool"
+    connection = FakeConnection(record=True)
+    writer = writers(connection, spool_path=str(spool), retry_after_s=0)
+
+    connection.failing = True
+    writer.write_log(run_log(1))
+    writer.write_log(run_log(2))
+    assert writer.flush() == 0
+    assert len(spool.read_text().splitlines()) == 2
+
+    connection.failing = False
+    writer.write_log(run_log(3))
+    assert writer.flush() == 1
+    assert [row[0] for row in connection.rows] == ["run_1", "run_2", "run_3"]
+    assert spool.read_text() == ""
+
+
+def test_slow_write_diverts_later_batches_to_the_spool(writers, tmp_path):
+    spool = tmp_path / "run_log.spool"
+    connection = FakeConnection(latency_s=0.05, record=True)
+    writer = writers(connection, spool_path=str(spool), slow_write_s=0.01, retry_after_s=60)
+
+    writer.write_log(run_log(1))
+    assert writer.flush() == 1
+    writer.write_log(run_log(2))
+    assert writer.flush() == 0
+
+    assert [row[0] for row in connection.rows] == ["run_1"]
+    assert len(spool.read_text().splitlines()) == 1
+
+
+def test_unreadable_spool_lines_are_quarantined(db, writers, tmp_path):
+    spool = tmp_path / "run_log.spool"
+    spooled = '{"run": ["run_0", "fraud", "completed", null, null, "{}", "[]", 0, 0, 0], "decisions": []}'
+    short = '{"run": ["run_9", "fraud", "completed", null, null, "{}", "[]", 0, 0], "decisions": []}'
+    spool.write_text(f"{spooled}\n{{not json\n[1, 2]\n{short}\n")
+    writer = writers(db, spool_path=str(spool))
+
+    writer.write_log(run_log(1))
+    assert writer.flush() == 1
+
+    assert run_ids(db) == ["run_0", "run_1"]
+    assert spool.read_text() == ""
+    assert (tmp_path / "run_log.spool.bad").read_text() == f"{{not json\n[1, 2]\n{short}\n"
+
+
+def test_without_a_spool_failed_logs_stay_queued(writers):
+    connection = FakeConnection(record=True)
+    writer = writers(connection, retry_after_s=0)
+
+    connection.failing = True
+    writer.write_log(run_log(1))
+    assert writer.flush() == 0
+    assert writer.pending() == 1
+
+    connection.failing = False
+    assert writer.flush() == 1
+    assert [row[0] for row in connection.rows] == ["run_1"]
+
+
+def test_concurrent_writers_lose_nothing(db, writers):
+    writer = writers(db, batch_size=7, flush_interval_s=0.01)
+
+    def write(start: int) -> None:
+        for i in range(start, start + 50):
+            writer.write_log(run_log(i))
+
+    threads = [threading.Thread(target=write, args=(n * 50,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+
+    assert sorted(run_ids(db)) == sorted(f"run_{i}" for i in range(200))
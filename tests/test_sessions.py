@@ -0,0 +1,132 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from control_plane.sessions import BatchingSession, SessionPool, _group
+from fakes import FakeSession
+
+INSERT = "INSERT INTO T (A, B) VALUES (?, ?)"
+MERGE = "MERGE INTO T USING (SELECT * FROM VALUES (?, ?)) S (K, V) ON T.K = S.K"
+
+
+def submit_all(batching, statements):
+    return [batching.submit(query, params) for query, params in statements]
+
+
+def test_concurrent_inserts_are_combined_into_one_statement():
+    session = FakeSession(record=True, rows=lambda query, params: [query.count("(?, ?)")])
+    with BatchingSession(session, window_s=5, max_batch=2) as batching:
+        first, second = submit_all(batching, [(INSERT, [1, "a"]), (INSERT, [2, "b"])])
+        # Every caller gets the combined statement's result.
+        assert first.result(5) == second.result(5) == [2]
+
+    assert session.executed == [("INSERT INTO T (A, B) VALUES (?, ?), (?, ?)", [1, "a", 2, "b"])]
+    assert (batching.statements_received, batching.statements_sent) == (2, 1)
+
+
+def test_identical_reads_run_once():
+    session = FakeSession(record=True, rows=lambda query, params: ["row"])
+    with BatchingSession(session, window_s=5, max_batch=3) as batching:
+        futures = submit_all(batching, [
+            ("SELECT * FROM T WHERE A = ?", [1]),
+            ("SELECT * FROM T WHERE A = ?", [1]),
+            ("SELECT * FROM T WHERE A = ?", [2]),
+        ])
+        assert [future.result(5) for future in futures] == [["row"]] * 3
+    assert session.statements == 2
+
+
+def test_merges_are_chunked_so_no_key_repeats():
+    batch = [(MERGE, (key, n), Future()) for n, key in enumerate(["a", "b", "a", "c"])]
+    (task,) = _group(batch)
+
+    assert [(query.count("(?, ?)"), params) for query, params, _ in task] == [
+        (2, ("a", 0, "b", 1)),
+        (2, ("a", 2, "c", 3)),
+    ]
+    assert [len(futures) for _, _, futures in task] == [2, 2]
+
+
+def test_incompatible_statements_are_sent_alone():
+    statements = [
+        ("UPDATE T SET B = ? WHERE A = ?", ("x", 1)),
+        ("INSERT INTO T (A, B) VALUES (?, ?), (?, ?)", (1, "a", 2, "b")),
+        ("SELECT * FROM T WHERE A IN (?)", ([1, 2],)),  # unhashable bind
+        (INSERT, (3, "c")),
+    ]
+    tasks = _group([(query, params, Future()) for query, params in statements])
+    assert [[(query, params) for query, params, _ in task] for task in tasks] == [
+        [statement] for statement in statements
+    ]
+
+    session = FakeSession(record=True)
+    with BatchingSession(session, window_s=5, max_batch=4) as batching:
+        for future in submit_all(batching, statements):
+            future.result(5)
+    assert [(query, tuple(params)) for query, params in session.executed] == statements
+
+
+def test_a_failed_combined_statement_fails_every_waiter():
+    session = FakeSession()
+    session.failing = True
+    with BatchingSession(session, window_s=5, max_batch=3) as batching:
+        futures = submit_all(batching, [(INSERT, [1, "a"]), (INSERT, [2, "b"]), ("SELECT 1", None)])
+        for future in futures:
+            with pytest.raises(RuntimeError, match="Injected"):
+                future.result(5)
+        session.failing = False
+        later = batching.submit("SELECT 1")  # the batching thread survived
+    assert later.result(5) == []
+    assert session.statements == 3
+
+
+def test_collect_times_out():
+    gate = threading.Event()
+    session = FakeSession(rows=lambda query, params: gate.wait(5) and [])
+    batching = BatchingSession(session, window_s=0, timeout_s=0.01)
+    with pytest.raises(TimeoutError):
+        batching.sql("SELECT 1").collect()
+    gate.set()
+    batching.close()
+
+
+def test_pool_never_exceeds_its_size_under_contention():
+    created = []
+    in_use = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def factory():
+        session = FakeSession(latency_s=0.005)
+        created.append(session)
+        return session
+
+    pool = SessionPool(factory, size=2)
+
+    def worker():
+        for _ in range(10):
+            with pool.session() as session:
+                with lock:
+                    assert session not in in_use
+                    in_use.append(session)
+                    peak[0] = max(peak[0], len(in_use))
+                session.sql("SELECT 1").collect()
+                with lock:
+                    in_use.remove(session)
+            assert pool.sql("SELECT 2").collect() == []
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 2 and peak[0] == 2
+    assert sum(session.statements for session in created) == 8 * 10 * 2
+    pool.close()
+
+
+def test_pool_rejects_a_size_below_one():
+    with pytest.raises(ValueError):
+        SessionPool(FakeSession, size=0)
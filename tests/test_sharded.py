@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from control_plane.models import Workflow
+from control_plane.sharded import ShardedExecutor
+
+
+def whoami(step, inputs, trigger_data):
+    # Module-level so it pickles to the worker processes.
+    return os.getpid(), trigger_data["seq"]
+
+
+def workflow(workflow_id):
+    return Workflow(
+        workflow_id=workflow_id,
+        name=workflow_id,
+        description="",
+        steps=[{"name": "whoami", "type": "whoami"}],
+        policies=[],
+    )
+
+
+@pytest.fixture
+def executor():
+    executor = ShardedExecutor({}, step_handlers={"whoami": whoami}, shards=3)
+    yield executor
+    executor.shutdown()
+
+
+def test_same_shard_key_always_lands_on_the_same_worker(executor):
+    workflows = [workflow(f"wf_{i}") for i in range(6)]
+    items = [(workflows[seq % 6], {"seq": seq}) for seq in range(30)]
+
+    first = executor.run_batch(items)
+    second = executor.run_batch(items)
+
+    worker_of = {}
+    for (wf, _), run_log in zip(items + items, first + second):
+        pid, _ = run_log.step_results["whoami"].output
+        assert worker_of.setdefault(wf.workflow_id, pid) == pid
+    assert all(executor.shard_of(wf, {}) == executor.shard_of(wf, {"other": 1}) for wf in workflows)
+    # Workflows on different shards ran in different processes.
+    shards = {executor.shard_of(wf, {}): worker_of[wf.workflow_id] for wf in workflows}
+    assert len(set(shards.values())) == len(shards)
+
+
+def test_results_come_back_in_input_order(executor):
+    items = [(workflow(f"wf_{seq % 5}"), {"seq": seq}) for seq in range(40)]
+
+    run_logs = executor.run_batch(items)
+
+    assert [run_log.step_results["whoami"].output[1] for run_log in run_logs] == list(range(40))
+    assert [run_log.input_data for run_log in run_logs] == [data for _, data in items]
+    assert all(run_log.status == "completed" for run_log in run_logs)
@@ -0,0 +1,37 @@
+import json
+from datetime import datetime
+
+from control_plane.agents import DriftSnapshot
+from control_plane.models import DecisionKind
+from control_plane.policies import Policy, PolicyEngine
+from control_plane.sql import to_json
+from fakes import FakeRow
+
+
+def test_drift_snapshot_round_trips_as_rows():
+    taken = datetime(2026, 1, 2, 3, 4, 5)
+    snapshot = DriftSnapshot.from_rows([
+        FakeRow({"MODEL": "fraud", "DRIFT": 0.21, "CHECKED_AT": taken}),
+        FakeRow({"MODEL": "churn", "DRIFT": 0.04, "CHECKED_AT": taken}),
+    ])
+
+    details = json.loads(to_json({"agent": "atlas", "result": snapshot}))
+
+    assert details["result"] == [
+        {"MODEL": "fraud", "DRIFT": 0.21, "CHECKED_AT": taken.isoformat()},
+        {"MODEL": "churn", "DRIFT": 0.04, "CHECKED_AT": taken.isoformat()},
+    ]
+
+
+def test_evaluation_result_round_trips_as_object():
+    engine = PolicyEngine({
+        "drift": Policy("drift", "Retrain on drift.", {"max_drift": 0.1}, ["trigger_retrain"]),
+    })
+    result = engine.evaluate("drift", {"observed_drift": 0.2})
+
+    assert json.loads(to_json(result)) == dict(result)
+    assert json.loads(to_json([result]))[0]["should_act"] is True
+
+
+def test_enums_and_tuples():
+    assert json.loads(to_json({"d": DecisionKind.DENY, "t": (1, 2)})) == {"d": "deny", "t": [1, 2]}
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from control_plane.step_scheduler import StepScheduler, step_dependencies
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = StepScheduler(max_workers=4)
+    yield scheduler
+    scheduler.shutdown()
+
+
+def step(name, *depends_on):
+    return {"name": name, "type": "task", "depends_on": list(depends_on)}
+
+
+# ----------------------------------------------------------------------
+# Graph validation
+# ----------------------------------------------------------------------
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        step_dependencies([step("a", "c"), step("b", "a"), step("c", "b"), step("d")])
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError, match="unknown step 'missing'"):
+        step_dependencies([step("a"), step("b", "missing")])
+
+
+def test_steps_without_depends_on_form_a_chain():
+    steps = [{"name": "a"}, {"name": "b"}, {"name": "c"}]
+    assert step_dependencies(steps) == {"a": [], "b": ["a"], "c": ["b"]}
+
+
+# ----------------------------------------------------------------------
+# Execution
+# ----------------------------------------------------------------------
+
+def test_independent_branches_overlap(scheduler):
+    spans = {}
+
+    def execute(step, inputs):
+        start = time.perf_counter()
+        time.sleep(0.05)
+        spans[step["name"]] = (start, time.perf_counter())
+
+    results = scheduler.run([step("left"), step("right"), step("join", "left", "right")], execute)
+
+    assert all(result.status == "succeeded" for result in results.values())
+    (left_start, left_end), (right_start, right_end) = spans["left"], spans["right"]
+    assert left_start < right_end and right_start < left_end
+    assert spans["join"][0] >= max(left_end, right_end)
+
+
+def test_outputs_reach_dependents(scheduler):
+    received = {}
+
+    def execute(step, inputs):
+        received[step["name"]] = inputs
+        return step["name"].upper()
+
+    results = scheduler.run([step("a"), step("b", "a"), step("c", "a", "b")], execute)
+
+    assert received == {"a": {}, "b": {"a": "A"}, "c": {"a": "A", "b": "B"}}
+    assert [results[name].output for name in "abc"] == ["A", "B", "C"]
+
+
+def test_failure_skips_only_its_descendants(scheduler):
+    executed = []
+    lock = threading.Lock()
+
+    def execute(step, inputs):
+        with lock:
+            executed.append(step["name"])
+        if step["name"] == "bad":
+            raise RuntimeError("boom")
+        return step["name"]
+
+    steps = [
+        step("root"),
+        step("bad", "root"),
+        step("child", "bad"),
+        step("grandchild", "child"),
+        step("sibling", "root"),
+        step("join", "sibling", "bad"),
+        step("after_sibling", "sibling"),
+    ]
+    results = scheduler.run(steps, execute)
+
+    assert list(results) == [s["name"] for s in steps]
+    assert results["bad"].status == "failed" and results["bad"].error == "boom"
+    assert {name for name, r in results.items() if r.status == "skipped"} == {"child", "grandchild", "join"}
+    assert results["sibling"].status == results["after_sibling"].status == "succeeded"
+    assert sorted(executed) == ["after_sibling", "bad", "root", "sibling"]
@@ -0,0 +1,59 @@
+from control_plane.timing import _NOOP_SPAN, Tracer, _run_timings
+
+
+def test_enabled_spans_record_into_the_run_and_histograms():
+    tracer = Tracer()
+    with tracer.run() as timings:
+        with tracer.span("policy", "p1"):
+            pass
+        with tracer.span("log_write"):
+            pass
+    assert set(timings) == {"policy:p1", "log_write"}
+    assert tracer.histograms.snapshot()["policy"]["count"] == 1
+    assert _run_timings.get() is None
+
+
+def test_disabled_tracer_records_nothing_and_leaves_the_context_alone():
+    tracer = Tracer(enabled=False)
+    assert tracer.span("policy", "p1") is _NOOP_SPAN
+    outer = {}
+    token = _run_timings.set(outer)
+    try:
+        with tracer.run() as timings:
+            assert _run_timings.get() is outer
+            with tracer.span("policy"):
+                pass
+    finally:
+        _run_timings.reset(token)
+    assert timings == {} and outer == {}
+    assert tracer.histograms.snapshot() == {}
+
+
+def test_tracer_can_be_toggled():
+    tracer = Tracer(enabled=False)
+    tracer.enabled = True
+    with tracer.run() as timings, tracer.span("run"):
+        pass
+    assert list(timings) == ["run"]
+
+
+def test_hot_call_sites_skip_span_when_disabled(monkeypatch):
+    from control_plane.agents import AtlasAgent, IntelligenceAgent
+    from control_plane.connectors.lineage_cache import LineageCache
+    from control_plane.core import RunCore
+    from control_plane.policies import Policy, PolicyEngine
+    from control_plane.timing import tracer
+    from fakes import FakeAgentImpl, FakeSession, InMemoryAtlasConnector
+
+    def fail(*args, **kwargs):
+        raise AssertionError("span() called while tracing is disabled")
+
+    monkeypatch.setattr(tracer, "enabled", False)
+    monkeypatch.setattr(tracer, "span", fail)
+
+    core = RunCore(on_start=lambda run_log: None, on_finish=lambda *args: None)
+    assert core.execute("wf", {}, lambda run_log: "ok").status == "completed"
+    IntelligenceAgent("intelligence", "", None, FakeAgentImpl()).run("q")
+    AtlasAgent("atlas", "", FakeSession()).run("check_drift")
+    PolicyEngine({"p": Policy("p", "", {"max_drift": 0.1}, [])}).evaluate("p", {})
+    LineageCache(InMemoryAtlasConnector([("a", "b")])).upstream("b")
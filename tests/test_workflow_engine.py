@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+
+from control_plane.models import Policy, Workflow
+from control_plane.policy_engine import PolicyEngine
+from control_plane.run_log import RunLogWriter
+from control_plane.workflow_engine import WorkflowEngine
+from fakes import FakeConnection
+
+
+class Concurrency:
+    """Counts calls in flight and remembers the peak."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.current -= 1
+
+
+def make_engine(step_handlers, policies=(), **kwargs):
+    connection = FakeConnection(record=True)
+    writer = RunLogWriter(connection, flush_interval_s=60)
+    registry = {policy.policy_id: policy for policy in policies}
+    engine = WorkflowEngine(PolicyEngine(), writer, registry, step_handlers=step_handlers, **kwargs)
+    return engine, writer, connection
+
+
+def workflow(*steps, policies=()):
+    return Workflow(
+        workflow_id="wf_1",
+        name="fraud_drift",
+        description="",
+        steps=[{"name": name, "type": kind} for name, kind in steps],
+        policies=list(policies),
+    )
+
+
+def test_timed_out_run_is_recorded_as_failed():
+    release = threading.Event()
+
+    def slow(step, inputs, trigger_data):
+        release.wait(5)
+        return "late"
+
+    engine, writer, connection = make_engine({"slow": slow})
+    try:
+        run_log = asyncio.run(engine.arun(workflow(("retrain", "slow")), {"drift": 0.2}, timeout=0.05))
+
+        assert run_log.status == "failed"
+        assert "timed out after 0.05s" in run_log.errors[-1]
+        assert writer.flush() == 1
+        assert [(row[0], row[2]) for row in connection.rows] == [(run_log.run_id, "failed")]
+
+        # The abandoned worker finishing later doesn't touch the returned record.
+        release.set()
+        time.sleep(0.1)
+        assert run_log.step_results == {}
+        assert not any(key.startswith("step:") for key in run_log.timings)
+    finally:
+        release.set()
+        writer.close()
+
+
+def test_runs_within_the_timeout_complete_and_keep_their_timings():
+    engine, writer, _ = make_engine({"noop": lambda step, inputs, trigger_data: "done"})
+    try:
+        run_log = asyncio.run(engine.arun(workflow(("notify", "noop")), {}, timeout=5))
+        assert run_log.status == "completed"
+        assert run_log.step_results["notify"].output == "done"
+        assert {"run", "step:notify"} <= set(run_log.timings)
+    finally:
+        writer.close()
+
+
+def test_denied_run_fails_under_a_timeout_too():
+    deny = Policy("p_deny", "deny", "", [{"field": "approved", "op": "eq", "value": True}])
+    engine, writer, _ = make_engine({}, policies=[deny])
+    try:
+        run_log = asyncio.run(
+            engine.arun(workflow(("notify", "noop"), policies=["p_deny"]), {"approved": False}, timeout=5)
+        )
+        assert run_log.status == "failed"
+        assert "denied by policy" in run_log.errors[-1]
+    finally:
+        writer.close()
+
+
+def test_run_many_stays_within_max_concurrency_and_keeps_order():
+    in_flight = Concurrency()
+
+    def step(step, inputs, trigger_data):
+        with in_flight:
+            time.sleep(0.02)
+        return trigger_data["i"]
+
+    engine, writer, _ = make_engine({"work": step}, max_concurrency=8)
+    try:
+        runs = [(workflow(("work", "work")), {"i": i}) for i in range(12)]
+        run_logs = asyncio.run(engine.run_many(runs, max_concurrency=3, timeout=5))
+    finally:
+        writer.close()
+
+    assert [run_log.step_results["work"].output for run_log in run_logs] == list(range(12))
+    assert all(run_log.status == "completed" for run_log in run_logs)
+    assert in_flight.peak == 3
+
+
+def test_policies_skipped_as_not_applicable_are_counted():
+    no_pii = Policy("p_no_pii", "no_pii", "", [{"not": {"field": "pii", "op": "exists"}}])
+    drift_cap = Policy("p_drift", "drift_cap", "", [{"field": "drift", "op": "le", "value": 0.3}])
+    engine, writer, _ = make_engine({}, policies=[no_pii, drift_cap])
+    try:
+        run_log = engine.run(workflow(policies=["p_no_pii", "p_drift"]), {"drift": 0.1})
+        assert run_log.status == "completed"
+        assert [decision.policy_id for decision in run_log.decisions] == ["p_drift"]
+        assert (run_log.policies_evaluated, run_log.policies_skipped) == (1, 1)
+    finally:
+        writer.close()
@@ -0,0 +1,228 @@
+import asyncio
+import threading
+import time
+
+from control_plane.observability import RunLogger
+from control_plane.policies import PolicyEngine
+from control_plane.workflows import WorkflowEngine
+from fakes import FakeSession
+
+
+def make_engine(**kwargs):
+    session = FakeSession(record=True)
+    engine = WorkflowEngine(RunLogger(session=session, run_log_table="RUN_LOG"), PolicyEngine({}), **kwargs)
+    return engine, session
+
+
+def logged_statuses(session):
+    """(RUN_ID, STATUS) of every MERGE the logger sent, in order."""
+    return [(params[0], params[2]) for _, params in session.executed]
+
+
+# ----------------------------------------------------------------------
+# Asyncio execution
+# ----------------------------------------------------------------------
+
+def test_sync_and_async_handlers_run_side_by_side():
+    engine, session = make_engine(max_concurrency=4)
+
+    def sync_handler(context, **kwargs):
+        time.sleep(0.01)
+        return {"sync": context["i"], "thread": threading.current_thread().name}
+
+    async def async_handler(context, **kwargs):
+        await asyncio.sleep(0.01)
+        return {"async": context["i"], "thread": threading.current_thread().name}
+
+    engine.register_workflow("sync", "", sync_handler)
+    engine.register_workflow("async", "", async_handler)
+
+    async def main():
+        return await engine.run_many([("sync", {"i": 0}), ("async", {"i": 1}), ("sync", {"i": 2})])
+
+    try:
+        outcomes = asyncio.run(main())
+    finally:
+        engine.shutdown()
+
+    assert [outcome["status"] for outcome in outcomes] == ["SUCCESS"] * 3
+    assert [outcome["result"].get("sync", outcome["result"].get("async")) for outcome in outcomes] == [0, 1, 2]
+    assert outcomes[0]["result"]["thread"].startswith("workflow")
+    assert outcomes[1]["result"]["thread"] == "MainThread"  # awaited on the loop
+    assert sorted(status for _, status in logged_statuses(session)) == ["START"] * 3 + ["SUCCESS"] * 3
+
+
+def test_timed_out_run_is_failed_and_logged():
+    engine, session = make_engine()
+    release = threading.Event()
+    engine.register_workflow("stuck", "", lambda **kwargs: release.wait(5))
+
+    async def slow(**kwargs):
+        await asyncio.sleep(5)
+
+    engine.register_workflow("slow", "", slow)
+    try:
+        stuck = asyncio.run(engine.arun_workflow("stuck", {}, timeout=0.05))
+        slow_outcome = asyncio.run(engine.arun_workflow("slow", {}, timeout=0.05))
+    finally:
+        release.set()
+        engine.shutdown()
+
+    for outcome in (stuck, slow_outcome):
+        assert outcome["status"] == "FAILED"
+        assert "timed out after 0.05s" in outcome["error"]
+        assert (outcome["run_id"], "FAILED") in logged_statuses(session)
+
+
+def test_run_many_stays_within_max_concurrency():
+    engine, _ = make_engine(max_concurrency=8)
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, peak
+
+    def handler(context, **kwargs):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        return context
+
+    engine.register_workflow("work", "", handler)
+    try:
+        outcomes = asyncio.run(engine.run_many([("work", {"i": i}) for i in range(10)], max_concurrency=2))
+    finally:
+        engine.shutdown()
+
+    assert [outcome["result"]["i"] for outcome in outcomes] == list(range(10))
+    assert in_flight[1] == 2
+
+
+# ----------------------------------------------------------------------
+# Idempotency
+# ----------------------------------------------------------------------
+
+def counting_engine(handler=None, **kwargs):
+    engine, session = make_engine(dedup_window_s=60, **kwargs)
+    calls = []
+
+    def record(context, **handler_kwargs):
+        calls.append(context)
+        return handler(context) if handler else {"ok": True}
+
+    engine.register_workflow("retrain", "", record)
+    return engine, calls
+
+
+def test_duplicate_within_window_returns_original_run():
+    engine, calls = counting_engine()
+
+    first = engine.run_workflow("retrain", {"model": "m1"})
+    second = engine.run_workflow("retrain", {"model": "m1"})
+    other = engine.run_workflow("retrain", {"model": "m2"})
+
+    assert len(calls) == 2
+    assert first["deduplicated"] is False
+    assert second["deduplicated"] is True
+    assert second["run_id"] == first["run_id"]
+    assert other["run_id"] != first["run_id"]
+
+
+def test_concurrent_duplicate_attaches_to_in_flight_run():
+    started, release = threading.Event(), threading.Event()
+
+    def handler(context):
+        started.set()
+        release.wait(5)
+        return {"ok": True}
+
+    engine, calls = counting_engine(handler)
+    outcomes = {}
+    original = threading.Thread(
+        target=lambda: outcomes.setdefault("original", engine.run_workflow("retrain", {"model": "m1"}))
+    )
+    original.start()
+    assert started.wait(5)
+    duplicate = threading.Thread(
+        target=lambda: outcomes.setdefault("duplicate", engine.run_workflow("retrain", {"model": "m1"}))
+    )
+    duplicate.start()
+    time.sleep(0.05)  # the duplicate is now waiting on the original
+    release.set()
+    original.join(5)
+    duplicate.join(5)
+
+    assert len(calls) == 1
+    assert outcomes["duplicate"]["run_id"] == outcomes["original"]["run_id"]
+    assert outcomes["duplicate"]["deduplicated"] is True
+
+
+def test_concurrent_async_duplicate_attaches_to_in_flight_run():
+    engine, _ = make_engine(dedup_window_s=60)
+    calls = []
+
+    async def handler(context, **kwargs):
+        calls.append(context)
+        await asyncio.sleep(0.05)
+        return {"ok": True}
+
+    engine.register_workflow("retrain", "", handler)
+
+    async def main():
+        return await asyncio.gather(
+            engine.arun_workflow("retrain", {"model": "m1"}),
+            engine.arun_workflow("retrain", {"model": "m1"}),
+        )
+
+    first, second = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert second["run_id"] == first["run_id"]
+    assert [first["deduplicated"], second["deduplicated"]] == [False, True]
+
+
+def test_failed_run_is_not_remembered():
+    attempts = []
+
+    def handler(context):
+        attempts.append(context)
+        if len(attempts) == 1:
+            raise RuntimeError("warehouse unavailable")
+        return {"ok": True}
+
+    engine, _ = counting_engine(handler)
+
+    failed = engine.run_workflow("retrain", {"model": "m1"})
+    retried = engine.run_workflow("retrain", {"model": "m1"})
+
+    assert failed["status"] == "FAILED"
+    assert retried["status"] == "SUCCESS"
+    assert retried["deduplicated"] is False
+    assert retried["run_id"] != failed["run_id"]
+
+
+def test_ignored_keys_do_not_distinguish_runs():
+    engine, calls = counting_engine(dedup_ignore_keys=["alert_id"])
+
+    first = engine.run_workflow("retrain", {"model": "m1", "alert_id": "a-1"})
+    second = engine.run_workflow("retrain", {"model": "m1", "alert_id": "a-2"})
+    keyed = engine.run_workflow("retrain", {"model": "m1", "alert_id": "a-3"}, idempotency_key="k")
+
+    assert len(calls) == 2
+    assert second["run_id"] == first["run_id"]
+    assert keyed["deduplicated"] is False
+
+
+def test_duplicate_after_window_runs_again():
+    engine, _ = make_engine(dedup_window_s=0.05)
+    calls = []
+    engine.register_workflow("retrain", "", lambda context, **kwargs: calls.append(context) or {"ok": True})
+
+    first = engine.run_workflow("retrain", {"model": "m1"})
+    assert engine.run_workflow("retrain", {"model": "m1"})["deduplicated"] is True
+    time.sleep(0.1)
+    later = engine.run_workflow("retrain", {"model": "m1"})
+
+    assert len(calls) == 2
+    assert later["deduplicated"] is False
+    assert later["run_id"] != first["run_id"]